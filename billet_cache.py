@@ -0,0 +1,214 @@
+"""
+钢坯二维导热计算结果的参数缓存
+
+以计算参数的哈希为键，跨页面重跑、刷新和服务重启复用计算结果:
+
+- 时刻、坐标、统计信息等小数据保存在内存(LRU)和JSON文件中；
+- 温度帧数组以.npy文件保存在磁盘上，读取时用内存映射打开，不整体载入；
+- 磁盘缓存总大小超过上限时，按最近使用时间淘汰最旧的结果。
+
+写入先写临时文件再原子替换，JSON最后写入，作为该条结果完整的标志。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from billet_conduction import BilletResult, solve_billet
+
+# 求解器或存储格式变化时递增，使旧缓存失效
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("BILLET_CACHE_DIR", Path(tempfile.gettempdir()) / "billet_cache")
+)
+DEFAULT_MAX_BYTES = 1024 * 2**20
+
+
+def params_key(params):
+    """计算参数的哈希值(与键顺序无关)"""
+    canonical = json.dumps(
+        {"version": CACHE_VERSION, **dict(params)}, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+class BilletCache:
+    """
+    钢坯计算结果缓存
+
+    属性:
+        cache_dir: 磁盘缓存目录
+        max_bytes: 磁盘缓存总大小上限(字节)
+        max_entries: 内存中最多保存的结果数
+        hits, misses: 命中与未命中次数
+    """
+
+    def __init__(
+        self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_entries=16
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # 只在有线程使用时保留，计算结束后自动释放
+        self._key_locks = weakref.WeakValueDictionary()
+
+    def _paths(self, key):
+        return self.cache_dir / f"{key}.npy", self.cache_dir / f"{key}.json"
+
+    def _touch(self, key):
+        """记录最近使用时间(淘汰按JSON文件的修改时间排序)"""
+        try:
+            os.utime(self._paths(key)[1])
+        except OSError:
+            pass
+
+    def _remember(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        """从磁盘读取，不存在或不完整时返回None"""
+        frames_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            temps = np.load(frames_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        self._touch(key)
+        return BilletResult(
+            times=np.asarray(meta["times"]),
+            x=np.asarray(meta["x"]),
+            y=np.asarray(meta["y"]),
+            temps=temps,
+            nfev=meta["nfev"],
+            nlu=meta["nlu"],
+            n_steps=meta["n_steps"],
+            decimated=meta["decimated"],
+        )
+
+    def _save(self, key, params, result):
+        frames_path, meta_path = self._paths(key)
+        tmp = frames_path.with_suffix(".npy.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(result.temps, dtype=np.float32))
+        os.replace(tmp, frames_path)
+        meta = {
+            "params": dict(params),
+            "times": result.times.tolist(),
+            "x": result.x.tolist(),
+            "y": result.y.tolist(),
+            "nfev": int(result.nfev),
+            "nlu": int(result.nlu),
+            "n_steps": int(result.n_steps),
+            "decimated": bool(result.decimated),
+        }
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, meta_path)
+
+    def evict(self):
+        """磁盘缓存超过上限时按最近使用时间淘汰，返回淘汰的结果数"""
+        with self._lock:
+            entries = []
+            for meta_path in self.cache_dir.glob("*.json"):
+                frames_path = meta_path.with_suffix(".npy")
+                try:
+                    size = meta_path.stat().st_size + frames_path.stat().st_size
+                    entries.append((meta_path.stat().st_mtime, size, meta_path.stem))
+                except OSError:
+                    continue
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, key in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._entries.pop(key, None)
+                for path in self._paths(key):
+                    path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
+
+    def get(self, params):
+        """按参数读取结果，不存在时返回None"""
+        key = params_key(params)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        if result is not None:
+            # 内存命中也要更新文件时间，否则最常用的结果会最先被淘汰
+            self._touch(key)
+            return result
+        result = self._load(key)
+        if result is not None:
+            with self._lock:
+                self._remember(key, result)
+        return result
+
+    def solve(self, params):
+        """
+        读取缓存的结果，不存在时计算并保存
+
+        参数:
+            params (dict 或 tuple): solve_billet的参数
+
+        返回:
+            BilletResult: 温度帧为只读的内存映射数组
+        """
+        key = params_key(params)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # 同一参数同时只计算一次
+        with key_lock:
+            result = self.get(params)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            result = solve_billet(**dict(params))
+            self._save(key, params, result)
+            if sum(path.stat().st_size for path in self._paths(key)) > self.max_bytes:
+                # 结果本身大于整个缓存上限，不保存，也不为它淘汰其他结果
+                for path in self._paths(key):
+                    path.unlink(missing_ok=True)
+                return result
+            self.evict()
+            stored = self._load(key)
+            if stored is None:
+                return result
+            with self._lock:
+                self._remember(key, stored)
+            return stored
+
+    def disk_usage(self):
+        """磁盘缓存的(结果数, 总字节数)"""
+        sizes = [
+            p.stat().st_size + p.with_suffix(".npy").stat().st_size
+            for p in self.cache_dir.glob("*.json")
+            if p.with_suffix(".npy").exists()
+        ]
+        return len(sizes), sum(sizes)
+
+    def clear(self):
+        """清空内存和磁盘缓存"""
+        with self._lock:
+            self._entries.clear()
+            for path in self.cache_dir.glob("*.npy"):
+                path.unlink(missing_ok=True)
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
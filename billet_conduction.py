@@ -0,0 +1,284 @@
+"""
+钢坯二维非稳态导热计算(线法)
+
+矩形断面四边为给定温度(第一类边界)，内部节点满足
+
+    dT/dt = α (∂²T/∂x² + ∂²T/∂y²)
+
+空间上用五点差分离散为常微分方程组，未知量只有内部节点，边界温度
+作为常数源项进入右端项。方程组是线性的，雅可比矩阵就是常数稀疏矩阵
+α·A，直接交给BDF/Radau隐式积分器，每次只需稀疏LU分解。
+
+积分器逐步推进，只在需要输出的时刻用稠密输出插值，写入按内存预算
+预先分配的float32帧缓冲区；模拟时间再长，占用的内存也不超过预算。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.integrate import BDF, Radau
+from scipy.sparse.linalg import splu
+
+
+def _symmetric_ordering(base):
+    """用对称最小度排序做稀疏LU分解的积分器
+
+    scipy默认的COLAMD排序针对一般矩阵，五点差分矩阵结构对称，
+    按A^T+A做最小度排序时填充元约少一半，分解和回代都更快。
+    """
+
+    class Solver(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            def lu(A):
+                self.nlu += 1
+                return splu(sp.csc_matrix(A), permc_spec="MMD_AT_PLUS_A")
+
+            self.lu = lu
+
+    Solver.__name__ = base.__name__
+    return Solver
+
+
+# 隐式积分方法(需要雅可比矩阵)
+METHODS = {"BDF": _symmetric_ordering(BDF), "Radau": _symmetric_ordering(Radau)}
+# 输出帧缓冲区的默认内存预算(MB)
+DEFAULT_MEMORY_BUDGET_MB = 256.0
+
+
+@dataclass
+class BilletResult:
+    """
+    计算结果
+
+    属性:
+        times: 输出时刻(s)
+        x: X方向节点坐标(m)
+        y: Y方向节点坐标(m)
+        temps: 各输出时刻的温度场(float32)，形状(n_out, Ny, Nx)
+        nfev: 右端函数调用次数
+        nlu: LU分解次数
+        n_steps: 积分步数
+        decimated: 是否因内存预算加大了输出间隔
+    """
+
+    times: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    temps: np.ndarray
+    nfev: int
+    nlu: int
+    n_steps: int
+    decimated: bool
+
+
+def _second_difference(n, h):
+    """n个内部节点的一维二阶差分矩阵(两端为给定温度)"""
+    return sp.diags([1.0, -2.0, 1.0], [-1, 0, 1], shape=(n, n)) / h**2
+
+
+def laplacian(nx, ny, dx, dy):
+    """
+    内部节点的五点差分拉普拉斯矩阵
+
+    参数:
+        nx, ny (int): X、Y方向的内部节点数
+        dx, dy (float): 空间步长(m)
+
+    返回:
+        scipy.sparse.csc_matrix: 形状(nx*ny, nx*ny)，按行优先(先x后y)排列
+    """
+    return (
+        sp.kron(sp.identity(ny), _second_difference(nx, dx))
+        + sp.kron(_second_difference(ny, dy), sp.identity(nx))
+    ).tocsc()
+
+
+def boundary_frame(Nx, Ny, left, right, top, bottom, interior=None):
+    """
+    组装带边界的完整温度场
+
+    参数:
+        Nx, Ny (int): 总节点数(含边界)
+        left, right, top, bottom (float): 四边温度，角点取上、下边界的值
+        interior (np.ndarray): 可选，内部节点温度，形状(..., Ny-2, Nx-2)
+
+    返回:
+        np.ndarray: 形状(..., Ny, Nx)
+    """
+    shape = (Ny, Nx) if interior is None else interior.shape[:-2] + (Ny, Nx)
+    T = np.empty(shape)
+    if interior is not None:
+        T[..., 1:-1, 1:-1] = interior
+    T[..., :, 0] = left
+    T[..., :, -1] = right
+    T[..., 0, :] = top
+    T[..., -1, :] = bottom
+    return T
+
+
+def boundary_source(Nx, Ny, dx, dy, left, right, top, bottom):
+    """边界温度对内部节点拉普拉斯项的贡献，形状((Ny-2)*(Nx-2),)"""
+    T = boundary_frame(Nx, Ny, left, right, top, bottom)
+    b = np.zeros((Ny - 2, Nx - 2))
+    b[:, 0] += T[1:-1, 0] / dx**2
+    b[:, -1] += T[1:-1, -1] / dx**2
+    b[0, :] += T[0, 1:-1] / dy**2
+    b[-1, :] += T[-1, 1:-1] / dy**2
+    return b.ravel()
+
+
+def frame_times(total_time, output_interval, frame_bytes, memory_budget_mb):
+    """
+    输出时刻
+
+    参数:
+        total_time (float): 总时间(s)
+        output_interval (float): 期望的输出间隔(s)
+        frame_bytes (int): 每帧占用的字节数
+        memory_budget_mb (float): 帧缓冲区的内存预算(MB)
+
+    返回:
+        tuple: (times, decimated)，末帧总在total_time处；帧数超过预算时
+        在[0, total_time]上均匀抽取预算允许的最多帧数(至少首末两帧)
+    """
+    times = np.arange(int(np.floor(total_time / output_interval + 1e-9)) + 1)
+    times = np.minimum(times * output_interval, total_time)
+    # 总时间不是输出间隔的整数倍时，末帧另加在total_time处
+    if total_time - times[-1] > 1e-9 * max(total_time, 1.0):
+        times = np.append(times, total_time)
+    n_budget = max(int(memory_budget_mb * 2**20 // frame_bytes), 2)
+    if len(times) <= n_budget:
+        return times, False
+    return np.linspace(0.0, total_time, n_budget), True
+
+
+def solve_billet(
+    k=40.0,
+    c=450.0,
+    rho=7800.0,
+    Lx=0.5,
+    Ly=0.5,
+    Nx=250,
+    Ny=250,
+    total_time=1000.0,
+    initial_temperature=300.0,
+    left=1000.0,
+    right=300.0,
+    top=1000.0,
+    bottom=300.0,
+    output_interval=10.0,
+    method="BDF",
+    rtol=1e-4,
+    atol=1e-2,
+    memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+):
+    """
+    钢坯二维非稳态导热求解器
+
+    参数:
+        k (float): 导热系数(W/(m·K))
+        c (float): 比热容(J/(kg·K))
+        rho (float): 密度(kg/m³)
+        Lx, Ly (float): X、Y方向尺寸(m)
+        Nx, Ny (int): X、Y方向节点数(含边界)
+        total_time (float): 总时间(s)
+        initial_temperature (float): 初始温度(K)
+        left, right, top, bottom (float): 四边温度(K)
+        output_interval (float): 输出间隔(s)
+        method (str): "BDF" 或 "Radau"
+        rtol, atol (float): 积分器的相对、绝对容差
+        memory_budget_mb (float): 输出帧缓冲区的内存预算(MB)，
+            输出帧数超过预算时自动加大输出间隔
+
+    返回:
+        BilletResult: 计算结果
+    """
+    if method not in METHODS:
+        raise ValueError(f"未知的积分方法: {method}，可选 {tuple(METHODS)}")
+    if Nx < 3 or Ny < 3:
+        raise ValueError("每个方向至少需要3个节点")
+
+    dx = Lx / (Nx - 1)
+    dy = Ly / (Ny - 1)
+    alpha = k / (rho * c)
+    jac = (alpha * laplacian(Nx - 2, Ny - 2, dx, dy)).tocsc()
+    source = alpha * boundary_source(Nx, Ny, dx, dy, left, right, top, bottom)
+
+    def rhs(t, u):
+        return jac @ u + source
+
+    times, decimated = frame_times(
+        total_time,
+        output_interval,
+        Nx * Ny * np.dtype(np.float32).itemsize,
+        memory_budget_mb,
+    )
+    temps = boundary_frame(Nx, Ny, left, right, top, bottom).astype(np.float32)
+    temps = np.repeat(temps[None], len(times), axis=0)
+    interior = temps[:, 1:-1, 1:-1]
+
+    u0 = np.full((Ny - 2) * (Nx - 2), float(initial_temperature))
+    interior[0] = u0.reshape(Ny - 2, Nx - 2)
+    solver = METHODS[method](rhs, 0.0, u0, total_time, jac=jac, rtol=rtol, atol=atol)
+    k_out = 1
+    n_steps = 0
+    while k_out < len(times):
+        message = solver.step()
+        n_steps += 1
+        if solver.status == "failed":
+            raise ValueError(f"积分失败: {message}")
+        # 本步覆盖的输出时刻由稠密输出插值得到
+        k_end = np.searchsorted(times, solver.t, side="right")
+        if k_end > k_out:
+            dense = solver.dense_output()
+            for j in range(k_out, k_end):
+                interior[j] = dense(times[j]).reshape(Ny - 2, Nx - 2)
+            k_out = k_end
+        if solver.status == "finished" and k_out < len(times):
+            interior[k_out:] = solver.y.reshape(Ny - 2, Nx - 2)
+            k_out = len(times)
+
+    return BilletResult(
+        times=times,
+        x=np.linspace(0, Lx, Nx),
+        y=np.linspace(0, Ly, Ny),
+        temps=temps,
+        nfev=solver.nfev,
+        nlu=solver.nlu,
+        n_steps=n_steps,
+        decimated=decimated,
+    )
+
+
+def display_frames(result, max_points=100, max_frames=100):
+    """
+    降采样并取整为int16的动画帧
+
+    参数:
+        result (BilletResult): 计算结果
+        max_points (int): 每个方向的最大显示点数
+        max_frames (int): 最大帧数
+
+    返回:
+        tuple: (times, x, y, frames, zmin, zmax)
+            - frames: int16数组，形状(n_frames, ny, nx)，温度取整到1K
+
+    说明:
+        - 按等间隔索引抽取帧和节点(保留首末帧与边界)，不复制全分辨率数据
+        - int16帧经plotly按二进制编码发送，100×100×100帧约2.7MB，
+          动画完全在浏览器中播放；热图悬停直接显示帧中的温度
+    """
+
+    def pick(n, m):
+        return np.unique(np.linspace(0, n - 1, min(n, m)).round().astype(int))
+
+    it = pick(len(result.times), max_frames)
+    iy = pick(len(result.y), max_points)
+    ix = pick(len(result.x), max_points)
+    T = result.temps[np.ix_(it, iy, ix)]
+    zmin, zmax = float(T.min()), float(T.max())
+    frames = np.rint(T).astype(np.int16)
+    return result.times[it], result.x[ix], result.y[iy], frames, zmin, zmax
@@ -0,0 +1,266 @@
+"""批量计算炉次成分的液相线/固相线温度
+
+读取化验室导出的成分文件(CSV或Parquet，列名与steel_properties.json中的
+all_components一致)，分块流式计算所有液相线、固相线公式以及所选钢种的
+物性参数，并按列式格式(Parquet或CSV)写出结果。
+
+用法:
+    python batch_tlts.py heats.csv results.parquet --kind 低碳钢
+    python batch_tlts.py heats.parquet results.parquet --kind 包晶钢 --keep heat_no
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from thermal_properties import (
+    FORMULA_ELEMENTS,
+    calculate_const_properties,
+    calculate_liquidus_temp_array,
+    calculate_solidus_temp_array,
+    load_formula_names,
+)
+
+# pyarrow随streamlit一起安装，这里直接用它做流式的CSV/Parquet读写，
+# 避免pandas逐行格式化浮点数带来的开销
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def _component_columns() -> List[str]:
+    """成分列: all_components 加上公式中额外用到的元素"""
+    json_path = Path(__file__).parent / "steel_properties.json"
+    with open(json_path, "r", encoding="utf-8") as f:
+        all_components = json.load(f)["all_components"]
+    return list(dict.fromkeys(list(all_components) + list(FORMULA_ELEMENTS)))
+
+
+def _file_format(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"不支持的文件格式: {suffix}，仅支持 .csv 和 .parquet")
+
+
+def read_schema(path: str) -> pa.Schema:
+    """读取成分文件的表结构(Parquet只读元数据，CSV只解析第一块)
+
+    CSV的列名由pyarrow解析，UTF-8 BOM和带引号的列名都能正确处理。
+    """
+    if _file_format(path) == "parquet":
+        return pq.ParquetFile(path).schema_arrow
+    return pa_csv.open_csv(path).schema
+
+
+def read_column_names(path: str) -> List[str]:
+    """读取成分文件的列名(不读取数据)"""
+    return list(read_schema(path).names)
+
+
+def read_composition_chunks(
+    path: str, columns: Sequence[str], chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pa.RecordBatch]:
+    """分块读取成分文件，只读取需要的列
+
+    Args:
+        path: 成分文件路径(.csv 或 .parquet)
+        columns: 需要读取的列名，文件中不存在的列会被忽略
+        chunksize: 每块的行数(Parquet)；CSV按约同等大小的字节块读取
+
+    Yields:
+        每块的RecordBatch
+    """
+    wanted = set(columns)
+
+    present = [c for c in read_column_names(path) if c in wanted]
+
+    if _file_format(path) == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        yield from parquet_file.iter_batches(batch_size=chunksize, columns=present)
+    else:
+        reader = pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=chunksize * 16 * 8),
+            convert_options=pa_csv.ConvertOptions(include_columns=present),
+        )
+        yield from reader
+
+
+def _column(batch: pa.RecordBatch, name: str) -> np.ndarray:
+    """取出数值列，空值按0处理(整列为空时pyarrow推断为null类型，先转为float64)"""
+    column = batch.column(name).cast(pa.float64()).fill_null(0)
+    return column.to_numpy(zero_copy_only=False)
+
+
+def compute_chunk(
+    batch: pa.RecordBatch,
+    liquidus_formulas: Sequence[str],
+    solidus_formulas: Sequence[str],
+    const_props: Optional[dict] = None,
+    keep: Sequence[str] = (),
+) -> pa.RecordBatch:
+    """计算一块成分数据的液相线、固相线温度
+
+    Args:
+        batch: 成分数据块，每列为一种元素的含量(%)
+        liquidus_formulas: 需要计算的液相线公式
+        solidus_formulas: 需要计算的固相线公式
+        const_props: 钢种物性参数，给定时作为常数列写入结果
+        keep: 需要原样保留到结果中的列(如炉号)
+
+    Returns:
+        结果RecordBatch，列名为"Tl_<公式>"、"Ts_<公式>"及物性参数名
+
+    Raises:
+        KeyError: 当keep中的列不在数据块中时
+    """
+    names = set(batch.schema.names)
+    composition = {
+        elem: _column(batch, elem) for elem in FORMULA_ELEMENTS if elem in names
+    }
+    n = batch.num_rows
+
+    out = {col: batch.column(col) for col in keep}
+    for name in liquidus_formulas:
+        out[f"Tl_{name}"] = np.broadcast_to(
+            calculate_liquidus_temp_array(name, composition), (n,)
+        )
+    for name in solidus_formulas:
+        out[f"Ts_{name}"] = np.broadcast_to(
+            calculate_solidus_temp_array(name, composition), (n,)
+        )
+    for key, value in (const_props or {}).items():
+        out[key] = np.full(n, value, dtype=float)
+
+    return pa.RecordBatch.from_pydict(out)
+
+
+class _ChunkWriter:
+    """按块追加写出结果"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = _file_format(path)
+        self._writer = None
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        if self._writer is None:
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+            else:
+                self._writer = pa_csv.CSVWriter(self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    kind: Optional[str] = None,
+    liquidus_formulas: Optional[Sequence[str]] = None,
+    solidus_formulas: Optional[Sequence[str]] = None,
+    keep: Sequence[str] = (),
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> int:
+    """批量计算入口
+
+    Args:
+        input_path: 成分文件路径(.csv/.parquet)
+        output_path: 结果文件路径(.parquet/.csv)
+        kind: 钢的分类，给定时在结果中附加该钢种的物性参数
+        liquidus_formulas: 液相线公式列表，默认为formula_names.json中的全部公式
+        solidus_formulas: 固相线公式列表，默认为formula_names.json中的全部公式
+        keep: 需要原样保留到结果中的列
+        chunksize: 每块的行数
+
+    Returns:
+        处理的总行数
+
+    Raises:
+        ValueError: 当keep中的列不在成分文件中，或文件中没有任何公式用到的
+            元素列时
+    """
+    formula_names = load_formula_names()
+    if liquidus_formulas is None:
+        liquidus_formulas = formula_names["liquidus_formulas"]
+    if solidus_formulas is None:
+        solidus_formulas = formula_names["solidus_formulas"]
+    const_props = calculate_const_properties(kind) if kind else None
+
+    # 在开始写出结果之前检查，避免算到一半才报错并留下不完整的结果文件
+    schema = read_schema(input_path)
+    missing = [col for col in keep if col not in schema.names]
+    if missing:
+        raise ValueError(f"成分文件中没有要保留的列: {', '.join(missing)}")
+    # 一个元素列都没有时所有成分都会按0计算，结果没有意义
+    if not set(FORMULA_ELEMENTS) & set(schema.names):
+        raise ValueError(
+            f"成分文件中没有任何元素列(如 {', '.join(FORMULA_ELEMENTS[:3])})，"
+            f"现有的列: {', '.join(schema.names)}"
+        )
+
+    columns = _component_columns() + list(keep)
+    writer = _ChunkWriter(output_path)
+    total = 0
+    try:
+        for chunk in read_composition_chunks(input_path, columns, chunksize):
+            result = compute_chunk(
+                chunk, liquidus_formulas, solidus_formulas, const_props, keep
+            )
+            writer.write(result)
+            total += chunk.num_rows
+        if total == 0:
+            # 只有表头没有数据时也写出带结果列的空文件
+            empty = pa.RecordBatch.from_pylist([], schema=schema)
+            writer.write(
+                compute_chunk(
+                    empty, liquidus_formulas, solidus_formulas, const_props, keep
+                )
+            )
+    finally:
+        writer.close()
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="批量计算炉次成分的液相线/固相线温度")
+    parser.add_argument("input", help="成分文件(.csv/.parquet)")
+    parser.add_argument("output", help="结果文件(.parquet/.csv)")
+    parser.add_argument("--kind", help="钢的分类，如 低碳钢")
+    parser.add_argument("--liquidus", nargs="+", help="液相线公式，默认全部")
+    parser.add_argument("--solidus", nargs="+", help="固相线公式，默认全部")
+    parser.add_argument("--keep", nargs="+", default=[], help="原样保留的列，如炉号")
+    parser.add_argument(
+        "--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="每块的行数"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total = run_batch(
+        args.input,
+        args.output,
+        kind=args.kind,
+        liquidus_formulas=args.liquidus,
+        solidus_formulas=args.solidus,
+        keep=args.keep,
+        chunksize=args.chunksize,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"处理完成: {total} 行，用时 {elapsed:.2f}s ({total / max(elapsed, 1e-9):.0f} 行/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
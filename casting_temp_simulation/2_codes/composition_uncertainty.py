@@ -0,0 +1,377 @@
+"""成分波动下液相线/固相线温度的不确定度(蒙特卡洛)
+
+在各元素的公差带内随机抽取大量成分(默认20万组)，用向量化公式一次
+计算所有液相线、固相线公式，给出每个公式的Tl、Ts分布以及所选公式组合
+的凝固区间(Tl-Ts)分布，用于给目标过热度配上置信区间。
+
+公差带默认取名义成分的±5%(至少±0.005%)；名义含量为0的元素视为
+未添加，不参与抽样。预设成分中形如"Ti≥5C~0.70"、"10C~1.00"的范围
+按下限随碳含量变化的均匀分布抽样。
+
+用法:
+    python composition_uncertainty.py                     # 全部预设钢号
+    python composition_uncertainty.py Q235 20# -n 1000000 --distribution normal
+"""
+
+import argparse
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from thermal_properties import (
+    calculate_liquidus_temp_array,
+    calculate_solidus_temp_array,
+    load_formula_names,
+    steel_catalog,
+)
+
+DEFAULT_SAMPLES = 200_000
+DEFAULT_RELATIVE_TOLERANCE = 0.05
+# 名义含量较低的元素按此绝对公差(%)抽样
+MIN_ABSOLUTE_TOLERANCE = 0.005
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+DISTRIBUTIONS = ("uniform", "normal")
+# 正态分布时公差带对应±3σ，超出部分截断到公差带边界
+_NORMAL_SIGMAS = 3.0
+# 预设成分中以碳含量为下限的范围，如"Ti≥5C~0.70"
+_CARBON_RANGE = re.compile(r"(\d*\.?\d*)\s*C\s*~\s*(\d*\.?\d+)")
+
+
+@dataclass(frozen=True)
+class DistributionSummary:
+    """一组温度样本的统计量(℃)"""
+
+    mean: float
+    std: float
+    min: float
+    max: float
+    quantiles: Mapping[float, float]  # 分位点 -> 温度
+
+    def band(self, low: float, high: float) -> Tuple[float, float]:
+        """两个分位点之间的区间"""
+        return self.quantiles[low], self.quantiles[high]
+
+
+@dataclass(frozen=True)
+class UncertaintyResult:
+    """成分不确定度的计算结果"""
+
+    n_samples: int
+    liquidus: Mapping[str, DistributionSummary]  # 液相线公式 -> Tl分布
+    solidus: Mapping[str, DistributionSummary]  # 固相线公式 -> Ts分布
+    liquidus_formula: str
+    solidus_formula: str
+    freezing_range: DistributionSummary  # 所选公式组合的 Tl-Ts 分布
+    liquidus_samples: np.ndarray  # 所选液相线公式的Tl样本(float32，已排序)
+    solidus_samples: np.ndarray  # 所选固相线公式的Ts样本(float32，已排序)
+    skipped: Tuple[str, ...]  # 无法解析、未参与计算的元素
+
+
+def parse_nominal(
+    composition: Mapping[str, object],
+) -> Tuple[Dict[str, float], Dict[str, Tuple[float, float]], Tuple[str, ...]]:
+    """拆分名义成分
+
+    Args:
+        composition: 元素名 -> 含量(%)，含量可以是数值或"5C~0.70"形式的范围
+
+    Returns:
+        (nominal, carbon_ranges, skipped)
+            - nominal: 数值形式的名义含量
+            - carbon_ranges: 元素 -> (碳含量倍数, 上限)，下限为倍数×C
+            - skipped: 既不是数值也无法解析的元素
+    """
+    nominal, carbon_ranges, skipped = {}, {}, []
+    for elem, value in composition.items():
+        if isinstance(value, (int, float)):
+            nominal[elem] = float(value)
+            continue
+        match = _CARBON_RANGE.search(str(value))
+        if match:
+            factor, upper = match.groups()
+            carbon_ranges[elem] = (float(factor or 1.0), float(upper))
+        else:
+            skipped.append(elem)
+    return nominal, carbon_ranges, tuple(skipped)
+
+
+def default_tolerances(
+    nominal: Mapping[str, float],
+    relative_tolerance: float = DEFAULT_RELATIVE_TOLERANCE,
+) -> Dict[str, float]:
+    """名义含量大于0的元素的默认公差(%)，即±max(相对公差×含量, 最小绝对公差)"""
+    return {
+        elem: max(relative_tolerance * value, MIN_ABSOLUTE_TOLERANCE)
+        for elem, value in nominal.items()
+        if value > 0
+    }
+
+
+def sample_compositions(
+    nominal: Mapping[str, float],
+    tolerances: Mapping[str, float],
+    n_samples: int = DEFAULT_SAMPLES,
+    distribution: str = "uniform",
+    carbon_ranges: Optional[Mapping[str, Tuple[float, float]]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, object]:
+    """在公差带内抽取成分样本
+
+    Args:
+        nominal: 元素名 -> 名义含量(%)
+        tolerances: 元素名 -> 公差带半宽(%)，未给出的元素保持名义含量
+        n_samples: 样本数
+        distribution: "uniform"为公差带内均匀分布，"normal"为截断正态分布
+            (公差带对应±3σ)
+        carbon_ranges: 元素 -> (碳含量倍数, 上限)，在[倍数×C, 上限]内均匀抽样
+        rng: 随机数发生器
+
+    Returns:
+        元素名 -> 含量，抽样的元素为形状(n_samples,)的数组，其余为标量
+        (向量化公式会自动广播)，含量不小于0
+
+    Raises:
+        ValueError: 当分布类型未知时
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"未知的分布类型: {distribution}，可选 {DISTRIBUTIONS}")
+    rng = np.random.default_rng() if rng is None else rng
+
+    samples: Dict[str, object] = {}
+    for elem, value in nominal.items():
+        tol = tolerances.get(elem, 0.0)
+        if tol <= 0:
+            samples[elem] = value
+            continue
+        if distribution == "uniform":
+            offset = rng.uniform(-tol, tol, n_samples)
+        else:
+            offset = rng.standard_normal(n_samples)
+            np.clip(offset, -_NORMAL_SIGMAS, _NORMAL_SIGMAS, out=offset)
+            offset *= tol / _NORMAL_SIGMAS
+        offset += value
+        samples[elem] = np.maximum(offset, 0.0, out=offset)
+
+    carbon = np.broadcast_to(np.asarray(samples.get("C", 0.0), dtype=float), n_samples)
+    for elem, (factor, upper) in (carbon_ranges or {}).items():
+        lower = np.minimum(factor * carbon, upper)
+        samples[elem] = lower + rng.random(n_samples) * (upper - lower)
+    return samples
+
+
+def _sorted_quantiles(ordered: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """已排序样本的分位点(线性插值，与np.quantile的默认方法相同)"""
+    pos = np.asarray(quantiles, dtype=float) * (len(ordered) - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, len(ordered) - 1)
+    low = ordered[lo].astype(float)
+    return low + (ordered[hi] - low) * (pos - lo)
+
+
+def summarize(
+    values: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES
+) -> Tuple[DistributionSummary, np.ndarray]:
+    """样本的均值、标准差、极值和分位点
+
+    Returns:
+        (summary, ordered)，ordered为排序后的float32样本
+
+    说明:
+        - 分位点由排序后的float32样本插值得到：float32排序有SIMD实现，
+          比np.quantile的选择算法快数倍，1500℃处的舍入误差约1e-4℃
+    """
+    ordered = np.sort(values.astype(np.float32))
+    q = _sorted_quantiles(ordered, quantiles)
+    summary = DistributionSummary(
+        mean=float(values.mean()),
+        std=float(values.std()),
+        min=float(ordered[0]),
+        max=float(ordered[-1]),
+        quantiles={float(p): float(v) for p, v in zip(quantiles, q)},
+    )
+    return summary, ordered
+
+
+def composition_uncertainty(
+    composition: Mapping[str, object],
+    n_samples: int = DEFAULT_SAMPLES,
+    tolerances: Optional[Mapping[str, float]] = None,
+    relative_tolerance: float = DEFAULT_RELATIVE_TOLERANCE,
+    distribution: str = "uniform",
+    liquidus_formula: Optional[str] = None,
+    solidus_formula: Optional[str] = None,
+    liquidus_formulas: Optional[Sequence[str]] = None,
+    solidus_formulas: Optional[Sequence[str]] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    seed: Optional[int] = None,
+) -> UncertaintyResult:
+    """成分波动下各液相线/固相线公式的温度分布
+
+    Args:
+        composition: 名义成分，元素名 -> 含量(%)
+        n_samples: 样本数
+        tolerances: 元素名 -> 公差带半宽(%)，覆盖默认公差
+        relative_tolerance: 默认公差的相对值
+        distribution: "uniform" 或 "normal"
+        liquidus_formula: 计算凝固区间所用的液相线公式，默认为列表中的第一个
+        solidus_formula: 计算凝固区间所用的固相线公式，默认为列表中的第一个
+        liquidus_formulas: 需要计算的液相线公式，默认为formula_names.json中的全部公式
+        solidus_formulas: 需要计算的固相线公式，默认为formula_names.json中的全部公式
+        quantiles: 需要给出的分位点
+        seed: 随机种子，相同的种子得到相同的结果
+
+    Returns:
+        UncertaintyResult
+
+    Raises:
+        ValueError: 当公式名称或分布类型未知时
+    """
+    formula_names = load_formula_names()
+    if liquidus_formulas is None:
+        liquidus_formulas = formula_names["liquidus_formulas"]
+    if solidus_formulas is None:
+        solidus_formulas = formula_names["solidus_formulas"]
+    liquidus_formula = liquidus_formula or liquidus_formulas[0]
+    solidus_formula = solidus_formula or solidus_formulas[0]
+
+    nominal, carbon_ranges, skipped = parse_nominal(composition)
+    tol = default_tolerances(nominal, relative_tolerance)
+    tol.update(tolerances or {})
+    samples = sample_compositions(
+        nominal,
+        tol,
+        n_samples,
+        distribution,
+        carbon_ranges,
+        np.random.default_rng(seed),
+    )
+
+    def evaluate(func, name):
+        return np.broadcast_to(func(name, samples), n_samples)
+
+    liquidus, solidus = {}, {}
+    for name in dict.fromkeys([*liquidus_formulas, liquidus_formula]):
+        values = evaluate(calculate_liquidus_temp_array, name)
+        liquidus[name], ordered = summarize(values, quantiles)
+        if name == liquidus_formula:
+            Tl, Tl_sorted = values, ordered
+    for name in dict.fromkeys([*solidus_formulas, solidus_formula]):
+        values = evaluate(calculate_solidus_temp_array, name)
+        solidus[name], ordered = summarize(values, quantiles)
+        if name == solidus_formula:
+            Ts, Ts_sorted = values, ordered
+
+    return UncertaintyResult(
+        n_samples=n_samples,
+        liquidus=liquidus,
+        solidus=solidus,
+        liquidus_formula=liquidus_formula,
+        solidus_formula=solidus_formula,
+        freezing_range=summarize(Tl - Ts, quantiles)[0],
+        liquidus_samples=Tl_sorted,
+        solidus_samples=Ts_sorted,
+        skipped=skipped,
+    )
+
+
+def grade_uncertainty(grade: str, **kwargs) -> UncertaintyResult:
+    """预设钢号的成分不确定度
+
+    Args:
+        grade: steel_properties.json中preset_elements的钢号
+        **kwargs: 传给composition_uncertainty的参数
+
+    Raises:
+        ValueError: 当钢号不存在或没有预设成分时
+    """
+    composition = steel_catalog.preset_elements.get(grade)
+    if not composition:
+        raise ValueError(f"钢号没有预设成分: {grade}")
+    return composition_uncertainty(composition, **kwargs)
+
+
+def casting_temperature(
+    result: UncertaintyResult, superheat: float, confidence: float = 0.95
+) -> float:
+    """以给定置信度保证过热度不低于目标值的浇注温度(℃)
+
+    Args:
+        result: 成分不确定度的计算结果
+        superheat: 目标过热度(℃)
+        confidence: 过热度不低于目标值的概率
+    """
+    Tl = _sorted_quantiles(result.liquidus_samples, [confidence])[0]
+    return float(Tl) + superheat
+
+
+def superheat_band(
+    result: UncertaintyResult,
+    temperature: float,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> Dict[float, float]:
+    """给定浇注温度下过热度的分位点
+
+    Args:
+        result: 成分不确定度的计算结果
+        temperature: 浇注温度(℃)
+        quantiles: 分位点
+
+    Returns:
+        分位点 -> 过热度(℃)
+    """
+    # 过热度的p分位点对应Tl的1-p分位点
+    Tl = _sorted_quantiles(result.liquidus_samples, 1 - np.asarray(quantiles))
+    return {float(p): float(temperature - t) for p, t in zip(quantiles, Tl)}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="成分波动下液相线/固相线温度的分布")
+    parser.add_argument("grades", nargs="*", help="预设钢号，默认全部")
+    parser.add_argument("-n", "--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_RELATIVE_TOLERANCE,
+        help="相对公差，默认0.05即±5%%",
+    )
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--liquidus", help="计算凝固区间所用的液相线公式")
+    parser.add_argument("--solidus", help="计算凝固区间所用的固相线公式")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    grades = args.grades or [g for g, c in steel_catalog.preset_elements.items() if c]
+    low, mid, high = DEFAULT_QUANTILES
+    for grade in grades:
+        start = time.perf_counter()
+        result = grade_uncertainty(
+            grade,
+            n_samples=args.samples,
+            relative_tolerance=args.tolerance,
+            distribution=args.distribution,
+            liquidus_formula=args.liquidus,
+            solidus_formula=args.solidus,
+            seed=args.seed,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"\n{grade}  ({result.n_samples} 组成分，用时 {elapsed:.2f}s)")
+        if result.skipped:
+            print(f"  未参与计算的元素: {', '.join(result.skipped)}")
+        for label, table in (("Tl", result.liquidus), ("Ts", result.solidus)):
+            for name, s in table.items():
+                print(
+                    f"  {label} {name:<24} {s.quantiles[mid]:8.1f}"
+                    f"  [{s.quantiles[low]:.1f}, {s.quantiles[high]:.1f}]"
+                )
+        fr = result.freezing_range
+        print(
+            f"  Tl-Ts ({result.liquidus_formula} / {result.solidus_formula})"
+            f" {fr.quantiles[mid]:.1f}  [{fr.quantiles[low]:.1f}, {fr.quantiles[high]:.1f}]"
+        )
+
+
+if __name__ == "__main__":
+    main()
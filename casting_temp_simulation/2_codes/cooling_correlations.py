@@ -0,0 +1,248 @@
+"""二冷区换热系数经验关联式
+
+页面3和HeatTransferCalculator.secondary_cooling_h原先各自实现了一套
+关联式: 页面版本只接受Python标量(isinstance检查会拒绝NumPy数值)，出错时
+打印信息并返回None；两处同名公式的单位换算也不一致。这里统一为:
+
+- 所有公式直接对数组求值(V、T_s、T_w按NumPy规则广播)；
+- 结果统一为kW/m²·K，kcal/(m²·h·℃)的公式乘以1.163e-3换算；
+- 公式本身没有定义的区域返回NaN，实验关联的适用范围由有效性掩码给出，
+  由调用方决定是截断还是外推。
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+# kcal/(m²·h·℃) → kW/m²·K
+KCAL = 1.163e-3
+
+
+@dataclass(frozen=True)
+class Correlation:
+    """一个二冷区换热系数关联式
+
+    Attributes:
+        label: 显示名称
+        func: func(V, T_s, T_w) 返回换热系数(kW/m²·K)，公式未定义处为NaN
+        V_range: 水流密度适用范围(L/m²·s)
+        T_s_range: 铸坯表面温度适用范围(℃)
+        note: 公式说明
+    """
+
+    label: str
+    func: Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+    V_range: Tuple[float, float] = (0.0, np.inf)
+    T_s_range: Tuple[float, float] = (-np.inf, np.inf)
+    note: str = ""
+
+
+def _bolle_moureou(V, T_s, T_w):
+    bolle = (V > 1) & (V < 7) & (T_s > 627) & (T_s < 927)
+    moureou = (V > 0.8) & (V < 2.5) & (T_s > 727) & (T_s < 1027)
+    return np.where(
+        bolle, 0.423 * V**0.556, np.where(moureou, 0.360 * V**0.556, np.nan)
+    )
+
+
+def _billet(V, T_s, T_w):
+    return np.where(
+        T_s > 900,
+        1.095e12 * T_s**-4.15 * V**0.75,
+        3.78e3 * np.maximum(T_s, 500) ** -1.34 * V**0.785,
+    )
+
+
+def _sasaki_k(V, T_s, T_w):
+    # 分段公式只在600~1200℃内给出，范围外没有定义
+    return np.where(
+        (T_s >= 600) & (T_s <= 1200),
+        KCAL
+        * np.where(
+            T_s <= 900,
+            2.293e8 * V**0.616 * T_s**-2.445,
+            2.830e7 * V**0.75 * T_s**-1.2,
+        ),
+        np.nan,
+    )
+
+
+def _okamura(V, T_s, T_w, v_a=21.5, T_h=293):
+    # 默认空气流速va=21.5m/s，环境温度Th=293K，辐射项按发射率0.8计
+    h_rad = 5.67e-8 * 0.8 * ((T_s + 273) ** 4 - T_h**4) / (T_s + 273 - T_h)
+    return (5.35 * T_s**0.12 * V**0.52 * v_a**0.37 + h_rad) / 1000
+
+
+CORRELATIONS: Dict[str, Correlation] = {
+    "Mitsutsuka": Correlation(
+        "Mitsutsuka",
+        lambda V, T_s, T_w: V**0.7 * (1 - 0.0065 * T_w),
+        V_range=(10, 10.3),
+        note="n取0.7(0.65~0.75)，b取0.0065(0.005~0.008)",
+    ),
+    "Shimada": Correlation(
+        "施密特(Shimada)",
+        lambda V, T_s, T_w: 1.57 * V**0.55 * (1 - 0.0075 * T_w),
+    ),
+    "Miikar_0.276": Correlation(
+        "米霍克尔(Mizikar, 0.276MPa)",
+        lambda V, T_s, T_w: 0.0776 * V,
+        V_range=(0, 20.3),
+    ),
+    "Mizikar": Correlation(
+        "米霍克尔(Mizikar)",
+        lambda V, T_s, T_w: 0.0776 * V,
+        V_range=(0, 20.3),
+        note="同Miikar_0.276",
+    ),
+    "Miikar_0.620": Correlation(
+        "米霍克尔(Mizikar, 0.620MPa)",
+        lambda V, T_s, T_w: 0.1 * V,
+        V_range=(0, 20.3),
+    ),
+    "Ishiguro": Correlation(
+        "希格荷(Ishiguro)",
+        lambda V, T_s, T_w: 0.581 * V**0.451 * (1 - 0.0075 * T_w),
+    ),
+    "Bolle": Correlation(
+        "波尔(Bolle)",
+        lambda V, T_s, T_w: 0.423 * V**0.556,
+        V_range=(1, 7),
+        T_s_range=(627, 927),
+    ),
+    "Moureou": Correlation(
+        "莫霍(Moureou)",
+        lambda V, T_s, T_w: 0.360 * V**0.556,
+        V_range=(0.8, 2.5),
+        T_s_range=(727, 1027),
+    ),
+    "Bolle_Moureou": Correlation(
+        "波尔-莫霍(Bolle/Moureou)",
+        _bolle_moureou,
+        V_range=(0.8, 7),
+        T_s_range=(627, 1027),
+        note="按V、T_s所在区间选用Bolle或Moureou系数",
+    ),
+    "Sasaki": Correlation(
+        "佐佐木(Sasaki)",
+        lambda V, T_s, T_w: 708 * V**0.75 * T_s**-1.2 + 0.116,
+        V_range=(1.67, 41.7),
+        T_s_range=(700, 1200),
+    ),
+    "Concast": Correlation(
+        "康卡斯特(Concast, 存疑)",
+        lambda V, T_s, T_w: KCAL * 0.875 * 5748 * (1 - 0.0075 * T_w) * V**0.451,
+    ),
+    "BUIST": Correlation(
+        "BUIST",
+        lambda V, T_s, T_w: np.where(
+            (V > 4.5) & (V < 20), KCAL * (0.35 * V + 0.13), np.nan
+        ),
+        V_range=(4.5, 20),
+    ),
+    "CaiKaike": Correlation(
+        "蔡开科",
+        lambda V, T_s, T_w: KCAL * 2.25e4 * (1 - 0.00075 * T_w) * V**0.55,
+    ),
+    "ZhangKeqiang": Correlation(
+        "张克强(0.25MPa)",
+        lambda V, T_s, T_w: np.where(T_s == 900, 0.37 + 0.35 * V**0.954, np.nan),
+        T_s_range=(900, 900),
+    ),
+    "Billet": Correlation("方坯二冷区", _billet, note="按表面温度分段"),
+    "Sasaki_K": Correlation(
+        "佐佐木宽太郎", _sasaki_k, T_s_range=(600, 1200), note="按表面温度分段"
+    ),
+    "Concast_Journal": Correlation(
+        "Concast期刊(0.276MPa)",
+        lambda V, T_s, T_w: KCAL * 9.0 * 0.276**0.2 * V**0.75,
+    ),
+    "Tegurashi": Correlation(
+        "手鸠俊雄",
+        lambda V, T_s, T_w: KCAL * 280.56 * 10**0.1373 * V**0.75,
+        note="空气流量密度10 NL/m²·s，KT=1.0",
+    ),
+    "Nippon_Steel": Correlation(
+        "新日铁PMD", lambda V, T_s, T_w: KCAL * (9.0 * V**0.85 + 100)
+    ),
+    "Okamura": Correlation("冈村一男", _okamura, note="va=21.5m/s，Th=293K"),
+    "Kashima": Correlation(
+        "鹿岛3号板坯连铸机",
+        lambda V, T_s, T_w: KCAL * 10**1.48 * V**0.6293 * T_s**-0.1358 * 20**0.2734,
+        note="va=20m/s，z=1",
+    ),
+    "Hitachi": Correlation(
+        "日立造船技报", lambda V, T_s, T_w: KCAL * 70.4 * V**0.31343
+    ),
+    "Muller_Jeachar": Correlation(
+        "Muller Jeachar",
+        lambda V, T_s, T_w: KCAL * 0.42 * V**0.35 * 21.5**0.5,
+        V_range=(0.3, 9.0),
+        note="uc=21.5m/s(11~32m/s)",
+    ),
+}
+
+
+def _correlation(method: str) -> Correlation:
+    try:
+        return CORRELATIONS[method]
+    except KeyError:
+        raise ValueError(f"未知的计算方法: {method}") from None
+
+
+def valid_mask(V, T_s, method: str) -> np.ndarray:
+    """关联式的实验适用范围
+
+    Args:
+        V: 水流密度(L/m²·s)
+        T_s: 铸坯表面温度(℃)
+        method: 关联式名称
+
+    Returns:
+        与广播后的V、T_s同形的布尔数组
+    """
+    corr = _correlation(method)
+    V = np.asarray(V, dtype=float)
+    T_s = np.asarray(T_s, dtype=float)
+    (v_lo, v_hi), (t_lo, t_hi) = corr.V_range, corr.T_s_range
+    return (V >= v_lo) & (V <= v_hi) & (T_s >= t_lo) & (T_s <= t_hi)
+
+
+def heat_transfer_coefficient(V, T_s, T_w, method: str) -> np.ndarray:
+    """二冷区换热系数
+
+    Args:
+        V: 水流密度(L/m²·s)，小于0.001时按0.001计算
+        T_s: 铸坯表面温度(℃)
+        T_w: 冷却水温度(℃)
+        method: 关联式名称，见CORRELATIONS
+
+    Returns:
+        换热系数(kW/m²·K)，公式未定义处为NaN，负值截断为0
+    """
+    corr = _correlation(method)
+    V = np.maximum(np.asarray(V, dtype=float), 0.001)
+    T_s = np.asarray(T_s, dtype=float)
+    T_w = np.asarray(T_w, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        h = np.asarray(corr.func(V, T_s, T_w), dtype=float)
+    h = np.broadcast_to(h, np.broadcast_shapes(V.shape, T_s.shape, T_w.shape))
+    return np.where(h < 0, 0.0, h)
+
+
+def evaluate(V, T_s, T_w, method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """换热系数及其有效性掩码
+
+    Args:
+        V: 水流密度(L/m²·s)
+        T_s: 铸坯表面温度(℃)
+        T_w: 冷却水温度(℃)
+        method: 关联式名称
+
+    Returns:
+        (h, valid): 换热系数(kW/m²·K)；在适用范围内且公式有定义、结果为正的位置
+    """
+    h = heat_transfer_coefficient(V, T_s, T_w, method)
+    valid = valid_mask(V, T_s, method) & np.isfinite(h) & (h > 0)
+    return h, np.broadcast_to(valid, h.shape)
@@ -1,6 +1,9 @@
+import json
+
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# 绘图库只在直接运行本文件时导入，求解器本身不依赖plotly，
+# 可在没有图形环境的批处理任务中使用(见run_simulation.py)
 
 
 def get_conductivity(T):
@@ -38,6 +41,12 @@ def solve_transient_heat_conduction(
     total_time,
     initial_temp=1550,  # 使用全局定义的初始温度
     tol=1e-6,  # 使用全局定义的容差
+    boundary_time_segments=None,
+    q_top=0.0,
+    q_right=0.0,
+    callback=None,
+    callback_interval=100,
+    keep_history=True,
 ):
     """
     二维瞬态热传导问题求解（显式格式）
@@ -51,7 +60,19 @@ def solve_transient_heat_conduction(
         total_time: 总模拟时间 [s]
         initial_temp: 初始温度 [K]
         tol: 收敛容差（用于稳态检测）
+        boundary_time_segments: 边界条件分段列表(见boundary_config.py)，
+            默认为整个时间段使用第三类边界
+        q_top, q_right: 分段中未给出热流密度时使用的默认值 [W/m²]
+        callback: 进度回调 callback(n, n_steps, t, T)，每callback_interval步
+            及最后一步调用；回调中抛出异常即可中止计算。达到稳态提前结束时，
+            最后一次调用的n_steps为实际计算的步数(n + 1)
+        callback_interval: 回调间隔步数
+        keep_history: 是否在内存中保留每100步的温度场；长时间计算应设为
+            False，改由回调把温度场写入field_store.py的分块存储
     """
+    if not boundary_time_segments:
+        boundary_time_segments = [{"start": 0, "end": total_time, "type": "third_kind"}]
+
     # 网格生成
     dx = Lx / (nx - 1)
     dy = Ly / (ny - 1)
@@ -172,12 +193,20 @@ def solve_transient_heat_conduction(
             ) / (2 * k)
 
         # 记录时间和温度（可选）
-        if n % 100 == 0:
+        if keep_history and n % 100 == 0:
             time_history.append(n * dt)
             temp_history.append(T.copy())
 
         # 稳态检测
-        if np.max(np.abs(T - T_old)) < tol:
+        steady = np.max(np.abs(T - T_old)) < tol
+        if callback is not None:
+            if steady:
+                # 提前结束时把最后的温度场也交给回调，并告知这是最后一步
+                callback(n, n + 1, (n + 1) * dt, T)
+            elif n % callback_interval == 0 or n == n_steps - 1:
+                callback(n, n_steps, (n + 1) * dt, T)
+
+        if steady:
             print(f"\n稳态在 t = {n*dt:.2f}s 达到")
             print(f"最终温度范围: {np.min(T):.1f}℃ ~ {np.max(T):.1f}℃")
             break
@@ -185,121 +214,107 @@ def solve_transient_heat_conduction(
     return X, Y, T, time_history, temp_history
 
 
-# ====================== 模拟参数设置 ======================
-# 几何参数
-Lx = 82.5e-3  # x方向长度 [m]
-Ly = 82.5e-3  # y方向长度 [m]
-nx = 61  # x方向网格数 (建议奇数)
-ny = 61  # y方向网格数 (建议奇数)
-
-# 材料相变参数
-initial_temp = 1550  # 初始温度 [℃]
-liquid_temp = 1520  # 液相线温度 [℃]
-solid_temp = 1450  # 固相线温度 [℃]
-temp_size = liquid_temp - solid_temp  # 凝固区间大小
-
-# 边界条件参数
-boundary_type = "third_kind"  # "third_kind"或"second_kind"
-h_top = 100.0  # 顶部对流换热系数 [W/(m²·K)] (第三类边界)
-h_right = 100.0  # 右侧对流换热系数 [W/(m²·K)] (第三类边界)
-T_inf_top = 10.0  # 顶部环境温度 [℃] (第三类边界)
-T_inf_right = 10.0  # 右侧环境温度 [℃] (第三类边界)
-q_top = 0.0  # 顶部热流密度 [W/m²] (第二类边界)
-q_right = 0.0  # 右侧热流密度 [W/m²] (第二类边界)
-
-# 时间参数
-dt = 0.02  # 时间步长 [s] (需满足稳定性条件)
-total_time = 5 * 60  # 总模拟时间 [s]
-tol = 1e-6  # 稳态检测容差
-# 从JSON文件加载边界条件配置
-import json
+if __name__ == "__main__":
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    from field_render import add_temperature_field
+
+    # ====================== 模拟参数设置 ======================
+    # 几何参数
+    Lx = 82.5e-3  # x方向长度 [m]
+    Ly = 82.5e-3  # y方向长度 [m]
+    nx = 61  # x方向网格数 (建议奇数)
+    ny = 61  # y方向网格数 (建议奇数)
+
+    # 材料相变参数
+    initial_temp = 1550  # 初始温度 [℃]
+    liquid_temp = 1520  # 液相线温度 [℃]
+    solid_temp = 1450  # 固相线温度 [℃]
+
+    # 边界条件参数
+    boundary_type = "third_kind"  # "third_kind"或"second_kind"
+    h_top = 100.0  # 顶部对流换热系数 [W/(m²·K)] (第三类边界)
+    h_right = 100.0  # 右侧对流换热系数 [W/(m²·K)] (第三类边界)
+    T_inf_top = 10.0  # 顶部环境温度 [℃] (第三类边界)
+    T_inf_right = 10.0  # 右侧环境温度 [℃] (第三类边界)
+    q_top = 0.0  # 顶部热流密度 [W/m²] (第二类边界)
+    q_right = 0.0  # 右侧热流密度 [W/m²] (第二类边界)
+
+    # 时间参数
+    dt = 0.02  # 时间步长 [s] (需满足稳定性条件)
+    total_time = 5 * 60  # 总模拟时间 [s]
+    tol = 1e-6  # 稳态检测容差
+    # 从JSON文件加载边界条件配置
+    try:
+        with open("boundary_config.json", "r", encoding="utf-8") as f:
+            boundary_config = json.load(f)
+        boundary_time_segments = boundary_config["segments"]
+        total_time = boundary_config["total_time"]
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            "未找到boundary_config.json配置文件，"
+            "请先运行boundary_config.py生成配置文件"
+        )
 
-try:
-    with open("boundary_config.json", "r", encoding="utf-8") as f:
-        boundary_config = json.load(f)
-    boundary_time_segments = boundary_config["segments"]
-    total_time = boundary_config["total_time"]
-except FileNotFoundError:
-    raise FileNotFoundError(
-        "未找到boundary_config.json配置文件，" "请先运行boundary_config.py生成配置文件"
+    # ====================== 参数说明 ======================
+    # 1. 网格数nx,ny建议取奇数以便有中心点
+    # 2. 时间步长dt需满足Fourier数<=0.5的稳定性条件
+    # 3. 初始温度应高于液相线温度
+    # 4. 对流换热系数h值影响冷却速率
+
+    # 求解
+    X, Y, T_final, time_history, temp_history = solve_transient_heat_conduction(
+        Lx,
+        Ly,
+        nx,
+        ny,
+        h_top,
+        h_right,
+        T_inf_top,
+        T_inf_right,
+        dt,
+        total_time,
+        initial_temp,
+        boundary_time_segments=boundary_time_segments,
+        q_top=q_top,
+        q_right=q_right,
     )
 
+    # 创建plotly图形
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        subplot_titles=(
+            f"Final Temperature (t={total_time}s)",
+            "Temperature at Center Point",
+        ),
+    )
 
-# ====================== 参数说明 ======================
-# 1. 网格数nx,ny建议取奇数以便有中心点
-# 2. 时间步长dt需满足Fourier数<=0.5的稳定性条件
-# 3. 初始温度应高于液相线温度
-# 4. 对流换热系数h值影响冷却速率
+    # 温度场图像(降采样后镜像为完整断面)及液相线、固相线
+    add_temperature_field(
+        fig,
+        T_final,
+        X[0, :],
+        Y[:, 0],
+        isotherms={"液相线": liquid_temp, "固相线": solid_temp},
+        row=1,
+        col=1,
+    )
+    fig.update_xaxes(title_text="x (m)", row=1, col=1)
+    fig.update_yaxes(title_text="y (m)", row=1, col=1)
+
+    # 中心点温度变化曲线
+    center_i, center_j = 0, 0
+    center_temp = [T[center_i, center_j] for T in temp_history]
+    fig.add_trace(
+        go.Scatter(x=time_history, y=center_temp, mode="lines", line=dict(color="red")),
+        row=1,
+        col=2,
+    )
+    fig.update_xaxes(title_text="Time (s)", row=1, col=2)
+    fig.update_yaxes(title_text="Temperature (℃)", row=1, col=2)
 
-# 求解
-X, Y, T_final, time_history, temp_history = solve_transient_heat_conduction(
-    Lx,
-    Ly,
-    nx,
-    ny,
-    h_top,
-    h_right,
-    T_inf_top,
-    T_inf_right,
-    dt,
-    total_time,
-    initial_temp,
-)
-
-# 创建对称的温度场
-full_T = np.vstack((np.flipud(T_final), T_final))
-full_T = np.hstack((np.fliplr(full_T), full_T))
-full_X = np.hstack((-np.fliplr(X), X))
-full_Y = np.vstack((-np.flipud(Y), Y))
-
-# 创建plotly图形
-fig = make_subplots(
-    rows=1,
-    cols=2,
-    subplot_titles=(
-        f"Final Temperature (t={total_time}s)",
-        "Temperature at Center Point",
-    ),
-)
-
-# 温度场等高线图
-fig.add_trace(
-    go.Contour(
-        x=full_X[0, :],
-        y=full_Y[:, 0],
-        z=full_T,
-        zmin=900,
-        zmax=1600,
-        colorscale="Jet",
-        colorbar=dict(title="Temperature (℃)"),
-        contours=dict(
-            coloring="heatmap",
-            start=liquid_temp,
-            end=solid_temp,
-            size=temp_size,
-            showlabels=True,  # 显示等值线标签
-            labelfont=dict(size=12, color="white"),  # 设置标签字体
-            labelformat="%s℃",  # 设置标签格式
-            # labels=["液相线", "固相线"],  # 自定义等值线标签
-        ),
-    ),
-    row=1,
-    col=1,
-)
-fig.update_xaxes(title_text="x (m)", row=1, col=1)
-fig.update_yaxes(title_text="y (m)", row=1, col=1)
-
-# 中心点温度变化曲线
-center_i, center_j = 0, 0
-center_temp = [T[center_i, center_j] for T in temp_history]
-fig.add_trace(
-    go.Scatter(x=time_history, y=center_temp, mode="lines", line=dict(color="red")),
-    row=1,
-    col=2,
-)
-fig.update_xaxes(title_text="Time (s)", row=1, col=2)
-fig.update_yaxes(title_text="Temperature (℃)", row=1, col=2)
-
-fig.update_layout(height=500, width=1000, showlegend=False)
-fig.write_html("heat_conduction_2d.html")
-fig.show()
+    fig.update_layout(height=500, width=1000, showlegend=False)
+    fig.write_html("heat_conduction_2d.html")
+    fig.show()
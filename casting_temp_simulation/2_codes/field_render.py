@@ -0,0 +1,274 @@
+"""温度场的服务端渲染
+
+求解器只计算1/4断面(x、y方向的第0行/列为对称面)。原先的做法是用
+np.vstack/np.hstack拼出完整断面，再把全分辨率的数据以Contour的形式
+发送给浏览器，细网格时JSON可达数MB，浏览器明显卡顿。这里:
+
+- 先在1/4断面上降采样/块平均到显示分辨率，再镜像，不复制全分辨率数据；
+- 用颜色表把温度场预先栅格化为uint8 RGB图像(go.Image)，悬停时显示
+  显示分辨率下的温度；
+- 在服务端用marching squares计算液相线、固相线等温线，只发送线段坐标。
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import get_colorscale, sample_colorscale
+
+
+def _block_reduce(a: np.ndarray, factor: int, axis: int) -> np.ndarray:
+    """沿某一轴按factor个元素一组求平均(末尾不足一组的部分单独平均)"""
+    if factor <= 1:
+        return a
+    n = a.shape[axis]
+    pad = (-n) % factor
+    if pad:
+        widths = [(0, 0)] * a.ndim
+        widths[axis] = (0, pad)
+        a = np.pad(a.astype(float, copy=False), widths, constant_values=np.nan)
+    shape = list(a.shape)
+    shape[axis : axis + 1] = [shape[axis] // factor, factor]
+    return np.nanmean(a.reshape(shape), axis=axis + 1)
+
+
+def downsample_quarter(
+    T: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int = 200,
+    method: str = "mean",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """把1/4断面温度场降到显示分辨率
+
+    Args:
+        T: 1/4断面温度场，形状(ny, nx)，第0行/列为对称面
+        x, y: 对应的坐标(m)
+        max_points: 镜像后完整断面每个方向的最大点数
+        method: "mean"为块平均，"stride"为等间隔抽取(返回视图，不复制)
+
+    Returns:
+        (T_ds, x_ds, y_ds) 降采样后的1/4断面及坐标
+    """
+    half = max(max_points // 2, 1)
+    fy = int(np.ceil(T.shape[0] / half))
+    fx = int(np.ceil(T.shape[1] / half))
+    if method == "stride":
+        return T[::fy, ::fx], x[::fx], y[::fy]
+    if method != "mean":
+        raise ValueError(f"未知的降采样方法: {method}")
+    T_ds = _block_reduce(_block_reduce(T, fy, 0), fx, 1)
+    return T_ds, _block_reduce(x, fx, 0), _block_reduce(y, fy, 0)
+
+
+def mirror_quarter(
+    T: np.ndarray, x: np.ndarray, y: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """由1/4断面镜像出完整断面(应在降采样后调用，只在显示分辨率上复制)"""
+    T_full = np.concatenate((T[::-1], T), axis=0)
+    T_full = np.concatenate((T_full[:, ::-1], T_full), axis=1)
+    return T_full, np.concatenate((-x[::-1], x)), np.concatenate((-y[::-1], y))
+
+
+def colorize(
+    T: np.ndarray, zmin: float, zmax: float, colorscale: str = "Jet"
+) -> np.ndarray:
+    """按颜色表把温度场栅格化为uint8 RGB图像，形状(ny, nx, 3)"""
+    lut = np.array(
+        [
+            [int(float(c)) for c in color[color.index("(") + 1 : -1].split(",")]
+            for color in sample_colorscale(
+                get_colorscale(colorscale), np.linspace(0, 1, 256), colortype="rgb"
+            )
+        ],
+        dtype=np.uint8,
+    )
+    scaled = (np.nan_to_num(T, nan=zmin) - zmin) / (zmax - zmin)
+    index = np.clip(np.rint(scaled * 255), 0, 255).astype(np.uint8)
+    return lut[index]
+
+
+# marching squares: 单元四角按 (左下, 右下, 右上, 左上) 编码，
+# 每种情况对应的边对; 边编号 0下 1右 2上 3左
+_MS_SEGMENTS = {
+    1: [(3, 0)],
+    2: [(0, 1)],
+    3: [(3, 1)],
+    4: [(1, 2)],
+    5: [(3, 2), (0, 1)],
+    6: [(0, 2)],
+    7: [(3, 2)],
+    8: [(2, 3)],
+    9: [(2, 0)],
+    10: [(2, 1), (0, 3)],
+    11: [(2, 1)],
+    12: [(1, 3)],
+    13: [(1, 0)],
+    14: [(0, 3)],
+}
+
+
+def isotherm(
+    T: np.ndarray, x: np.ndarray, y: np.ndarray, level: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """用marching squares计算等温线
+
+    Args:
+        T: 温度场，形状(ny, nx)
+        x, y: 坐标
+        level: 等温线温度
+
+    Returns:
+        (xs, ys) 线段端点坐标，相邻线段之间用NaN分隔，可直接用于Scatter
+    """
+    above = T >= level
+    bl, br = above[:-1, :-1], above[:-1, 1:]
+    tr, tl = above[1:, 1:], above[1:, :-1]
+    case = bl * 1 + br * 2 + tr * 4 + tl * 8
+
+    v_bl, v_br = T[:-1, :-1], T[:-1, 1:]
+    v_tr, v_tl = T[1:, 1:], T[1:, :-1]
+    x0, x1 = x[:-1][None, :], x[1:][None, :]
+    y0, y1 = y[:-1][:, None], y[1:][:, None]
+
+    def frac(a, b):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (level - a) / (b - a)
+        return np.clip(np.nan_to_num(t, nan=0.5), 0, 1)
+
+    # 四条边上的交点坐标
+    edge_x = (
+        x0 + frac(v_bl, v_br) * (x1 - x0),  # 下
+        np.broadcast_to(x1, case.shape),  # 右
+        x0 + frac(v_tl, v_tr) * (x1 - x0),  # 上
+        np.broadcast_to(x0, case.shape),  # 左
+    )
+    edge_y = (
+        np.broadcast_to(y0, case.shape),
+        y0 + frac(v_br, v_tr) * (y1 - y0),
+        np.broadcast_to(y1, case.shape),
+        y0 + frac(v_bl, v_tl) * (y1 - y0),
+    )
+
+    xs, ys = [], []
+    for code, segments in _MS_SEGMENTS.items():
+        mask = case == code
+        if not mask.any():
+            continue
+        for e0, e1 in segments:
+            n = int(mask.sum())
+            seg_x = np.empty((n, 3))
+            seg_y = np.empty((n, 3))
+            seg_x[:, 0], seg_x[:, 1] = edge_x[e0][mask], edge_x[e1][mask]
+            seg_y[:, 0], seg_y[:, 1] = edge_y[e0][mask], edge_y[e1][mask]
+            seg_x[:, 2] = seg_y[:, 2] = np.nan
+            xs.append(seg_x.ravel())
+            ys.append(seg_y.ravel())
+
+    if not xs:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def mirror_lines(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """把1/4断面上的线段镜像到四个象限"""
+    sep = np.array([np.nan])
+    mx = np.concatenate((xs, sep, -xs, sep, xs, sep, -xs))
+    my = np.concatenate((ys, sep, ys, sep, -ys, sep, -ys))
+    return mx, my
+
+
+def add_temperature_field(
+    fig: go.Figure,
+    T: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    isotherms: Optional[Dict[str, float]] = None,
+    zmin: float = 900,
+    zmax: float = 1600,
+    colorscale: str = "Jet",
+    max_points: int = 200,
+    row: Optional[int] = None,
+    col: Optional[int] = None,
+) -> go.Figure:
+    """在图中添加完整断面的温度场图像和等温线
+
+    Args:
+        fig: 目标图(可为make_subplots创建的子图)
+        T: 1/4断面温度场，形状(ny, nx)，第0行/列为对称面
+        x, y: 1/4断面的坐标(m)
+        isotherms: 等温线名称 -> 温度，如{"液相线": 1520, "固相线": 1450}
+        zmin, zmax: 颜色范围(℃)
+        colorscale: plotly颜色表名称
+        max_points: 完整断面每个方向的最大显示点数
+        row, col: 子图位置
+
+    Returns:
+        fig
+    """
+    T_ds, x_ds, y_ds = downsample_quarter(T, x, y, max_points)
+    T_full, x_full, y_full = mirror_quarter(T_ds, x_ds, y_ds)
+
+    dx = (x_full[-1] - x_full[0]) / max(len(x_full) - 1, 1)
+    dy = (y_full[-1] - y_full[0]) / max(len(y_full) - 1, 1)
+    fig.add_trace(
+        go.Image(
+            z=colorize(T_full, zmin, zmax, colorscale),
+            x0=x_full[0],
+            dx=dx,
+            y0=y_full[0],
+            dy=dy,
+            # 图像像素是颜色，悬停时从customdata读取显示分辨率下的温度；
+            # plotly.js按[行][列]取悬停值时要求行为普通数组，二进制编码的
+            # 二维数组取不到，因此以嵌套列表发送
+            customdata=np.rint(np.nan_to_num(T_full, nan=zmin)).astype(int).tolist(),
+            hovertemplate="x: %{x:.4f} m<br>y: %{y:.4f} m<br>T: %{customdata} ℃"
+            "<extra></extra>",
+        ),
+        row=row,
+        col=col,
+    )
+    # 图像没有色标，用一个不可见的散点显示色标
+    fig.add_trace(
+        go.Scatter(
+            x=[x_full[0], x_full[0]],
+            y=[y_full[0], y_full[0]],
+            mode="markers",
+            marker=dict(
+                size=0,
+                color=[zmin, zmax],
+                colorscale=colorscale,
+                cmin=zmin,
+                cmax=zmax,
+                showscale=True,
+                colorbar=dict(title="Temperature (℃)"),
+            ),
+            hoverinfo="skip",
+            showlegend=False,
+        ),
+        row=row,
+        col=col,
+    )
+
+    # 等温线在1/4断面上计算后镜像；取显示分辨率数倍的等间隔视图，
+    # 线段数不随求解网格加密而无限增长
+    T_line, x_line, y_line = downsample_quarter(
+        T, x, y, max_points * 4, method="stride"
+    )
+    for name, level in (isotherms or {}).items():
+        xs, ys = mirror_lines(*isotherm(T_line, x_line, y_line, level))
+        fig.add_trace(
+            go.Scatter(
+                x=xs,
+                y=ys,
+                mode="lines",
+                name=f"{name} ({level:g}℃)",
+                line=dict(color="white", width=1.5),
+                hoverinfo="name",
+            ),
+            row=row,
+            col=col,
+        )
+
+    fig.update_yaxes(autorange=True, scaleanchor="x", scaleratio=1, row=row, col=col)
+    return fig
@@ -0,0 +1,330 @@
+"""温度场结果的分块磁盘存储
+
+求解过程中逐帧写入，读取时按需加载单帧或局部区域，长时间、细网格的
+计算结果无需整体载入内存，也不必重新计算。存储为一个目录:
+
+    <path>/meta.json          网格、分块参数、测点、输入参数和已写入的帧数
+    <path>/frame_times.f64    各帧的时刻(追加写入的原始float64)
+    <path>/probes.f64         测点时间序列，每行为(t, 测点1, 测点2, ...)
+    <path>/chunks/000000.npy  每chunk_frames帧一块，形状(n, ny, nx)，float32
+
+- compression="none"时分块为普通.npy文件，读取时内存映射，取单帧或
+  局部区域只读取对应的页；
+- compression="zlib"时分块按字节重排(同一字节位放在一起，类似blosc的
+  shuffle)后用zlib压缩，温度场通常可压缩到1/3以下，读取时整块解压，
+  并缓存最近用到的几块。
+
+帧数、测点数都以meta.json为准，只有写完的块和样本才计入；先写数据
+再原子替换meta.json，计算过程中也可以安全地读取。
+"""
+
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+COMPRESSIONS = ("none", "zlib")
+DEFAULT_CHUNK_FRAMES = 8
+# 写入过程中至少每隔这么多秒更新一次meta.json，便于实时查看
+FLUSH_SECONDS = 1.0
+_DTYPE = np.dtype(np.float32)
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _chunk_path(root: Path, index: int, compression: str) -> Path:
+    suffix = ".npy" if compression == "none" else ".zlib"
+    return root / "chunks" / f"{index:06d}{suffix}"
+
+
+def _shuffle(a: np.ndarray) -> bytes:
+    """按字节位重排: 先所有元素的第0字节，再第1字节……"""
+    return a.view(np.uint8).reshape(-1, a.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(shape)
+
+
+def probe_indices(
+    x: np.ndarray, y: np.ndarray, probes: Mapping[str, Sequence[float]]
+) -> Dict[str, Tuple[int, int]]:
+    """测点坐标(m) -> 最近节点的(行, 列)索引"""
+    return {
+        name: (int(np.abs(y - py).argmin()), int(np.abs(x - px).argmin()))
+        for name, (px, py) in probes.items()
+    }
+
+
+def quarter_section_probes(Lx: float, Ly: float) -> Dict[str, Tuple[float, float]]:
+    """1/4断面(x=0、y=0为对称面)上的默认测点"""
+    return {
+        "中心": (0.0, 0.0),
+        "上表面中心": (0.0, Ly),
+        "右表面中心": (Lx, 0.0),
+        "角部": (Lx, Ly),
+    }
+
+
+class FieldStoreWriter:
+    """逐帧写入温度场
+
+    可作为上下文管理器使用，正常退出时标记为完成，异常退出时保留已写入
+    的数据并标记为未完成。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        x: np.ndarray,
+        y: np.ndarray,
+        probes: Optional[Mapping[str, Sequence[float]]] = None,
+        chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+        compression: str = "zlib",
+        attrs: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        Args:
+            path: 存储目录(已存在时覆盖其中的结果)
+            x: X方向节点坐标(m)，形状(nx,)
+            y: Y方向节点坐标(m)，形状(ny,)
+            probes: 测点名 -> (x, y)坐标(m)，取最近的节点
+            chunk_frames: 每块的帧数
+            compression: "none"(可内存映射) 或 "zlib"
+            attrs: 随结果保存的附加信息(需可JSON序列化)，如计算参数
+
+        Raises:
+            ValueError: 当压缩方式未知或分块帧数不为正时
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"未知的压缩方式: {compression}，可选 {COMPRESSIONS}")
+        if chunk_frames < 1:
+            raise ValueError("每块的帧数须为正整数")
+        self.root = Path(path)
+        (self.root / "chunks").mkdir(parents=True, exist_ok=True)
+        for old in self.root.glob("chunks/*"):
+            old.unlink()
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.chunk_frames = chunk_frames
+        self.compression = compression
+        self.probes = probe_indices(self.x, self.y, probes or {})
+        self._probe_rows, self._probe_cols = (
+            np.array([ij[k] for ij in self.probes.values()], dtype=int) for k in (0, 1)
+        )
+        self._buffer = np.empty((chunk_frames, len(self.y), len(self.x)), _DTYPE)
+        self._n_buffered = 0
+        self._n_chunks = 0
+        self._n_probe_samples = 0
+        self._last_flush = time.monotonic()
+        self.meta: Dict[str, Any] = {
+            "version": FORMAT_VERSION,
+            "x": self.x.tolist(),
+            "y": self.y.tolist(),
+            "dtype": _DTYPE.str,
+            "chunk_frames": chunk_frames,
+            "compression": compression,
+            "probes": {name: list(ij) for name, ij in self.probes.items()},
+            "attrs": dict(attrs or {}),
+            "n_frames": 0,
+            "n_probe_samples": 0,
+            "complete": False,
+        }
+        self._times = open(self.root / "frame_times.f64", "wb")
+        self._probe_file = open(self.root / "probes.f64", "wb")
+        _write_json_atomic(self.root / "meta.json", self.meta)
+
+    def record(self, t: float, T: np.ndarray, frame: bool = True) -> None:
+        """记录一个时刻: 测点值总是记录，frame为True时保存整帧
+
+        Args:
+            t: 时刻(s)
+            T: 温度场，形状(ny, nx)
+            frame: 是否保存整帧
+        """
+        row = np.empty(1 + len(self.probes))
+        row[0] = t
+        row[1:] = T[self._probe_rows, self._probe_cols]
+        self._probe_file.write(row.tobytes())
+        self._n_probe_samples += 1
+
+        if frame:
+            self._buffer[self._n_buffered] = T
+            self._n_buffered += 1
+            self._times.write(np.float64(t).tobytes())
+            if self._n_buffered == self.chunk_frames:
+                self._write_chunk()
+        if time.monotonic() - self._last_flush > FLUSH_SECONDS:
+            self.flush()
+
+    def _write_chunk(self) -> None:
+        frames = self._buffer[: self._n_buffered]
+        path = _chunk_path(self.root, self._n_chunks, self.compression)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            if self.compression == "none":
+                np.save(f, frames)
+            else:
+                f.write(zlib.compress(_shuffle(frames), 1))
+        os.replace(tmp, path)
+        self.meta["n_frames"] = self._n_chunks * self.chunk_frames + self._n_buffered
+        self._n_chunks += 1
+        self._n_buffered = 0
+        self.flush()
+
+    def flush(self) -> None:
+        """把已写入的帧和测点样本公开给读取方"""
+        self._times.flush()
+        self._probe_file.flush()
+        self.meta["n_probe_samples"] = self._n_probe_samples
+        _write_json_atomic(self.root / "meta.json", self.meta)
+        self._last_flush = time.monotonic()
+
+    def close(self, complete: bool = True) -> None:
+        """写出最后不满一块的帧并关闭文件"""
+        if self._times.closed:
+            return
+        if self._n_buffered:
+            self._write_chunk()
+        self.meta["complete"] = complete
+        self.flush()
+        self._times.close()
+        self._probe_file.close()
+
+    def __enter__(self) -> "FieldStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(complete=exc_type is None)
+
+
+class FieldStore:
+    """按需读取温度场存储
+
+    单帧和局部区域按块读取：未压缩的块内存映射，只读取用到的页；
+    压缩的块整块解压后缓存最近的max_cached_chunks块。
+    """
+
+    def __init__(self, path: str, max_cached_chunks: int = 4):
+        """
+        Args:
+            path: 存储目录
+            max_cached_chunks: 缓存的块数
+
+        Raises:
+            FileNotFoundError: 当目录中没有meta.json时
+        """
+        self.root = Path(path)
+        self.max_cached_chunks = max_cached_chunks
+        self._chunks: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """重新读取meta.json(计算仍在进行时获取新写入的帧)"""
+        with open(self.root / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.x = np.asarray(self.meta["x"])
+        self.y = np.asarray(self.meta["y"])
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.chunk_frames = self.meta["chunk_frames"]
+        self.compression = self.meta["compression"]
+        self.attrs = self.meta["attrs"]
+        self.complete = self.meta["complete"]
+        self.n_frames = self.meta["n_frames"]
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """(帧数, ny, nx)"""
+        return self.n_frames, len(self.y), len(self.x)
+
+    @property
+    def probe_names(self) -> Tuple[str, ...]:
+        return tuple(self.meta["probes"])
+
+    @property
+    def times(self) -> np.ndarray:
+        """各帧的时刻(s)"""
+        return np.fromfile(
+            self.root / "frame_times.f64", dtype=np.float64, count=self.n_frames
+        )
+
+    def _chunk(self, index: int) -> np.ndarray:
+        chunk = self._chunks.get(index)
+        if chunk is not None:
+            self._chunks.move_to_end(index)
+            return chunk
+        path = _chunk_path(self.root, index, self.compression)
+        if self.compression == "none":
+            chunk = np.load(path, mmap_mode="r")
+        else:
+            n = min(self.chunk_frames, self.n_frames - index * self.chunk_frames)
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+            chunk = _unshuffle(data, (n, len(self.y), len(self.x)), self.dtype)
+        self._chunks[index] = chunk
+        while len(self._chunks) > self.max_cached_chunks:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def frame(
+        self, k: int, rows: slice = slice(None), cols: slice = slice(None)
+    ) -> np.ndarray:
+        """第k帧(可取局部区域)
+
+        Args:
+            k: 帧序号，负数从末尾计
+            rows, cols: 行(y)、列(x)方向的切片
+
+        Returns:
+            只读数组(未压缩时为内存映射)
+
+        Raises:
+            IndexError: 当帧序号超出范围时
+        """
+        if not -self.n_frames <= k < self.n_frames:
+            raise IndexError(f"帧序号 {k} 超出范围(共 {self.n_frames} 帧)")
+        k %= self.n_frames
+        return self._chunk(k // self.chunk_frames)[k % self.chunk_frames, rows, cols]
+
+    def frames(
+        self,
+        indices: Sequence[int],
+        rows: slice = slice(None),
+        cols: slice = slice(None),
+    ) -> np.ndarray:
+        """多帧的同一区域，形状(len(indices), 行数, 列数)"""
+        return np.stack([self.frame(k, rows, cols) for k in indices])
+
+    def nearest_frame(self, t: float) -> int:
+        """离时刻t最近的帧序号"""
+        return int(np.abs(self.times - t).argmin())
+
+    def probe_series(self) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """测点的时间序列
+
+        Returns:
+            (t, values)，values为测点名 -> 温度数组
+        """
+        n = self.meta["n_probe_samples"]
+        width = 1 + len(self.probe_names)
+        if n == 0:
+            data = np.empty((0, width))
+        else:
+            data = np.memmap(
+                self.root / "probes.f64", dtype=np.float64, mode="r", shape=(n, width)
+            )
+        return data[:, 0], {
+            name: data[:, i + 1] for i, name in enumerate(self.probe_names)
+        }
@@ -1,5 +1,14 @@
 """钢的热物性计算函数"""
 
+from typing import Tuple
+
+import numpy as np
+
+# 相态整数编码，供向量化计算使用
+PHASE_SOLID = 0
+PHASE_MUSHY = 1
+PHASE_LIQUID = 2
+
 
 def get_phase(T: float, Ts: float, Tl: float) -> str:
     """获取当前温度下的相态
@@ -93,3 +102,128 @@ def rho_cal(T: float, Ts: float, Tl: float, props: dict) -> float:
     elif phase == "mushy":
         return props["rho_m"]
     return props["rho_s"]
+
+
+# ====================== 向量化版本 ======================
+# 以下函数接受整个温度场(及位置场)数组，一次性返回物性场，
+# 计算结果与上面的标量函数逐点一致。
+
+
+def get_phase_code(T, Ts: float, Tl: float) -> np.ndarray:
+    """获取温度场的相态编码
+    Args:
+        T: 温度场数组(K)
+        Ts: 固相线温度(K)
+        Tl: 液相线温度(K)
+    Returns:
+        与T同形状的整数数组: PHASE_SOLID / PHASE_MUSHY / PHASE_LIQUID
+    """
+    T = np.asarray(T, dtype=float)
+    return np.select(
+        [T >= Tl, T >= Ts], [PHASE_LIQUID, PHASE_MUSHY], default=PHASE_SOLID
+    )
+
+
+def _solid_fraction(T: np.ndarray, Ts: float, Tl: float) -> np.ndarray:
+    """两相区固相率 fs = (Tl - T) / (Tl - Ts)"""
+    if Tl == Ts:
+        return np.zeros_like(T)
+    return (Tl - T) / (Tl - Ts)
+
+
+def _lamda_from_phase(
+    T: np.ndarray,
+    position: np.ndarray,
+    phase: np.ndarray,
+    Ts: float,
+    Tl: float,
+    Tc: float,
+    props: dict,
+) -> np.ndarray:
+    lamdal = props["lamda_l"]
+    lamdas = props["lamda_s"]
+    fs = _solid_fraction(T, Ts, Tl)
+
+    liquid = phase == PHASE_LIQUID
+    mushy = phase == PHASE_MUSHY
+    zone0 = (position >= 0) & (position < 1)  # 位置0-1区域
+    zone1 = (position >= 1) & (position < 3)  # 位置1-3区域
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (Tc - T) / (Tc - Tl)
+
+    # Acon修正系数
+    acon = np.select(
+        [zone0 & liquid, zone0 & mushy, zone1 & liquid],
+        [6 - 4 * ratio, 2 - 2 * fs, 1 - ratio],
+        default=0.0,
+    )
+    lamda_eff = (1 + acon) * lamdal
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 并联模型
+        lamdapar = lamda_eff * (1 - fs) + fs * lamdas
+        # 串联模型
+        lamdaser = (lamda_eff * lamdas) / (lamda_eff * fs + (1 - fs) * lamdas)
+
+    return np.select(
+        [liquid, mushy], [lamda_eff, (lamdapar + lamdaser) / 2], default=lamdas
+    )
+
+
+def lamda_field(
+    T, position, Ts: float, Tl: float, Tc: float, props: dict
+) -> np.ndarray:
+    """计算等效热导率场(W/m·K)，lamda_cal的向量化版本
+    Args:
+        T: 温度场数组(K)
+        position: 位置场数组(0-3)，需可与T广播
+        Ts: 固相线温度(K)
+        Tl: 液相线温度(K)
+        Tc: 临界温度(K)
+        props: 钢种热物性字典
+    """
+    T, position = np.broadcast_arrays(
+        np.asarray(T, dtype=float), np.asarray(position, dtype=float)
+    )
+    phase = get_phase_code(T, Ts, Tl)
+    return _lamda_from_phase(T, position, phase, Ts, Tl, Tc, props)
+
+
+def cp_field(T, Ts: float, Tl: float, props: dict) -> np.ndarray:
+    """计算比热容场(J/kg·K)，cp_cal的向量化版本"""
+    phase = get_phase_code(T, Ts, Tl)
+    return np.choose(phase, [props["c_s"], props["c_m"], props["c_l"]]).astype(float)
+
+
+def rho_field(T, Ts: float, Tl: float, props: dict) -> np.ndarray:
+    """计算密度场(kg/m3)，rho_cal的向量化版本"""
+    phase = get_phase_code(T, Ts, Tl)
+    return np.choose(phase, [props["rho_s"], props["rho_m"], props["rho_l"]]).astype(
+        float
+    )
+
+
+def property_fields(
+    T, position, Ts: float, Tl: float, Tc: float, props: dict
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """一次性计算热导率、比热容和密度场，相态只判断一次
+    Args:
+        T: 温度场数组(K)
+        position: 位置场数组(0-3)，需可与T广播
+        Ts: 固相线温度(K)
+        Tl: 液相线温度(K)
+        Tc: 临界温度(K)
+        props: 钢种热物性字典
+    Returns:
+        (k, cp, rho) 三个与广播后形状相同的数组
+    """
+    T, position = np.broadcast_arrays(
+        np.asarray(T, dtype=float), np.asarray(position, dtype=float)
+    )
+    phase = get_phase_code(T, Ts, Tl)
+    k = _lamda_from_phase(T, position, phase, Ts, Tl, Tc, props)
+    cp = np.choose(phase, [props["c_s"], props["c_m"], props["c_l"]]).astype(float)
+    rho = np.choose(phase, [props["rho_s"], props["rho_m"], props["rho_l"]]).astype(
+        float
+    )
+    return k, cp, rho
@@ -0,0 +1,154 @@
+"""按会话和输入哈希保存计算结果
+
+替代原先写入工作目录下results/*.json的做法: 多个用户同时使用时互不覆盖，
+保存时也没有同步的磁盘I/O。结果保存在内存中并按LRU淘汰，可选地持久化
+到本地SQLite数据库(每次写入在一个事务中完成，保证原子性)。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+Record = Dict[str, Any]
+
+
+def input_hash(inputs: Dict[str, Any]) -> str:
+    """计算输入参数的哈希值(与字典键顺序无关)"""
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultStore:
+    """计算结果存储
+
+    以(会话ID, 输入哈希)为键保存{"inputs", "results", "saved"}记录，
+    并记录每个会话最近一次保存的键，供后续计算步骤读取。相同输入的结果
+    相同，持久化后按输入哈希查找时也会用到其他会话(包括服务重启前)保存的结果。
+    """
+
+    def __init__(self, max_entries: int = 256, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: 内存中最多保存的记录数(及记录最近结果的会话数)，
+                超出时淘汰最久未使用的
+            db_path: SQLite数据库路径，为None时只保存在内存中
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Record]" = OrderedDict()
+        self._latest: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS results (
+                        session_id TEXT NOT NULL,
+                        input_hash TEXT NOT NULL,
+                        inputs TEXT NOT NULL,
+                        results TEXT NOT NULL,
+                        saved REAL NOT NULL,
+                        PRIMARY KEY (session_id, input_hash)
+                    )"""
+                )
+                # 跨会话按输入哈希查找
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS results_input_hash "
+                    "ON results (input_hash)"
+                )
+
+    def put(self, session_id: str, inputs: Dict[str, Any], results: Any) -> str:
+        """保存一条结果
+
+        Args:
+            session_id: 会话ID
+            inputs: 输入参数(需可JSON序列化)
+            results: 计算结果(持久化时需可JSON序列化)
+
+        Returns:
+            输入哈希
+        """
+        key_hash = input_hash(inputs)
+        record = {"inputs": inputs, "results": results, "saved": time.time()}
+        with self._lock:
+            key = (session_id, key_hash)
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            self._latest[session_id] = key_hash
+            self._latest.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            while len(self._latest) > self.max_entries:
+                self._latest.popitem(last=False)
+
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                        (
+                            session_id,
+                            key_hash,
+                            json.dumps(inputs, ensure_ascii=False),
+                            json.dumps(results, ensure_ascii=False),
+                            record["saved"],
+                        ),
+                    )
+        return key_hash
+
+    def get(self, session_id: str, key_hash: str) -> Optional[Record]:
+        """按会话ID和输入哈希读取结果，不存在时返回None
+
+        内存中没有时从数据库读取，优先取本会话保存的，其次取其他会话
+        最近保存的相同输入的结果。
+        """
+        key = (session_id, key_hash)
+        with self._lock:
+            record = self._entries.get(key)
+            if record is not None:
+                self._entries.move_to_end(key)
+                return record
+            if self._conn is None:
+                return None
+
+            row = self._conn.execute(
+                "SELECT inputs, results, saved FROM results WHERE input_hash = ? "
+                "ORDER BY session_id = ? DESC, saved DESC LIMIT 1",
+                (key_hash, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            record = {
+                "inputs": json.loads(row[0]),
+                "results": json.loads(row[1]),
+                "saved": row[2],
+            }
+            self._entries[key] = record
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return record
+
+    def lookup(self, session_id: str, inputs: Dict[str, Any]) -> Optional[Record]:
+        """按输入参数读取结果"""
+        return self.get(session_id, input_hash(inputs))
+
+    def latest(self, session_id: str) -> Optional[Record]:
+        """该会话最近一次保存的结果"""
+        key_hash = self._latest.get(session_id)
+        if key_hash is None and self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT input_hash FROM results WHERE session_id = ? "
+                    "ORDER BY saved DESC LIMIT 1",
+                    (session_id,),
+                ).fetchone()
+            key_hash = row[0] if row else None
+        return None if key_hash is None else self.get(session_id, key_hash)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
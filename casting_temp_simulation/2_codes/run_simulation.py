@@ -0,0 +1,437 @@
+"""温度场计算的命令行入口(不依赖Streamlit和Plotly)
+
+读取JSON或TOML格式的计算描述，运行solve_transient_heat_conduction，
+最终温度场写成压缩的.npz文件，温度场历史和测点曲线逐帧写入分块存储
+<name>.fields/(见field_store.py)，另附一份.json记录输入、液相线/固相线
+温度、用时和状态。输入为目录时，目录下的全部.json/.toml文件在进程池中并行计算，
+便于放进定时批处理任务。
+
+计算描述(TOML示例，各节均可省略，省略的参数取DEFAULTS中的默认值):
+
+    name = "q235_r165"
+
+    [steel]
+    grade = "Q235"                          # preset_elements中的钢号
+    kind = "低碳钢"                          # 物性分类
+    composition = { C = 0.18 }              # 覆盖或补充钢号的预设成分(%)
+    liquidus_formula = "1980_国外连铸新技术"
+    solidus_formula = "1997_宝钢技术_平居公式"
+
+    [geometry]
+    Lx = 0.0825                             # 1/4断面尺寸(m)
+    Ly = 0.0825
+    nx = 61
+    ny = 61
+
+    [boundary]
+    h_top = 100.0                           # W/(m²·K)
+    h_right = 100.0
+    T_inf_top = 10.0                        # ℃
+    T_inf_right = 10.0
+    schedule = "boundary_config.json"       # 分段边界(相对本文件)，也可用segments直接给出
+
+    [numerics]
+    dt = 0.02                               # s
+    total_time = 300.0                      # s，省略时取分段配置中的total_time
+    initial_temp = 1550.0                   # ℃
+    tol = 1e-6
+
+    [output]
+    frame_every = 100                       # 每隔多少步保存一帧温度场
+    probe_every = 10                        # 每隔多少步记录一次测点温度
+    compression = "zlib"                    # 或 "none"(读取时内存映射)
+    probes = { 距表面10mm = [0.0, 0.0725] }  # 附加测点(m)，默认已有中心、表面中心和角部
+
+用法:
+    python run_simulation.py case.toml
+    python run_simulation.py cases/ -o results/ -j 4 --skip-existing
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    tomllib = None
+
+from core_calculation import solve_transient_heat_conduction
+from field_store import DEFAULT_CHUNK_FRAMES, FieldStoreWriter, quarter_section_probes
+from thermal_properties import (
+    calculate_const_properties,
+    calculate_liquidus_temp,
+    calculate_solidus_temp,
+    load_formula_names,
+    steel_catalog,
+)
+
+CONFIG_SUFFIXES = (".json", ".toml")
+
+# 各节的默认值，与core_calculation.py中的示例参数一致
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "steel": {
+        "grade": None,
+        "kind": None,
+        "composition": {},
+        "liquidus_formula": None,
+        "solidus_formula": None,
+    },
+    "geometry": {"Lx": 82.5e-3, "Ly": 82.5e-3, "nx": 61, "ny": 61},
+    "boundary": {
+        "h_top": 100.0,
+        "h_right": 100.0,
+        "T_inf_top": 10.0,
+        "T_inf_right": 10.0,
+        "q_top": 0.0,
+        "q_right": 0.0,
+        "segments": None,
+        "schedule": None,
+    },
+    "numerics": {"dt": 0.02, "total_time": None, "initial_temp": 1550.0, "tol": 1e-6},
+    "output": {
+        "frame_every": 100,
+        "probe_every": 10,
+        "compression": "zlib",
+        "chunk_frames": DEFAULT_CHUNK_FRAMES,
+        "probes": {},
+    },
+}
+DEFAULT_TOTAL_TIME = 300.0
+
+
+def _read_raw(path: Path) -> Dict[str, Any]:
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    if suffix == ".toml":
+        if tomllib is None:
+            raise ValueError("读取TOML文件需要Python 3.11及以上版本")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    raise ValueError(f"不支持的文件格式: {suffix}，仅支持 .json 和 .toml")
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """读取计算描述并补全默认值
+
+    Args:
+        path: .json 或 .toml 文件
+
+    Returns:
+        含name和steel/geometry/boundary/numerics/output各节的字典，
+        分段边界已展开到boundary.segments
+
+    Raises:
+        ValueError: 当文件格式不支持、含有未知的节或参数，或输出间隔不匹配时
+    """
+    path = Path(path)
+    raw = _read_raw(path)
+    config = {"name": str(raw.pop("name", path.stem))}
+    unknown = set(raw) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"{path.name}: 未知的节 {sorted(unknown)}")
+    for section, defaults in DEFAULTS.items():
+        values = raw.get(section, {})
+        unknown = set(values) - set(defaults)
+        if unknown:
+            raise ValueError(f"{path.name}: [{section}] 中有未知参数 {sorted(unknown)}")
+        config[section] = {**copy.deepcopy(defaults), **values}
+
+    boundary, numerics = config["boundary"], config["numerics"]
+    schedule = boundary.pop("schedule")
+    if schedule is not None:
+        # 与boundary_config.py保存的格式相同: {"total_time": ..., "segments": [...]}
+        with open(path.parent / schedule, "r", encoding="utf-8") as f:
+            schedule_data = json.load(f)
+        if boundary["segments"] is None:
+            boundary["segments"] = schedule_data["segments"]
+        if numerics["total_time"] is None:
+            numerics["total_time"] = schedule_data.get("total_time")
+    if numerics["total_time"] is None:
+        numerics["total_time"] = DEFAULT_TOTAL_TIME
+    output = config["output"]
+    if output["frame_every"] % output["probe_every"] != 0:
+        raise ValueError(f"{path.name}: frame_every须为probe_every的整数倍")
+    return config
+
+
+def steel_summary(steel: Dict[str, Any]) -> Dict[str, Any]:
+    """钢种成分、液相线/固相线温度和物性参数
+
+    Args:
+        steel: 计算描述中的steel节
+
+    Returns:
+        包含composition、liquidus_formula、solidus_formula、liquid_temp、
+        solid_temp、const_properties的字典；未给出成分时温度为None
+
+    Raises:
+        ValueError: 当钢号、物性分类或公式未知时
+    """
+    composition = {}
+    if steel["grade"] is not None:
+        if steel["grade"] not in steel_catalog.preset_elements:
+            raise ValueError(f"未知的钢号: {steel['grade']}")
+        composition.update(steel_catalog.preset_elements[steel["grade"]])
+    composition.update(steel["composition"])
+    # 预设成分中"Ti≥5C~0.70"这类范围无法代入公式，按未添加处理
+    composition = {
+        k: float(v) for k, v in composition.items() if isinstance(v, (int, float))
+    }
+
+    formula_names = load_formula_names()
+    liquidus_formula = (
+        steel["liquidus_formula"] or formula_names["liquidus_formulas"][0]
+    )
+    solidus_formula = steel["solidus_formula"] or formula_names["solidus_formulas"][0]
+    summary = {
+        "composition": composition,
+        "liquidus_formula": liquidus_formula,
+        "solidus_formula": solidus_formula,
+        "liquid_temp": None,
+        "solid_temp": None,
+        "const_properties": (
+            calculate_const_properties(steel["kind"]) if steel["kind"] else None
+        ),
+    }
+    if composition:
+        summary["liquid_temp"] = float(
+            calculate_liquidus_temp(liquidus_formula, composition)
+        )
+        summary["solid_temp"] = float(
+            calculate_solidus_temp(solidus_formula, composition)
+        )
+    return summary
+
+
+def solver_params(config: Dict[str, Any]) -> Dict[str, Any]:
+    """把计算描述转换为solve_transient_heat_conduction的关键字参数"""
+    boundary = config["boundary"]
+    return {
+        **config["geometry"],
+        "h_top": boundary["h_top"],
+        "h_right": boundary["h_right"],
+        "T_inf_top": boundary["T_inf_top"],
+        "T_inf_right": boundary["T_inf_right"],
+        "q_top": boundary["q_top"],
+        "q_right": boundary["q_right"],
+        "boundary_time_segments": boundary["segments"],
+        **config["numerics"],
+    }
+
+
+def _write_atomic(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    _write_atomic(
+        path,
+        lambda f: f.write(json.dumps(data, ensure_ascii=False, indent=2).encode()),
+    )
+
+
+def run_config(
+    path: str, output_dir: str, log: bool = False, skip_existing: bool = False
+) -> Dict[str, Any]:
+    """运行一个计算描述
+
+    Args:
+        path: 计算描述文件
+        output_dir: 结果目录，写出<name>.npz、<name>.fields/和<name>.json
+        log: 是否把求解器的输出写入<name>.log(并行计算时使用)
+        skip_existing: 已有成功的结果时跳过
+
+    Returns:
+        本次计算的摘要: name、status("done"/"failed"/"skipped")、elapsed、error
+
+    说明:
+        - .npz中x、y为节点坐标，T为最终温度场
+        - <name>.fields/中为每frame_every步一帧的温度场和每probe_every步
+          一次的测点温度，用field_store.FieldStore按帧或区域读取
+        - 计算失败不会抛出异常，错误信息写入.json的error字段
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+    record: Dict[str, Any] = {"config_file": str(path), "started": started}
+    name = Path(path).stem
+    try:
+        config = load_config(path)
+        name = config["name"]
+        meta_path = output_dir / f"{name}.json"
+        if skip_existing and meta_path.exists():
+            previous = json.loads(meta_path.read_text(encoding="utf-8"))
+            if previous.get("status") == "done":
+                return {"name": name, "status": "skipped", "elapsed": 0.0}
+        record.update(config=config, steel=steel_summary(config["steel"]))
+        params = solver_params(config)
+        output, geometry = config["output"], config["geometry"]
+        fields = FieldStoreWriter(
+            output_dir / f"{name}.fields",
+            np.linspace(0, geometry["Lx"], geometry["nx"]),
+            np.linspace(0, geometry["Ly"], geometry["ny"]),
+            probes={
+                **quarter_section_probes(geometry["Lx"], geometry["Ly"]),
+                **output["probes"],
+            },
+            chunk_frames=output["chunk_frames"],
+            compression=output["compression"],
+            attrs={"name": name, "config": config},
+        )
+
+        def callback(n, n_steps, t, T):
+            frame = n % output["frame_every"] == 0 or n == n_steps - 1
+            fields.record(t, T, frame=frame)
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(fields)
+            if log:
+                log_file = stack.enter_context(
+                    open(output_dir / f"{name}.log", "w", encoding="utf-8")
+                )
+                stack.enter_context(contextlib.redirect_stdout(log_file))
+            X, Y, T, _, _ = solve_transient_heat_conduction(
+                **params,
+                callback=callback,
+                callback_interval=output["probe_every"],
+                keep_history=False,
+            )
+
+        _write_atomic(
+            output_dir / f"{name}.npz",
+            lambda f: np.savez_compressed(f, x=X[0, :], y=Y[:, 0], T=T),
+        )
+        record.update(status="done", n_frames=fields.meta["n_frames"])
+    except Exception as e:
+        record.update(
+            status="failed",
+            error=f"{type(e).__name__}: {e}",
+            traceback=traceback.format_exc(),
+        )
+    record["elapsed"] = time.time() - started
+    _write_json(output_dir / f"{name}.json", record)
+    return {
+        "name": name,
+        "status": record["status"],
+        "elapsed": record["elapsed"],
+        "error": record.get("error"),
+    }
+
+
+def find_configs(directory: str) -> List[str]:
+    """目录下的全部计算描述文件(按文件名排序)
+
+    被其他计算描述作为boundary.schedule引用的分段边界文件不算在内。
+    """
+    paths = sorted(
+        p
+        for p in Path(directory).iterdir()
+        if p.is_file() and p.suffix.lower() in CONFIG_SUFFIXES
+    )
+    schedules = set()
+    for p in paths:
+        try:
+            schedule = _read_raw(p).get("boundary", {}).get("schedule")
+        except (ValueError, AttributeError):
+            continue  # 格式错误的文件留给run_config报告
+        if schedule:
+            schedules.add((p.parent / schedule).resolve())
+    return [str(p) for p in paths if p.resolve() not in schedules]
+
+
+def run_directory(
+    directory: str,
+    output_dir: str,
+    jobs: Optional[int] = None,
+    skip_existing: bool = False,
+) -> List[Dict[str, Any]]:
+    """并行运行目录下的全部计算描述
+
+    Args:
+        directory: 计算描述所在目录
+        output_dir: 结果目录
+        jobs: 并行进程数，默认为CPU核数
+        skip_existing: 已有成功的结果时跳过
+
+    Returns:
+        各计算的摘要(按完成顺序)
+    """
+    paths = find_configs(directory)
+    summaries = []
+    # 求解器是纯Python循环，用进程而不是线程并行
+    with ProcessPoolExecutor(
+        max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(run_config, p, output_dir, True, skip_existing)
+            for p in paths
+        ]
+        for future in as_completed(futures):
+            summary = future.result()
+            _print_summary(summary)
+            summaries.append(summary)
+    return summaries
+
+
+def _print_summary(summary: Dict[str, Any]) -> None:
+    line = f"[{summary['status']}] {summary['name']}  {summary['elapsed']:.1f}s"
+    if summary.get("error"):
+        line += f"  {summary['error']}"
+    print(line, flush=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="连铸温度场计算(命令行/批处理)")
+    parser.add_argument("input", help="计算描述文件(.json/.toml)或包含这些文件的目录")
+    parser.add_argument(
+        "-o", "--output-dir", help="结果目录，默认为输入所在目录下的results"
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="目录模式的并行进程数")
+    parser.add_argument(
+        "--skip-existing", action="store_true", help="跳过已有成功结果的计算"
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="求解过程写入<name>.log，不在终端显示",
+    )
+    args = parser.parse_args(argv)
+
+    source = Path(args.input)
+    if source.is_dir():
+        output_dir = args.output_dir or str(source / "results")
+        summaries = run_directory(
+            str(source), output_dir, args.jobs, args.skip_existing
+        )
+    else:
+        output_dir = args.output_dir or str(source.parent / "results")
+        summaries = [
+            run_config(str(source), output_dir, args.quiet, args.skip_existing)
+        ]
+        _print_summary(summaries[0])
+
+    failed = sum(s["status"] == "failed" for s in summaries)
+    print(f"共 {len(summaries)} 个计算，失败 {failed} 个，结果位于 {output_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
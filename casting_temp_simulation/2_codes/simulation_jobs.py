@@ -0,0 +1,366 @@
+"""温度场计算的后台任务管理
+
+长时间的温度场求解如果直接在Streamlit脚本线程中运行，会阻塞页面，
+多人同时使用时还会互相抢占。这里把求解提交到有界的进程池中运行，
+每个任务有独立的ID和工作目录:
+
+    <root>/<job_id>/params.json    任务参数和钢种信息
+    <root>/<job_id>/progress.json  状态与进度(工作进程原子写入)
+    <root>/<job_id>/snapshot.npy   最近一次的温度场快照
+    <root>/<job_id>/fields/        每100步的温度场和测点曲线(见field_store.py)
+    <root>/<job_id>/result.npz     最终温度场
+    <root>/<job_id>/cancel         取消标记
+
+状态全部落在文件中，页面只需轮询读取；浏览器刷新后凭任务ID即可重新连接。
+已结束的任务保留retention_seconds秒后连同工作目录一起删除。
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from field_store import FieldStore, FieldStoreWriter, quarter_section_probes
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"  # 服务重启等原因导致任务丢失
+
+ACTIVE_STATES = (PENDING, RUNNING)
+
+DEFAULT_RETENTION_SECONDS = 24 * 3600
+# 清理过期任务的最小间隔(s)，避免每次轮询都扫描全部任务目录
+CLEANUP_INTERVAL = 60.0
+
+
+class JobCancelled(Exception):
+    """任务被用户取消"""
+
+
+class JobLimitError(RuntimeError):
+    """超出单个用户的并发任务数限制"""
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _save_npy_atomic(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(path.name + ".tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _run_job(
+    job_dir: str, params: Dict[str, Any], steel: Optional[Dict[str, Any]] = None
+) -> None:
+    """在工作进程中运行一次温度场求解"""
+    from core_calculation import solve_transient_heat_conduction
+
+    job_dir = Path(job_dir)
+    progress_path = job_dir / "progress.json"
+    cancel_path = job_dir / "cancel"
+    started = time.time()
+
+    def report(status: str, progress: float, sim_time: float, **extra) -> None:
+        _write_json_atomic(
+            progress_path,
+            {
+                "status": status,
+                "progress": progress,
+                "sim_time": sim_time,
+                "started": started,
+                "updated": time.time(),
+                **extra,
+            },
+        )
+
+    if cancel_path.exists():
+        report(CANCELLED, 0.0, 0.0)
+        return
+
+    # 温度场历史逐帧写入磁盘，不在内存中累积
+    fields = FieldStoreWriter(
+        job_dir / "fields",
+        np.linspace(0, params["Lx"], params["nx"]),
+        np.linspace(0, params["Ly"], params["ny"]),
+        probes=quarter_section_probes(params["Lx"], params["Ly"]),
+        attrs={"params": params, "steel": steel},
+    )
+
+    sim_time = [0.0]  # 达到稳态时提前结束，以最后一次回调的时刻为准
+
+    def callback(n, n_steps, t, T):
+        if cancel_path.exists():
+            raise JobCancelled()
+        sim_time[0] = t
+        fields.record(t, T)
+        _save_npy_atomic(job_dir / "snapshot.npy", T)
+        report(RUNNING, (n + 1) / n_steps, t)
+
+    report(RUNNING, 0.0, 0.0)
+    try:
+        with fields:
+            X, Y, T, _, _ = solve_transient_heat_conduction(
+                **params, callback=callback, keep_history=False
+            )
+    except JobCancelled:
+        report(CANCELLED, _read_json(progress_path)["progress"], 0.0)
+        return
+    except Exception as e:
+        report(FAILED, 0.0, 0.0, error=f"{type(e).__name__}: {e}")
+        return
+
+    tmp = job_dir / "result.tmp.npz"
+    np.savez_compressed(tmp, X=X, Y=Y, T=T)
+    os.replace(tmp, job_dir / "result.npz")
+    _save_npy_atomic(job_dir / "snapshot.npy", T)
+    report(DONE, 1.0, sim_time[0])
+
+
+class SimulationJobManager:
+    """温度场计算任务管理器
+
+    在Streamlit中应通过st.cache_resource创建单例，供所有会话共享。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_jobs_per_user: int = 1,
+        root: Optional[str] = None,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+    ):
+        """
+        Args:
+            max_workers: 进程池大小(同时运行的任务数上限)
+            max_jobs_per_user: 每个用户同时排队/运行的任务数上限
+            root: 任务工作目录，默认为系统临时目录下的casting_jobs
+            retention_seconds: 已结束的任务保留的时间(s)，超过后删除
+        """
+        self.max_workers = max_workers
+        self.max_jobs_per_user = max_jobs_per_user
+        self.retention_seconds = retention_seconds
+        self.root = Path(root or Path(tempfile.gettempdir()) / "casting_jobs")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._executor = self._new_executor()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._cleanup_lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # 使用spawn启动工作进程，避免fork带有线程的Streamlit服务进程
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.root / job_id
+
+    def submit(
+        self,
+        owner: str,
+        params: Dict[str, Any],
+        steel: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """提交一个求解任务
+
+        Args:
+            owner: 用户标识，用于并发数限制
+            params: solve_transient_heat_conduction的关键字参数(需可JSON序列化)
+            steel: 钢种信息(如液相线/固相线温度，需可JSON序列化)，随任务保存，
+                不传给求解器
+
+        Returns:
+            任务ID
+
+        Raises:
+            JobLimitError: 该用户的活动任务数已达上限
+        """
+        with self._lock:
+            active = [j for j in self.jobs_for(owner) if j["status"] in ACTIVE_STATES]
+            if len(active) >= self.max_jobs_per_user:
+                raise JobLimitError(
+                    f"用户 {owner} 已有 {len(active)} 个任务在运行，"
+                    f"上限为 {self.max_jobs_per_user}"
+                )
+
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = self._job_dir(job_id)
+            job_dir.mkdir()
+            _write_json_atomic(
+                job_dir / "params.json",
+                {
+                    "owner": owner,
+                    "submitted": time.time(),
+                    "params": params,
+                    "steel": steel,
+                },
+            )
+            _write_json_atomic(
+                job_dir / "progress.json",
+                {"status": PENDING, "progress": 0.0, "sim_time": 0.0},
+            )
+            try:
+                future = self._executor.submit(_run_job, str(job_dir), params, steel)
+            except BrokenProcessPool:
+                # 工作进程异常退出(如内存不足被杀)后进程池不再可用，换一个新的
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                future = self._executor.submit(_run_job, str(job_dir), params, steel)
+            self._futures[job_id] = future
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """读取任务状态，任务不存在时返回None"""
+        job_dir = self._job_dir(job_id)
+        meta = _read_json(job_dir / "params.json")
+        if meta is None:
+            return None
+        progress = _read_json(job_dir / "progress.json") or {
+            "status": PENDING,
+            "progress": 0.0,
+        }
+
+        future = self._futures.get(job_id)
+        if progress["status"] in ACTIVE_STATES:
+            if future is None:
+                # 任务不属于当前进程池(如服务已重启)，无法继续
+                progress["status"] = INTERRUPTED
+            elif future.done() and future.exception() is not None:
+                progress["status"] = FAILED
+                progress["error"] = str(future.exception())
+
+        return {"job_id": job_id, "owner": meta["owner"], **progress}
+
+    def params(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """任务参数，任务不存在时返回None"""
+        meta = _read_json(self._job_dir(job_id) / "params.json")
+        return None if meta is None else meta["params"]
+
+    def steel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """提交任务时给出的钢种信息，未给出或任务不存在时返回None"""
+        meta = _read_json(self._job_dir(job_id) / "params.json")
+        return None if meta is None else meta.get("steel")
+
+    def snapshot(self, job_id: str) -> Optional[np.ndarray]:
+        """最近一次的温度场快照"""
+        try:
+            return np.load(self._job_dir(job_id) / "snapshot.npy")
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+
+    def result(self, job_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """最终温度场(X, Y, T)，未完成时返回None"""
+        try:
+            with np.load(self._job_dir(job_id) / "result.npz") as data:
+                return {key: data[key] for key in data.files}
+        except FileNotFoundError:
+            return None
+
+    def fields(self, job_id: str) -> Optional[FieldStore]:
+        """温度场历史和测点曲线(计算过程中即可读取)，不存在时返回None"""
+        try:
+            return FieldStore(self._job_dir(job_id) / "fields")
+        except FileNotFoundError:
+            return None
+
+    def cancel(self, job_id: str) -> None:
+        """取消任务: 排队中的直接撤销，运行中的在下一次回调时停止"""
+        job_dir = self._job_dir(job_id)
+        if not job_dir.exists():
+            return
+        (job_dir / "cancel").touch()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            _write_json_atomic(
+                job_dir / "progress.json",
+                {"status": CANCELLED, "progress": 0.0, "sim_time": 0.0},
+            )
+
+    def cleanup(self, force: bool = False) -> int:
+        """删除结束超过retention_seconds的任务
+
+        Args:
+            force: 为False时距上次清理不足CLEANUP_INTERVAL秒则跳过
+
+        Returns:
+            删除的任务数
+        """
+        now = time.time()
+        if not force and now - self._last_cleanup < CLEANUP_INTERVAL:
+            return 0
+        # 多个会话同时轮询时只由一个执行清理
+        if not self._cleanup_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_cleanup = now
+            return self._remove_expired(now)
+        finally:
+            self._cleanup_lock.release()
+
+    def _remove_expired(self, now: float) -> int:
+        removed = 0
+        for job_dir in list(self.root.iterdir()):
+            status = self.status(job_dir.name)
+            if status is not None and status["status"] in ACTIVE_STATES:
+                continue
+            try:
+                # 进度文件在任务结束时最后一次写入；缺少参数文件的是残留目录
+                finished = (job_dir / "progress.json").stat().st_mtime
+            except OSError:
+                try:
+                    finished = job_dir.stat().st_mtime
+                except OSError:
+                    continue
+            if now - finished < self.retention_seconds:
+                continue
+            shutil.rmtree(job_dir, ignore_errors=True)
+            self._futures.pop(job_dir.name, None)
+            removed += 1
+        return removed
+
+    def jobs_for(self, owner: str) -> List[Dict[str, Any]]:
+        """某用户的全部任务(按提交时间倒序)"""
+        self.cleanup()
+        jobs = []
+        for job_dir in self.root.iterdir():
+            meta = _read_json(job_dir / "params.json")
+            if meta is None or meta["owner"] != owner:
+                continue
+            status = self.status(job_dir.name)
+            if status is None:  # 读取期间被删除
+                continue
+            status["submitted"] = meta["submitted"]
+            jobs.append(status)
+        return sorted(jobs, key=lambda j: j["submitted"], reverse=True)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,11 @@
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 
 
 @dataclass
@@ -22,6 +24,23 @@ class SteelProperty:
     l_f: float  # 潜热 (J/kg)
 
 
+# steel_properties.json中不属于钢种物性的键
+_NON_PROPERTY_KEYS = ("preset_elements", "all_components")
+
+
+def _parse_steel_properties(data: Mapping[str, Any]) -> Dict[str, SteelProperty]:
+    """将JSON数据中的钢种条目转换为SteelProperty，跳过预设成分等非物性条目"""
+    steel_props = {}
+    for steel_type, props in data.items():
+        if steel_type in _NON_PROPERTY_KEYS:
+            continue
+        try:
+            steel_props[steel_type] = SteelProperty(**props)
+        except TypeError as e:
+            raise ValueError(f"钢种 '{steel_type}' 属性不完整或类型错误: {str(e)}")
+    return steel_props
+
+
 def load_steel_properties(file_path: Optional[str] = None) -> Dict[str, SteelProperty]:
     """从JSON文件加载钢种物性参数
 
@@ -42,120 +61,240 @@ def load_steel_properties(file_path: Optional[str] = None) -> Dict[str, SteelPro
     with open(file_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # 数据验证和转换
-    steel_props = {}
-    for steel_type, props in data.items():
+    return _parse_steel_properties(data)
+
+
+# 内置默认物性参数，仅在steel_properties.json不存在时使用
+_DEFAULT_STEEL_PROPERTIES = {
+    "高合金钢": {
+        "lamda_s": 29.008,
+        "lamda_m": 35.470,
+        "lamda_l": 35.470,
+        "c_s": 658.811,
+        "c_m": 650,
+        "c_l": 691.667,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+    "低合金钢": {
+        "lamda_s": 31.333,
+        "lamda_m": 41.270,
+        "lamda_l": 41.270,
+        "c_s": 665.311,
+        "c_m": 700,
+        "c_l": 743.5,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+    "中合金钢": {
+        "lamda_s": 30.672,
+        "lamda_m": 39.955,
+        "lamda_l": 39.955,
+        "c_s": 661.975,
+        "c_m": 700,
+        "c_l": 740.556,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 274950,
+    },
+    "包晶合金钢": {
+        "lamda_s": 30.667,
+        "lamda_m": 39.075,
+        "lamda_l": 39.075,
+        "c_s": 664.083,
+        "c_m": 700,
+        "c_l": 753.571,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+    "高碳钢": {
+        "lamda_s": 29.008,
+        "lamda_m": 35.470,
+        "lamda_l": 35.470,
+        "c_s": 658.811,
+        "c_m": 650,
+        "c_l": 691.667,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+    "低碳钢": {
+        "lamda_s": 31.333,
+        "lamda_m": 41.270,
+        "lamda_l": 41.270,
+        "c_s": 665.311,
+        "c_m": 700,
+        "c_l": 743.5,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+    "中碳钢": {
+        "lamda_s": 30.672,
+        "lamda_m": 39.955,
+        "lamda_l": 39.955,
+        "c_s": 661.975,
+        "c_m": 700,
+        "c_l": 740.556,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 274950,
+    },
+    "包晶钢": {
+        "lamda_s": 31.041,
+        "lamda_m": 41.700,
+        "lamda_l": 41.700,
+        "c_s": 663.641,
+        "c_m": 700,
+        "c_l": 740,
+        "rho_s": 7600,
+        "rho_m": 7400,
+        "rho_l": 7200,
+        "l_f": 270000,
+    },
+}
+
+
+@dataclass(frozen=True)
+class SteelPropertyArrays:
+    """所有钢种物性参数的数组视图，便于按钢种索引做向量化查询"""
+
+    kinds: Tuple[str, ...]
+    index: Mapping[str, int]
+    values: Mapping[str, np.ndarray]  # 物性名 -> 按kinds顺序排列的数组
+
+    def indices(self, kinds: Sequence[str]) -> np.ndarray:
+        """将钢种名称序列转换为整数索引数组"""
         try:
-            steel_props[steel_type] = SteelProperty(**props)
-        except TypeError as e:
-            raise ValueError(f"钢种 '{steel_type}' 属性不完整或类型错误: {str(e)}")
+            return np.array([self.index[k] for k in kinds], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"无效的钢种类型: {e.args[0]}")
 
-    return steel_props
+    def lookup(self, name: str, kind_index) -> np.ndarray:
+        """按整数索引数组取出某一物性参数"""
+        return self.values[name][kind_index]
 
 
-# 加载钢种物性参数
-try:
-    steel_properties = load_steel_properties()
-except Exception as e:
-    # 如果加载失败，使用内置默认值
-    steel_properties = {
-        "高合金钢": {
-            "lamda_s": 29.008,
-            "lamda_m": 35.470,
-            "lamda_l": 35.470,
-            "c_s": 658.811,
-            "c_m": 650,
-            "c_l": 691.667,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-        "低合金钢": {
-            "lamda_s": 31.333,
-            "lamda_m": 41.270,
-            "lamda_l": 41.270,
-            "c_s": 665.311,
-            "c_m": 700,
-            "c_l": 743.5,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-        "中合金钢": {
-            "lamda_s": 30.672,
-            "lamda_m": 39.955,
-            "lamda_l": 39.955,
-            "c_s": 661.975,
-            "c_m": 700,
-            "c_l": 740.556,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 274950,
-        },
-        "包晶合金钢": {
-            "lamda_s": 30.667,
-            "lamda_m": 39.075,
-            "lamda_l": 39.075,
-            "c_s": 664.083,
-            "c_m": 700,
-            "c_l": 753.571,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-        "高碳钢": {
-            "lamda_s": 29.008,
-            "lamda_m": 35.470,
-            "lamda_l": 35.470,
-            "c_s": 658.811,
-            "c_m": 650,
-            "c_l": 691.667,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-        "低碳钢": {
-            "lamda_s": 31.333,
-            "lamda_m": 41.270,
-            "lamda_l": 41.270,
-            "c_s": 665.311,
-            "c_m": 700,
-            "c_l": 743.5,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-        "中碳钢": {
-            "lamda_s": 30.672,
-            "lamda_m": 39.955,
-            "lamda_l": 39.955,
-            "c_s": 661.975,
-            "c_m": 700,
-            "c_l": 740.556,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 274950,
-        },
-        "包晶钢": {
-            "lamda_s": 31.041,
-            "lamda_m": 41.700,
-            "lamda_l": 41.700,
-            "c_s": 663.641,
-            "c_m": 700,
-            "c_l": 740,
-            "rho_s": 7600,
-            "rho_m": 7400,
-            "rho_l": 7200,
-            "l_f": 270000,
-        },
-    }
+class SteelPropertyCatalog:
+    """钢种物性目录
+
+    首次访问时才解析steel_properties.json，并缓存解析后的SteelProperty；
+    之后每次访问只检查文件的修改时间，文件变化时才重新加载。
+    可在多个会话/线程间共享。
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        """
+        Args:
+            file_path: JSON文件路径，默认为同目录下的steel_properties.json
+        """
+        if file_path is None:
+            file_path = str(Path(__file__).parent / "steel_properties.json")
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._loaded = False
+        self._properties: Dict[str, SteelProperty] = {}
+        self._preset_elements: Dict[str, Dict[str, float]] = {}
+        self._all_components: List[str] = []
+        self._arrays: Optional[SteelPropertyArrays] = None
+
+    def _refresh(self) -> None:
+        """文件修改时间变化时重新加载"""
+        try:
+            mtime = os.stat(self.file_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._loaded and mtime == self._mtime:
+            return
+
+        with self._lock:
+            if self._loaded and mtime == self._mtime:
+                return
+            if mtime is None:
+                print(f"[WARNING] 未找到{self.file_path}，使用内置默认物性参数")
+                data = dict(_DEFAULT_STEEL_PROPERTIES)
+            else:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            self._properties = _parse_steel_properties(data)
+            self._preset_elements = data.get("preset_elements", {})
+            self._all_components = list(data.get("all_components", []))
+            self._arrays = None
+            self._mtime = mtime
+            self._loaded = True
+
+    @property
+    def properties(self) -> Mapping[str, SteelProperty]:
+        """钢种名称 -> SteelProperty"""
+        self._refresh()
+        return MappingProxyType(self._properties)
+
+    @property
+    def preset_elements(self) -> Mapping[str, Dict[str, float]]:
+        """预设钢号 -> 元素成分(%)"""
+        self._refresh()
+        return MappingProxyType(self._preset_elements)
+
+    @property
+    def all_components(self) -> List[str]:
+        """可选的全部元素名称"""
+        self._refresh()
+        return list(self._all_components)
+
+    def kinds(self) -> List[str]:
+        """全部钢种名称"""
+        return list(self.properties.keys())
+
+    def get(self, kind: str) -> SteelProperty:
+        """获取指定钢种的物性参数
+
+        Raises:
+            ValueError: 当钢种不存在时
+        """
+        props = self.properties
+        if kind not in props:
+            raise ValueError(f"无效的钢种类型: {kind}")
+        return props[kind]
+
+    def __contains__(self, kind: str) -> bool:
+        return kind in self.properties
+
+    def as_arrays(self) -> SteelPropertyArrays:
+        """所有钢种物性的数组视图(缓存，文件变化后重建)"""
+        self._refresh()
+        arrays = self._arrays
+        if arrays is None:
+            kinds = tuple(self._properties.keys())
+            values = {}
+            for field in fields(SteelProperty):
+                column = np.array(
+                    [getattr(self._properties[k], field.name) for k in kinds],
+                    dtype=float,
+                )
+                column.setflags(write=False)
+                values[field.name] = column
+            arrays = SteelPropertyArrays(
+                kinds=kinds,
+                index=MappingProxyType({k: i for i, k in enumerate(kinds)}),
+                values=MappingProxyType(values),
+            )
+            self._arrays = arrays
+        return arrays
+
+
+# 全局钢种物性目录(按需加载)
+steel_catalog = SteelPropertyCatalog()
 
 
 def calculate_liquidus_temp(formula_name: str, composition: dict) -> float:
@@ -544,33 +683,254 @@ def calculate_const_properties(kind: str) -> dict:
     Raises:
         ValueError: 当钢种不存在时
     """
-    if kind not in steel_properties:
-        raise ValueError(f"无效的钢种类型: {kind}")
-
-    props = steel_properties[kind]
-    if isinstance(props, SteelProperty):
-        return {
-            "lamda_s": props.lamda_s,
-            "lamda_m": props.lamda_m,
-            "lamda_l": props.lamda_l,
-            "c_s": props.c_s,
-            "c_m": props.c_m,
-            "c_l": props.c_l,
-            "rho_s": props.rho_s,
-            "rho_m": props.rho_m,
-            "rho_l": props.rho_l,
-            "l_f": props.l_f,
-        }
-    else:  # 处理字典格式
-        return {
-            "lamda_s": props["lamda_s"],
-            "lamda_m": props["lamda_m"],
-            "lamda_l": props["lamda_l"],
-            "c_s": props["c_s"],
-            "c_m": props["c_m"],
-            "c_l": props["c_l"],
-            "rho_s": props["rho_s"],
-            "rho_m": props["rho_m"],
-            "rho_l": props["rho_l"],
-            "l_f": props["l_f"],
-        }
+    return asdict(steel_catalog.get(kind))
+
+
+# ====================== 向量化液相线/固相线公式 ======================
+# 公式中用到的全部元素，缺失的元素按0处理
+FORMULA_ELEMENTS = (
+    "C",
+    "Si",
+    "Mn",
+    "P",
+    "S",
+    "Ni",
+    "Cr",
+    "Mo",
+    "Cu",
+    "V",
+    "W",
+    "N",
+    "Al",
+    "Co",
+    "Ti",
+    "O",
+    "Nb",
+    "Ta",
+    "As",
+    "Sn",
+    "Zr",
+)
+
+# 液相线公式的两组线性系数: T = 1536 - Σ(系数 * 元素含量)
+_LIQUIDUS_COEF_A = {
+    "C": 90,
+    "Si": 6,
+    "Mn": 1.7,
+    "P": 28,
+    "S": 40,
+    "Cu": 2.6,
+    "Ni": 2.9,
+    "Cr": 1.8,
+    "Al": 5.1,
+}
+_LIQUIDUS_COEF_B = {
+    "C": 78,
+    "Si": 7.6,
+    "Mn": 4.9,
+    "P": 34,
+    "S": 30,
+    "Cu": 5,
+    "Ni": 3.1,
+    "Cr": 1.3,
+    "Al": 3.6,
+}
+_LIQUIDUS_LINEAR = {
+    "1980_国外连铸新技术": _LIQUIDUS_COEF_A,
+    "1988_商家K": _LIQUIDUS_COEF_B,
+    "1989_日本广田连铸技术": _LIQUIDUS_COEF_A,
+    "1990_连续铸钢手册_通用": _LIQUIDUS_COEF_A,
+    "1990_连续铸钢手册_碳素钢": _LIQUIDUS_COEF_A,
+    "1990_连续铸钢手册_特殊钢": _LIQUIDUS_COEF_B,
+    "1994_连续铸钢原理与工艺": _LIQUIDUS_COEF_A,
+    "1997_宝钢技术_平居公式": _LIQUIDUS_COEF_A,
+    "2000_商家D_不锈钢1": _LIQUIDUS_COEF_B,
+    "2000_商家D_不锈钢2": _LIQUIDUS_COEF_B,
+    "2006_薄板坯连铸连轧": _LIQUIDUS_COEF_A,
+    "2013_炼钢_通用": _LIQUIDUS_COEF_A,
+    "1998_商家A_镀锡板": _LIQUIDUS_COEF_A,
+    "2000_商家B_不锈钢": _LIQUIDUS_COEF_B,
+    "2003_武钢_硅钢": _LIQUIDUS_COEF_A,
+    "2007_连铸900问": _LIQUIDUS_COEF_A,
+    "铸铁": _LIQUIDUS_COEF_A,
+}
+
+# 固相线线性公式: T = base - scale * Σ(系数 * 元素含量)
+_SOLIDUS_LINEAR = {
+    "2006_薄板坯连铸连轧": (
+        1537,
+        1.0,
+        {"C": 175, "Si": 20, "Mn": 30, "P": 280, "S": 575, "Al": 7.5, "O": 160},
+    ),
+    "2007_连铸900问": (
+        1534,
+        2.29,
+        {
+            "C": 80.5,
+            "Si": 17.8,
+            "Mn": 3.75,
+            "P": 33.5,
+            "S": 33.5,
+            "N": 3,
+            "Cr": 1.5,
+            "Cu": 3.4,
+            "Al": 3.4,
+        },
+    ),
+    "2011_连续铸钢生产技术": (
+        1471,
+        1.0,
+        {
+            "C": 25.2,
+            "Si": 12,
+            "Mn": 7.6,
+            "P": 34,
+            "S": 30,
+            "Cu": 5,
+            "Ni": 3.1,
+            "Cr": 1.3,
+            "Al": 3.6,
+            "Mo": 2,
+            "V": 2,
+            "Ti": 18,
+        },
+    ),
+    "2012_钢铁": (
+        1536,
+        1.0,
+        {
+            "C": 175,
+            "Si": 20,
+            "Mn": 30,
+            "P": 280,
+            "S": 575,
+            "Cr": 6.5,
+            "V": 4,
+            "Ni": 4.75,
+            "Al": 7.5,
+            "W": 2.5,
+            "Ti": 40,
+            "Mo": 5,
+            "Nb": 60,
+            "O": 160,
+        },
+    ),
+}
+
+
+def load_formula_names(file_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """读取液相线/固相线公式名称列表
+
+    Args:
+        file_path: JSON文件路径，默认为同目录下的formula_names.json
+
+    Returns:
+        包含"liquidus_formulas"和"solidus_formulas"两个列表的字典
+    """
+    if file_path is None:
+        file_path = str(Path(__file__).parent / "formula_names.json")
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _element_array(composition: Mapping[str, Any], key: str, shape) -> np.ndarray:
+    """取出某元素的含量数组，缺失时返回全0数组"""
+    if key in composition:
+        return np.asarray(composition[key], dtype=float)
+    return np.zeros(shape)
+
+
+def _composition_shape(composition: Mapping[str, Any]):
+    """推断成分数组的形状(所有元素列需可广播)"""
+    arrays = [np.asarray(composition[k]) for k in FORMULA_ELEMENTS if k in composition]
+    return np.broadcast_shapes(*(a.shape for a in arrays)) if arrays else ()
+
+
+def _weighted_sum(
+    composition: Mapping[str, Any], coefs: Mapping[str, float], shape
+) -> np.ndarray:
+    total = np.zeros(shape)
+    for elem, coef in coefs.items():
+        if elem in composition:
+            total = total + coef * np.asarray(composition[elem], dtype=float)
+    return total
+
+
+def calculate_liquidus_temp_array(
+    formula_name: str, composition: Mapping[str, Any]
+) -> np.ndarray:
+    """向量化计算液相线温度
+
+    与calculate_liquidus_temp使用相同的公式，但每个元素的含量可以是数组
+    (例如DataFrame的一列)，一次计算整批成分。
+
+    Args:
+        formula_name: 液相线公式名称
+        composition: 元素名 -> 含量(%)数组 的映射，缺失的元素按0处理
+
+    Returns:
+        液相线温度数组(℃)
+
+    Raises:
+        ValueError: 当公式名称未知时
+    """
+    shape = _composition_shape(composition)
+
+    if formula_name in _LIQUIDUS_LINEAR:
+        return 1536 - _weighted_sum(composition, _LIQUIDUS_LINEAR[formula_name], shape)
+
+    if formula_name == "商家D_碳钢分段":
+        C = _element_array(composition, "C", shape)
+        rest = _weighted_sum(composition, {"Si": 6, "Mn": 1.7, "P": 28, "S": 40}, shape)
+        c_coef = np.select([C <= 0.1, C <= 0.2], [90.0, 80.0], default=70.0)
+        return 1536 - (c_coef * C + rest)
+
+    raise ValueError(f"未知液相线公式: {formula_name}")
+
+
+def calculate_solidus_temp_array(
+    formula_name: str, composition: Mapping[str, Any]
+) -> np.ndarray:
+    """向量化计算固相线温度
+
+    与calculate_solidus_temp使用相同的公式，但每个元素的含量可以是数组。
+
+    Args:
+        formula_name: 固相线公式名称
+        composition: 元素名 -> 含量(%)数组 的映射，缺失的元素按0处理
+
+    Returns:
+        固相线温度数组(℃)
+
+    Raises:
+        ValueError: 当公式名称未知时
+    """
+    shape = _composition_shape(composition)
+
+    if formula_name in _SOLIDUS_LINEAR:
+        base, scale, coefs = _SOLIDUS_LINEAR[formula_name]
+        return base - scale * _weighted_sum(composition, coefs, shape)
+
+    if formula_name == "1997_宝钢技术_平居公式":
+        C = _element_array(composition, "C", shape)
+        rest = _weighted_sum(
+            composition,
+            {
+                "Si": 20.5,
+                "Mn": 6.5,
+                "Cr": 2.0,
+                "Ni": 11.5,
+                "Al": 5.5,
+                "P": 500,
+                "S": 700,
+            },
+            shape,
+        )
+        return np.select(
+            [C <= 0.09, C <= 0.17],
+            [1538 - (478 * C + rest), 1495 - rest],
+            default=1527 - (187.5 * C + rest),
+        )
+
+    raise ValueError(f"未知固相线公式: {formula_name}")
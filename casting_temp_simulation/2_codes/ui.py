@@ -1,17 +1,24 @@
 # 必须在最前面调用set_page_config
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
-import json
 import os
+import uuid
+from result_store import ResultStore
 from thermal_properties import (
     calculate_const_properties,
     calculate_liquidus_temp,
     calculate_solidus_temp,
+    load_formula_names,
+    steel_catalog,
 )
-from prop_vs_temp import (
-    cp_cal,
-    lamda_cal,
-    rho_cal,
+from prop_vs_temp import property_fields
+from composition_uncertainty import (
+    DEFAULT_QUANTILES,
+    DISTRIBUTIONS,
+    casting_temperature,
+    composition_uncertainty,
+    superheat_band,
 )
 
 # 绘制物性参数图表(使用plotly)
@@ -19,6 +26,300 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+
+def _rerun_fragment():
+    """片段重跑时只刷新当前片段；整页运行(如切换钢种)时刷新整页"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+@st.cache_resource
+def get_result_store():
+    """所有会话共享的结果存储(按会话ID区分)，设置CASTING_RESULT_DB时持久化到SQLite"""
+    return ResultStore(db_path=os.environ.get("CASTING_RESULT_DB"))
+
+
+@st.cache_data(show_spinner=False)
+def load_formula_lists():
+    """读取液相线和固相线计算公式列表(路径相对于本文件，不受工作目录影响)"""
+    formula_data = load_formula_names()
+    return formula_data["liquidus_formulas"], formula_data["solidus_formulas"]
+
+
+@st.cache_data(show_spinner=False)
+def compute_const_results(composition_items, kind, liquidus_formula, solidus_formula):
+    """计算物性参数和液相线/固相线温度
+
+    参数以可哈希的形式传入(成分为排序后的(元素, 含量)元组)，
+    相同的成分、钢种和公式组合直接返回缓存结果。
+    """
+    composition = dict(composition_items)
+    return {
+        "const_properties": calculate_const_properties(kind),
+        "liquid_temp": calculate_liquidus_temp(liquidus_formula, composition),
+        "solid_temp": calculate_solidus_temp(solidus_formula, composition),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def build_property_figure(props_items, Tl, Ts):
+    """绘制物性参数随温度和位置变化的图表，按物性参数和液/固相线温度缓存"""
+    props = dict(props_items)
+    Tc = Tl + 100  # 假设临界温度比液相线高100℃
+
+    # 创建温度范围(1600~1000℃)
+    temps = np.linspace(1600, 1300, 50)
+    # 创建距离范围(0-4m)
+    positions = np.linspace(0, 4, 50)
+
+    # 一次性计算整个温度-位置网格上的导热系数、比热容和密度
+    T_grid, P_grid = np.meshgrid(temps, positions)
+    lamdas, cp_grid, rho_grid = property_fields(T_grid, P_grid, Ts, Tl, Tc, props)
+    # 比热容和密度与位置无关，取一行即可
+    cps = cp_grid[0]
+    rhos = rho_grid[0]
+
+    # 创建2x2网格布局
+    fig = make_subplots(
+        rows=2,
+        cols=2,
+        specs=[
+            [{"type": "xy"}, {"type": "surface", "rowspan": 2}],
+            [{"type": "xy"}, None],
+        ],
+        subplot_titles=(
+            "密度随温度变化",
+            "导热系数随温度和距离变化",
+            "比热容随温度变化",
+        ),
+        vertical_spacing=0.1,
+        horizontal_spacing=0.05,
+    )
+
+    # 左上: 密度图
+    fig.add_trace(
+        go.Scatter(x=temps, y=rhos, name="密度 (kg/m³)", line=dict(color="blue")),
+        row=1,
+        col=1,
+    )
+    fig.update_xaxes(title_text="温度 (℃)", row=1, col=1, range=[1600, 1300])
+    fig.update_yaxes(title_text="密度 (kg/m³)", row=1, col=1)
+
+    # 左下: 比热容图
+    fig.add_trace(
+        go.Scatter(x=temps, y=cps, name="比热容 (J/kg·K)", line=dict(color="red")),
+        row=2,
+        col=1,
+    )
+    fig.update_xaxes(title_text="温度 (℃)", row=2, col=1, range=[1600, 1300])
+    fig.update_yaxes(title_text="比热容 (J/kg·K)", row=2, col=1)
+
+    # 右边: 导热系数3D图 (跨两行)
+    fig.add_trace(
+        go.Surface(
+            x=T_grid,
+            y=P_grid,
+            z=lamdas,
+            name="导热系数",
+            colorscale="Viridis",
+            showscale=False,
+            contours_z=dict(
+                show=True,
+                usecolormap=True,
+                highlightcolor="limegreen",
+                project_z=True,
+            ),
+        ),
+        row=1,
+        col=2,
+    )
+    # Plotly 支持的常见 colorscale 包括:
+
+    # 连续色标:
+    # Viridis (默认)
+    # Plasma
+    # Inferno
+    # Magma
+    # Cividis
+    # Hot
+    # Jet
+    # Greys
+    # YlGnBu
+    # Greens
+    # YlOrRd
+    # Bluered
+    # RdBu
+    # Picnic
+    # Rainbow
+    # Portland
+    # Electric
+    # Blackbody
+    # Earth
+    # Thermal
+    # 离散色标:
+    # Blues
+    # Reds
+    # Greens
+    # Purples
+    # Oranges
+    # BuPu
+    # PuBu
+    # PuRd
+    # RdPu
+    # BuGn
+    # GnBu
+    # PuBuGn
+    # YlGn
+    # YlOrBr
+    # 特殊色标:
+    # Turbo (类似 Jet 但更均匀)
+    # HSV (色相-饱和度-明度)
+    # Plotly3 (Plotly 默认色标)
+    # 在温度场模拟中，常用的 colorscale 包括:
+
+    # Hot/Thermal - 适合温度可视化
+    # Viridis/Plasma - 科学可视化标准
+    # Jet - 传统温度图
+    # RdBu - 红蓝对比适合温差显示
+    # 3D图视角和主题设置
+    scene_settings = {
+        "default": {
+            "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),  # 顺时针旋转90度
+            "bgcolor": "white",
+            "colorscale": "Viridis",
+        },
+        "dark": {
+            "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
+            "bgcolor": "rgb(20,20,20)",
+            "colorscale": "Plasma",
+        },
+        "blue": {
+            "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
+            "bgcolor": "rgb(240,248,255)",
+            "colorscale": "Blues",
+        },
+        "warm": {
+            "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
+            "bgcolor": "white",
+            "colorscale": "Plasma",
+        },
+    }
+
+    # 默认使用第一种主题
+    selected_theme = "warm"
+    fig.update_scenes(
+        xaxis_title="温度 (℃)",
+        yaxis_title="与弯月面距离 (m)",
+        zaxis_title="导热系数 (W/m·K)",
+        camera=scene_settings[selected_theme]["camera"],
+        bgcolor=scene_settings[selected_theme]["bgcolor"],
+        row=1,
+        col=2,
+    )
+
+    # 更新曲面颜色主题
+    fig.data[2].colorscale = scene_settings[selected_theme].get("colorscale", "Viridis")
+
+    # 调整整体布局
+    fig.update_layout(
+        # height=800,
+        showlegend=False,
+        margin=dict(l=50, r=50, b=50, t=50),
+    )
+
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_uncertainty(
+    composition_items,
+    liquidus_formula,
+    solidus_formula,
+    n_samples,
+    relative_tolerance,
+    distribution,
+):
+    """成分公差带内蒙特卡洛抽样得到的Tl/Ts分布(固定随机种子，结果可复现)"""
+    return composition_uncertainty(
+        dict(composition_items),
+        n_samples=n_samples,
+        relative_tolerance=relative_tolerance,
+        distribution=distribution,
+        liquidus_formula=liquidus_formula,
+        solidus_formula=solidus_formula,
+        seed=0,
+    )
+
+
+def uncertainty_panel(basic_data):
+    """成分波动下的液相线/固相线温度分布和过热度置信区间"""
+    cols = st.columns(3)
+    n_samples = cols[0].select_slider(
+        "抽样数", [10_000, 100_000, 200_000, 500_000, 1_000_000], value=200_000
+    )
+    relative_tolerance = (
+        cols[1].number_input(
+            "成分公差 ±%(相对名义含量)", min_value=0.0, value=5.0, step=1.0
+        )
+        / 100
+    )
+    distribution = cols[2].radio(
+        "分布",
+        DISTRIBUTIONS,
+        format_func={"uniform": "均匀分布", "normal": "截断正态(±3σ)"}.get,
+        horizontal=True,
+    )
+    result = compute_uncertainty(
+        tuple(sorted(basic_data["composition"].items())),
+        basic_data["liquidus_formula"],
+        basic_data["solidus_formula"],
+        n_samples,
+        relative_tolerance,
+        distribution,
+    )
+    low, mid, high = DEFAULT_QUANTILES
+
+    rows = [
+        {
+            "类型": label,
+            "公式": name,
+            "中位数 (℃)": s.quantiles[mid],
+            f"P{low * 100:g} (℃)": s.quantiles[low],
+            f"P{high * 100:g} (℃)": s.quantiles[high],
+            "标准差 (℃)": s.std,
+        }
+        for label, table in (("液相线", result.liquidus), ("固相线", result.solidus))
+        for name, s in table.items()
+    ]
+    fr = result.freezing_range
+    st.caption(
+        f"凝固区间 Tl-Ts：{fr.quantiles[mid]:.1f} ℃"
+        f"(90%区间 {fr.quantiles[low]:.1f} ~ {fr.quantiles[high]:.1f} ℃)"
+    )
+
+    cols = st.columns(2)
+    superheat = cols[0].number_input(
+        "目标过热度 (℃)", min_value=0.0, value=25.0, step=5.0
+    )
+    confidence = cols[1].slider("置信度", 0.5, 0.99, 0.95, step=0.01)
+    T_cast = casting_temperature(result, superheat, confidence)
+    band = superheat_band(result, T_cast)
+    st.metric(
+        "建议浇注温度",
+        f"{T_cast:.1f} °C",
+        help=f"以{confidence:.0%}的概率保证过热度不低于{superheat:g}℃",
+    )
+    st.caption(
+        f"该浇注温度下过热度的90%区间："
+        f"{band[low]:.1f} ~ {band[high]:.1f} ℃(中位数 {band[mid]:.1f} ℃)"
+    )
+    if result.skipped:
+        st.caption(f"无法解析、未参与计算的元素：{', '.join(result.skipped)}")
+    st.dataframe(pd.DataFrame(rows).round(2), hide_index=True, use_container_width=True)
+
+
 st.set_page_config(layout="wide")
 
 # """设置连铸区温度场模拟的UI界面"""
@@ -27,21 +328,15 @@ st.title("连铸区温度场模拟计算")
 # 初始化session state
 if "components" not in st.session_state:
     st.session_state.components = []
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 
 tab1, tab2, tab3 = st.tabs(["钢物性参数", "工艺及设备参数", "计算参数"])
 
 with tab1:
-    # 从json文件读取钢种物性参数和预设元素
-    json_path = os.path.join(os.path.dirname(__file__), "steel_properties.json")
-    with open(json_path, "r", encoding="utf-8") as f:
-        steel_data = json.load(f)
-        steel_properties = {
-            k: v
-            for k, v in steel_data.items()
-            if k not in ["preset_elements", "all_components"]
-        }
-        preset_elements = steel_data["preset_elements"]
-        all_components = steel_data["all_components"]
+    # 从钢种物性目录读取预设元素(文件未修改时不会重复解析)
+    preset_elements = steel_catalog.preset_elements
+    all_components = steel_catalog.all_components
     col1, col2 = st.columns([3, 7], gap="small", border=True)
 
     with col1:
@@ -128,130 +423,144 @@ with tab1:
                             st.session_state.components = []
                         st.session_state.components.append(new_component)
 
-        # 允许所有选项添加自定义成分
-        selected_components = st.session_state.get("components", [])
+        @st.fragment
+        def composition_editor():
+            """成分编辑器: 增删、修改成分时只重跑本片段"""
+            selected_components = st.session_state.components
 
-        # 更新可用组件列表
-        used_names = [comp["name"] for comp in selected_components]
-        available_components = [c for c in all_components if c not in used_names]
+            # 更新可用组件列表
+            used_names = [comp["name"] for comp in selected_components]
+            available_components = [c for c in all_components if c not in used_names]
 
-        tab1_col1, tab1_col2 = col1.columns([1, 1], gap="small")
-        # 成分管理逻辑
-        if (
-            tab1_col1.button("添加成分", use_container_width=True)
-            and available_components
-        ):
-            # 添加第一个可用元素
-            elem = next((e for e in all_components if e in available_components), None)
-            if elem:
-                selected_components.append({"name": elem, "percentage": 0.0})
-                st.session_state.components = selected_components
-                st.rerun()
-
-        # 显示和编辑现有成分
-        for i, comp in enumerate(selected_components):
-            with st.container(border=True):
-                cols = st.columns([1, 1, 1], gap="small", vertical_alignment="bottom")
-
-                # 成分名称选择
-                with cols[0]:
-                    current_name = comp["name"]
-                    if current_name not in available_components:
-                        available_components.insert(0, current_name)
-
-                    new_name = st.selectbox(
-                        f"成分名称 {i+1}",
-                        available_components,
-                        index=available_components.index(current_name),
-                        key=f"name_select_{i}",
-                    )
-                    if new_name != current_name:
-                        comp["name"] = new_name
-                        st.rerun()
-
-                # 百分比输入
-                with cols[1]:
-                    comp["percentage"] = st.number_input(
-                        f"百分比 {i+1} %",
-                        min_value=0.0,
-                        value=comp["percentage"],
-                        step=0.01,
-                        key=f"percent_input_{i}",
+            # 成分管理逻辑
+            if st.button("添加成分", use_container_width=True) and available_components:
+                # 添加第一个可用元素
+                elem = next(
+                    (e for e in all_components if e in available_components), None
+                )
+                if elem:
+                    # 新成分在下面的循环中直接显示，无需重跑
+                    selected_components.append({"name": elem, "percentage": 0.0})
+
+            # 显示和编辑现有成分
+            for i, comp in enumerate(selected_components):
+                with st.container(border=True):
+                    cols = st.columns(
+                        [1, 1, 1], gap="small", vertical_alignment="bottom"
                     )
-                    element_percentages[new_name] = comp["percentage"]
-
-                # 删除按钮
-                with cols[2]:
-                    if st.button(
-                        "🗑️ 删除成分",  # 使用图标代替文字
-                        key=f"delete_btn_{i}",
-                        help=f"删除成分 {comp['name']}",
-                        use_container_width=True,
-                    ):
-                        selected_components.pop(i)
-                        st.session_state.components = selected_components
-                        st.rerun()
-
-        # 根据钢种设置默认index
-        default_index = 5 if spec == "奥氏体不锈钢(不锈钢304/316)" else 0
-        kind = st.selectbox(
-            "钢的分类",
-            [
-                "低碳钢",
-                "中碳钢",
-                "高碳钢",
-                "低合金钢",
-                "中合金钢",
-                "高合金钢",
-                "包晶钢",
-                "包晶合金钢",
-            ],
-            index=default_index,
-            key="steel_kind_select",
-        )
-        # 从文件formula_names.json读取液相线和固相线计算公式列表
-        with open("formula_names.json", "r", encoding="utf-8") as f:
-            formula_data = json.load(f)
-            liquidus_formulas = formula_data["liquidus_formulas"]
-            solidus_formulas = formula_data["solidus_formulas"]
 
-        liquid_formula = st.selectbox("液相线的计算公式", liquidus_formulas)
-        solid_formula = st.selectbox("固相线的计算公式", solidus_formulas)
+                    # 成分名称选择
+                    with cols[0]:
+                        current_name = comp["name"]
+                        if current_name not in available_components:
+                            available_components.insert(0, current_name)
+
+                        new_name = st.selectbox(
+                            f"成分名称 {i+1}",
+                            available_components,
+                            index=available_components.index(current_name),
+                            key=f"name_select_{i}",
+                        )
+                        if new_name != current_name:
+                            comp["name"] = new_name
+                            _rerun_fragment()
+
+                    # 百分比输入
+                    with cols[1]:
+                        comp["percentage"] = st.number_input(
+                            f"百分比 {i+1} %",
+                            min_value=0.0,
+                            value=comp["percentage"],
+                            step=0.01,
+                            key=f"percent_input_{i}",
+                        )
+
+                    # 删除按钮
+                    with cols[2]:
+                        if st.button(
+                            "🗑️ 删除成分",  # 使用图标代替文字
+                            key=f"delete_btn_{i}",
+                            help=f"删除成分 {comp['name']}",
+                            use_container_width=True,
+                        ):
+                            selected_components.pop(i)
+                            _rerun_fragment()
+
+        @st.fragment
+        def formula_selector(spec):
+            """钢的分类和液相线/固相线公式选择，修改时只重跑本片段"""
+            # 根据钢种设置默认index
+            default_index = 5 if spec == "奥氏体不锈钢(不锈钢304/316)" else 0
+            st.selectbox(
+                "钢的分类",
+                [
+                    "低碳钢",
+                    "中碳钢",
+                    "高碳钢",
+                    "低合金钢",
+                    "中合金钢",
+                    "高合金钢",
+                    "包晶钢",
+                    "包晶合金钢",
+                ],
+                index=default_index,
+                key="steel_kind_select",
+            )
+            # 从文件formula_names.json读取液相线和固相线计算公式列表
+            liquidus_formulas, solidus_formulas = load_formula_lists()
+
+            st.selectbox(
+                "液相线的计算公式", liquidus_formulas, key="liquid_formula_select"
+            )
+            st.selectbox(
+                "固相线的计算公式", solidus_formulas, key="solid_formula_select"
+            )
+
+        composition_editor()
+        formula_selector(spec)
 
     with col2:
 
-        if (
-            tab1_col2.button("保存并更新成分", use_container_width=True)
-            and selected_components
-        ):
-            # 构建一个json字段，用来储存元素成分，钢的分类，选用的液相线公式和固相线公式，
-            basic_data = {
-                "composition": {
-                    comp["name"]: comp["percentage"] for comp in selected_components
-                },
-                "kind": kind,
-                "liquidus_formula": liquid_formula,
-                "solidus_formula": solid_formula,
-            }
+        @st.fragment
+        def results_panel():
+            """结果面板: 只在点击保存时重新计算，图表按输入缓存"""
+            result_store = get_result_store()
+            selected_components = st.session_state.components
+
+            if (
+                st.button("保存并更新成分", use_container_width=True)
+                and selected_components
+            ):
+                # 构建一个json字段，用来储存元素成分，钢的分类，选用的液相线公式和固相线公式，
+                basic_data = {
+                    "composition": {
+                        comp["name"]: comp["percentage"] for comp in selected_components
+                    },
+                    "kind": st.session_state.steel_kind_select,
+                    "liquidus_formula": st.session_state.liquid_formula_select,
+                    "solidus_formula": st.session_state.solid_formula_select,
+                }
+
+                # 相同输入已保存过(包括其他会话或服务重启前持久化的)时直接复用，
+                # 否则计算物性参数和液相线/固相线温度
+                saved = result_store.lookup(st.session_state.session_id, basic_data)
+                if saved is not None:
+                    const_results = saved["results"]
+                else:
+                    const_results = compute_const_results(
+                        tuple(sorted(basic_data["composition"].items())),
+                        basic_data["kind"],
+                        basic_data["liquidus_formula"],
+                        basic_data["solidus_formula"],
+                    )
 
-            # 将基础数据写入results/basic_data.json
-            os.makedirs("results", exist_ok=True)
-            with open("results/basic_data.json", "w", encoding="utf-8") as f:
-                json.dump(basic_data, f, ensure_ascii=False, indent=4)
-
-            # 调用compute_temperatures函数计算一些结果，并输出
-            const_results = {
-                "const_properties": calculate_const_properties(basic_data["kind"]),
-                "liquid_temp": calculate_liquidus_temp(
-                    basic_data["liquidus_formula"], basic_data["composition"]
-                ),
-                "solid_temp": calculate_solidus_temp(
-                    basic_data["solidus_formula"], basic_data["composition"]
-                ),
-            }
+                # 按会话保存基础数据和计算结果，后续计算步骤从结果存储中读取
+                result_store.put(st.session_state.session_id, basic_data, const_results)
 
-            with open("results/const_results.json", "w", encoding="utf-8") as f:
-                json.dump(const_results, f, ensure_ascii=False, indent=4)
+            saved = result_store.latest(st.session_state.session_id)
+            if saved is None:
+                return
+            const_results = saved["results"]
 
             # 显示温度结果
             st.write("### 温度计算结果")
@@ -261,6 +570,9 @@ with tab1:
             with cols[1]:
                 st.metric("固相线温度", f"{const_results['solid_temp']:.2f} °C")
 
+            with st.expander("成分波动下的温度分布与过热度置信区间"):
+                uncertainty_panel(saved["inputs"])
+
             # 显示物性参数表格
             st.write("### 物性参数")
             const_props = const_results["const_properties"]
@@ -302,182 +614,15 @@ with tab1:
             prop_df = pd.DataFrame(prop_data)
             st.dataframe(prop_df, hide_index=True, use_container_width=True)
 
-            # 获取物性参数
-            props = const_results["const_properties"]
-            Tl = const_results["liquid_temp"]
-            Ts = const_results["solid_temp"]
-            Tc = Tl + 100  # 假设临界温度比液相线高100℃
-
-            # 创建温度范围(1600~1000℃)
-            temps = np.linspace(1600, 1300, 50)
-            # 创建距离范围(0-4m)
-            positions = np.linspace(0, 4, 50)
-
-            # 计算比热容和密度
-            cps = [cp_cal(T, Ts, Tl, props) for T in temps]
-            rhos = [rho_cal(T, Ts, Tl, props) for T in temps]
-
-            # 计算导热系数(3D)
-            T_grid, P_grid = np.meshgrid(temps, positions)
-            lamdas = np.array(
-                [[lamda_cal(T, p, Ts, Tl, Tc, props) for T in temps] for p in positions]
+            fig = build_property_figure(
+                tuple(const_props.items()),
+                const_results["liquid_temp"],
+                const_results["solid_temp"],
             )
 
-            # 创建2x2网格布局
-            fig = make_subplots(
-                rows=2,
-                cols=2,
-                specs=[
-                    [{"type": "xy"}, {"type": "surface", "rowspan": 2}],
-                    [{"type": "xy"}, None],
-                ],
-                subplot_titles=(
-                    "密度随温度变化",
-                    "导热系数随温度和距离变化",
-                    "比热容随温度变化",
-                ),
-                vertical_spacing=0.1,
-                horizontal_spacing=0.05,
-            )
-
-            # 左上: 密度图
-            fig.add_trace(
-                go.Scatter(
-                    x=temps, y=rhos, name="密度 (kg/m³)", line=dict(color="blue")
-                ),
-                row=1,
-                col=1,
-            )
-            fig.update_xaxes(title_text="温度 (℃)", row=1, col=1, range=[1600, 1300])
-            fig.update_yaxes(title_text="密度 (kg/m³)", row=1, col=1)
-
-            # 左下: 比热容图
-            fig.add_trace(
-                go.Scatter(
-                    x=temps, y=cps, name="比热容 (J/kg·K)", line=dict(color="red")
-                ),
-                row=2,
-                col=1,
-            )
-            fig.update_xaxes(title_text="温度 (℃)", row=2, col=1, range=[1600, 1300])
-            fig.update_yaxes(title_text="比热容 (J/kg·K)", row=2, col=1)
-
-            # 右边: 导热系数3D图 (跨两行)
-            fig.add_trace(
-                go.Surface(
-                    x=T_grid,
-                    y=P_grid,
-                    z=lamdas,
-                    name="导热系数",
-                    colorscale="Viridis",
-                    showscale=False,
-                    contours_z=dict(
-                        show=True,
-                        usecolormap=True,
-                        highlightcolor="limegreen",
-                        project_z=True,
-                    ),
-                ),
-                row=1,
-                col=2,
-            )
-            # Plotly 支持的常见 colorscale 包括:
-
-            # 连续色标:
-            # Viridis (默认)
-            # Plasma
-            # Inferno
-            # Magma
-            # Cividis
-            # Hot
-            # Jet
-            # Greys
-            # YlGnBu
-            # Greens
-            # YlOrRd
-            # Bluered
-            # RdBu
-            # Picnic
-            # Rainbow
-            # Portland
-            # Electric
-            # Blackbody
-            # Earth
-            # Thermal
-            # 离散色标:
-            # Blues
-            # Reds
-            # Greens
-            # Purples
-            # Oranges
-            # BuPu
-            # PuBu
-            # PuRd
-            # RdPu
-            # BuGn
-            # GnBu
-            # PuBuGn
-            # YlGn
-            # YlOrBr
-            # 特殊色标:
-            # Turbo (类似 Jet 但更均匀)
-            # HSV (色相-饱和度-明度)
-            # Plotly3 (Plotly 默认色标)
-            # 在温度场模拟中，常用的 colorscale 包括:
-
-            # Hot/Thermal - 适合温度可视化
-            # Viridis/Plasma - 科学可视化标准
-            # Jet - 传统温度图
-            # RdBu - 红蓝对比适合温差显示
-            # 3D图视角和主题设置
-            scene_settings = {
-                "default": {
-                    "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),  # 顺时针旋转90度
-                    "bgcolor": "white",
-                    "colorscale": "Viridis",
-                },
-                "dark": {
-                    "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
-                    "bgcolor": "rgb(20,20,20)",
-                    "colorscale": "Plasma",
-                },
-                "blue": {
-                    "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
-                    "bgcolor": "rgb(240,248,255)",
-                    "colorscale": "Blues",
-                },
-                "warm": {
-                    "camera": dict(eye=dict(x=-0.9, y=0.9, z=0.6)),
-                    "bgcolor": "white",
-                    "colorscale": "Plasma",
-                },
-            }
-
-            # 默认使用第一种主题
-            selected_theme = "warm"
-            fig.update_scenes(
-                xaxis_title="温度 (℃)",
-                yaxis_title="与弯月面距离 (m)",
-                zaxis_title="导热系数 (W/m·K)",
-                camera=scene_settings[selected_theme]["camera"],
-                bgcolor=scene_settings[selected_theme]["bgcolor"],
-                row=1,
-                col=2,
-            )
-
-            # 更新曲面颜色主题
-            fig.data[2].colorscale = scene_settings[selected_theme].get(
-                "colorscale", "Viridis"
-            )
-
-            # 调整整体布局
-            fig.update_layout(
-                # height=800,
-                showlegend=False,
-                margin=dict(l=50, r=50, b=50, t=50),
-            )
+            st.plotly_chart(fig, use_container_width=True)
 
-            col2.plotly_chart(fig, use_container_width=True)
+        results_panel()
 
 # # 工艺及设备参数 (tab2)
 # with tab2:
@@ -0,0 +1,313 @@
+"""
+连铸结晶器坯壳厚度计算
+
+钢液对坯壳的对流换热系数沿结晶器高度变化，坯壳厚度由结晶器冷却水带走的
+热量与钢液过热传给坯壳的热量之差按凝固潜热换算。所有公式都对整个z数组
+一次计算，沿程平均换热系数用累积和代替逐点求平均。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg.lapack import dgtsv
+
+# 计算起点(距弯月面, m)和步长(m)
+Z_START = 0.05
+DZ = 0.01
+
+
+@dataclass(frozen=True)
+class MoldParameters:
+    """
+    结晶器坯壳计算参数(单位与页面输入一致)
+
+    属性:
+        rho: 钢密度(kg/m³)
+        c: 钢比热容(kJ/kg·K)
+        mu: 钢液粘度(kg/m·s)
+        steel_lambda: 钢导热系数(W/m·K)
+        L: 凝固潜热(kJ/kg)
+        superheat: 钢液过热度(℃)
+        lvelocity: 钢液对坯壳的冲击速度(m/s)
+        area: 与冷却水的换热面积(m²)
+        length: 结晶器出口距弯月面的距离(m)
+        ck: 结晶器冷却强度(L/(min·mm))
+        width: 铸坯宽度(mm)
+        thickness: 铸坯厚度(mm)
+        velocity: 拉坯速度(m/s)
+        water_delta_T: 冷却水进出口温差(℃)
+        cw: 水比热容(kJ/kg·K)
+        rhow: 水密度(kg/m³)
+    """
+
+    rho: float = 7850.0
+    c: float = 0.77
+    mu: float = 0.455
+    steel_lambda: float = 24.0
+    L: float = 210.0
+    superheat: float = 30.0
+    lvelocity: float = 0.6
+    area: float = 2.64
+    length: float = 0.7
+    ck: float = 2.0
+    width: float = 1400.0
+    thickness: float = 250.0
+    velocity: float = 1.4 / 60
+    water_delta_T: float = 8.0
+    cw: float = 4.18
+    rhow: float = 1000.0
+
+    @property
+    def water_flow(self):
+        """冷却水流量(m³/s)"""
+        return 2 * (self.width + self.thickness) * self.ck / 60 / 1000
+
+    @property
+    def water_heat_flux(self):
+        """冷却水带走的平均热流密度(kW/m²)"""
+        return self.cw * self.water_flow * self.rhow / self.area * self.water_delta_T
+
+
+def z_grid(length):
+    """计算位置(距弯月面, m)"""
+    return np.arange(Z_START, length + DZ, DZ)
+
+
+def heat_transfer_coefficient(z, p):
+    """
+    钢液对坯壳的对流换热系数
+
+    参数:
+        z (np.ndarray): 距弯月面的距离(m)
+        p (MoldParameters): 计算参数
+
+    返回:
+        np.ndarray: 换热系数
+    """
+    return (
+        2
+        / 3
+        * p.rho
+        * p.c
+        * p.lvelocity
+        * (p.c * p.mu / p.steel_lambda) ** (-2 / 3)
+        * (z * p.lvelocity * p.rho / p.mu) ** (-1 / 2)
+    ) * 10
+
+
+def _shell_thickness(z, h_mean, velocity, superheat, p):
+    """坯壳厚度(mm)，各参数可广播"""
+    ez = (
+        z
+        / p.rho
+        / p.L
+        / velocity
+        * (p.water_heat_flux - 2 * h_mean / 1000 * superheat**0.5)
+    )
+    return ez / 2 * 1000
+
+
+def shell_profile(p):
+    """
+    沿结晶器高度的坯壳厚度分布
+
+    参数:
+        p (MoldParameters): 计算参数
+
+    返回:
+        tuple: (location, shell)
+            - location: 距弯月面的距离(cm)，首点为弯月面
+            - shell: 坯壳厚度(mm)，保留两位小数
+    """
+    z = z_grid(p.length)
+    h = heat_transfer_coefficient(z, p)
+    # 从计算起点到z处的平均换热系数
+    h_mean = np.cumsum(h) / np.arange(1, len(h) + 1)
+    shell = np.round(_shell_thickness(z, h_mean, p.velocity, p.superheat, p), 2)
+    return np.concatenate(([0.0], z * 100)), np.concatenate(([0.0], shell))
+
+
+def sqrt_law_thickness(z, velocity, k=20.0):
+    """
+    凝固平方根定律的坯壳厚度
+
+    参数:
+        z: 距弯月面的距离(m)
+        velocity: 拉坯速度(m/s)
+        k: 凝固系数(mm/min^0.5)，默认为上海宝钢凝固系数
+
+    返回:
+        坯壳厚度(mm)
+    """
+    return k * (z / velocity / 60) ** 0.5
+
+
+def exit_shell_sweep(p, velocities, superheats):
+    """
+    结晶器出口坯壳厚度随拉速和过热度的变化
+
+    参数:
+        p (MoldParameters): 计算参数(velocity、superheat不使用)
+        velocities (np.ndarray): 拉坯速度(m/s)
+        superheats (np.ndarray): 钢液过热度(℃)
+
+    返回:
+        np.ndarray: 出口坯壳厚度(mm)，形状(len(velocities), len(superheats))
+
+    说明:
+        - 换热系数与拉速、过热度无关，出口处的平均换热系数只需计算一次，
+          整个网格由一次广播得到
+    """
+    z = z_grid(p.length)
+    h_mean = heat_transfer_coefficient(z, p).mean()
+    return _shell_thickness(
+        z[-1],
+        h_mean,
+        np.asarray(velocities, dtype=float)[:, None],
+        np.asarray(superheats, dtype=float)[None, :],
+        p,
+    )
+
+
+def _enthalpy_temperature(H, rho_c, H_s, H_l, T_solidus, T_liquidus):
+    """由焓(J/m³)求温度及dT/dH，凝固区间内固相率随温度线性变化"""
+    mushy_slope = (T_liquidus - T_solidus) / (H_l - H_s)
+    T = np.where(
+        H <= H_s,
+        H / rho_c,
+        np.where(
+            H >= H_l,
+            T_liquidus + (H - H_l) / rho_c,
+            T_solidus + (H - H_s) * mushy_slope,
+        ),
+    )
+    dT = np.where((H > H_s) & (H < H_l), mushy_slope, 1 / rho_c)
+    return T, dT
+
+
+def stefan_shell_sweep(
+    p,
+    velocities,
+    superheats,
+    T_liquidus=1520.0,
+    T_solidus=1480.0,
+    dx=0.001,
+    n_steps=200,
+    solid_fraction=1.0,
+    tol=1e-3,
+    max_iter=30,
+):
+    """
+    一维非稳态凝固(Stefan问题)的坯壳厚度，同时计算多个拉速和过热度
+
+    参数:
+        p (MoldParameters): 计算参数(velocity、superheat不使用)
+        velocities (np.ndarray): 拉坯速度(m/s)
+        superheats (np.ndarray): 钢液过热度(℃)
+        T_liquidus (float): 液相线温度(℃)
+        T_solidus (float): 固相线温度(℃)
+        dx (float): 沿厚度方向的空间步长(m)
+        n_steps (int): 从弯月面到结晶器出口的时间步数
+        solid_fraction (float): 坯壳凝固前沿对应的固相率，1为固相线
+        tol (float): 牛顿迭代的温度收敛容差(℃)
+        max_iter (int): 每个时间步的最大迭代次数
+
+    返回:
+        tuple: (z, shell)
+            - z: 距弯月面的距离(m)，形状(n_steps + 1,)
+            - shell: 坯壳厚度(mm)，形状(len(velocities), len(superheats), n_steps + 1)
+
+    说明:
+        - 每个拉速、过热度对应一个随铸坯下行的厚度方向切片(t = z/v)，
+          从铸坯表面到厚度中心，初始为液相线温度加过热度
+        - 表面热流取冷却水带走的平均热流密度，中心为绝热对称面；
+          未考虑液芯对流，过热度只以显热的形式进入计算
+        - 全隐式焓法: 以节点焓为未知量，T(H)分段线性，每步用牛顿迭代求解；
+          所有切片的三对角雅可比矩阵拼成一个块对角带状矩阵，用LAPACK的dgtsv一次求解
+        - 各拉速的时间步长取出口时间/n_steps，所有切片的输出位于同一z网格
+    """
+    velocities = np.asarray(velocities, dtype=float)
+    superheats = np.asarray(superheats, dtype=float)
+    n_v, n_s = len(velocities), len(superheats)
+    B = n_v * n_s
+
+    half = p.thickness / 2000
+    n = int(round(half / dx)) + 1
+    x = np.linspace(0, half, n)
+    dx = x[1] - x[0]
+    volume = np.full(n, dx)
+    volume[[0, -1]] *= 0.5
+    G = p.steel_lambda / dx
+
+    rho_c = p.rho * p.c * 1000
+    H_s = rho_c * T_solidus
+    H_l = rho_c * T_liquidus + p.rho * p.L * 1000
+    q_surface = p.water_heat_flux * 1000
+    T_front = T_liquidus - solid_fraction * (T_liquidus - T_solidus)
+
+    z = np.linspace(0, p.length, n_steps + 1)
+    dt = np.repeat(p.length / n_steps / velocities, n_s)[:, None]
+    capacity = volume / dt  # (B, n)
+
+    T0 = np.tile(T_liquidus + superheats, n_v)[:, None]
+    H = np.broadcast_to(H_l + rho_c * (T0 - T_liquidus), (B, n)).copy()
+    shell = np.zeros((B, n_steps + 1))
+
+    def front_position(T):
+        # 凝固前沿: 温度首次超过T_front处线性插值
+        j = np.minimum((T <= T_front).sum(axis=1), n - 1)
+        rows = np.arange(B)
+        T_a, T_b = T[rows, np.maximum(j - 1, 0)], T[rows, j]
+        frac = np.clip((T_front - T_a) / np.where(T_b > T_a, T_b - T_a, 1.0), 0, 1)
+        pos = x[np.maximum(j - 1, 0)] + frac * dx
+        pos[j == 0] = 0.0
+        pos[(T <= T_front).all(axis=1)] = half
+        return pos * 1000
+
+    # 块之间的耦合项恒为0
+    upper = np.zeros((B, n))
+    lower = np.zeros((B, n))
+    for k in range(1, n_steps + 1):
+        H_old = H.copy()
+        for _ in range(max_iter):
+            T, dT = _enthalpy_temperature(H, rho_c, H_s, H_l, T_solidus, T_liquidus)
+            flux = G * (T[:, :-1] - T[:, 1:])  # 第e条边上由e流向e+1的热流
+            res = capacity * (H - H_old)
+            res[:, :-1] += flux
+            res[:, 1:] -= flux
+            res[:, 0] += q_surface
+
+            # 块对角三对角雅可比矩阵 J = C/dt + K·diag(dT/dH)
+            diag = capacity.copy()
+            diag[:, :-1] += G * dT[:, :-1]
+            diag[:, 1:] += G * dT[:, 1:]
+            upper[:, :-1] = -G * dT[:, 1:]  # J[i, i+1]
+            lower[:, :-1] = -G * dT[:, :-1]  # J[i+1, i]
+            *_, dH, info = dgtsv(
+                lower.ravel()[:-1], diag.ravel(), upper.ravel()[:-1], -res.ravel()
+            )
+            if info != 0:
+                raise ValueError("三对角方程组求解失败")
+            dH = dH.reshape(B, n)
+            H += dH
+            if np.max(np.abs(dH * dT)) < tol:
+                break
+        T, _ = _enthalpy_temperature(H, rho_c, H_s, H_l, T_solidus, T_liquidus)
+        shell[:, k] = front_position(T)
+
+    return z, shell.reshape(n_v, n_s, n_steps + 1)
+
+
+def stefan_shell_profile(p, **kwargs):
+    """
+    当前拉速和过热度下的数值坯壳厚度分布
+
+    参数:
+        p (MoldParameters): 计算参数
+        **kwargs: 传给stefan_shell_sweep的其他参数
+
+    返回:
+        tuple: (location, shell)，距弯月面的距离(cm)和坯壳厚度(mm)
+    """
+    z, shell = stefan_shell_sweep(p, [p.velocity], [p.superheat], **kwargs)
+    return z * 100, shell[0, 0]
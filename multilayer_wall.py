@@ -0,0 +1,738 @@
+"""
+多层平壁稳态导热计算
+
+材料表和一维稳态导热求解器，供多层平壁导热计算页面使用。
+求解器的残差全部向量化，雅可比矩阵为解析的三对角矩阵，
+用牛顿迭代配合带状矩阵求解，细网格(dx=0.1mm)也可在毫秒级完成。
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+from scipy.linalg import solve_banded
+from scipy.optimize import brentq
+
+# 材料数据文件。热导率为温度的多项式 λ(T) = c0·T^n + ... + cn (W/m·K)，
+# 系数按np.polyval的顺序(高次在前)存放在lambda_coefs中；T_max为最高使用温度(℃)，
+# density为体积密度(kg/m³)，未知时为null；heat_capacity为比热容(J/kg·K)，
+# 未给出时取耐火材料的典型值1000(仅非稳态计算使用)。
+# 各厂可在同目录下的 refractory_materials.local.json 或环境变量
+# REFRACTORY_MATERIALS 指定的文件(多个用os.pathsep分隔)中添加材料，
+# 与内置材料同名时覆盖内置数据，无需修改代码。
+DEFAULT_MATERIAL_FILE = Path(__file__).with_name("refractory_materials.json")
+LOCAL_MATERIAL_FILE = Path(__file__).with_name("refractory_materials.local.json")
+_REQUIRED_KEYS = ("name", "lambda_coefs")
+DEFAULT_HEAT_CAPACITY = 1000.0
+
+
+@dataclass(frozen=True)
+class MaterialTable:
+    """
+    以数组存储的材料表
+
+    属性:
+        names: 材料名称
+        icons: 显示用图标
+        coefs: 热导率多项式系数矩阵，形状(n_materials, degree+1)，高次在前，
+            低次多项式在高次侧补零
+        T_max: 最高使用温度(℃)，无限制时为nan
+        density: 体积密度(kg/m³)，未知时为nan
+        heat_capacity: 比热容(J/kg·K)
+        default_factor: 默认修正系数
+    """
+
+    names: Tuple[str, ...]
+    icons: Tuple[str, ...]
+    coefs: np.ndarray
+    T_max: np.ndarray
+    density: np.ndarray
+    heat_capacity: np.ndarray
+    default_factor: np.ndarray
+    _index: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_index", {name: i for i, name in enumerate(self.names)}
+        )
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, names):
+        """
+        材料名称转换为整数索引
+
+        参数:
+            names (str 或 list): 材料名称
+
+        返回:
+            int 或 np.ndarray: 材料索引
+        """
+        try:
+            if isinstance(names, str):
+                return self._index[names]
+            return np.array([self._index[name] for name in names], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"未知的材料: {e.args[0]}") from None
+
+    def label(self, name):
+        """带图标的显示名称"""
+        icon = self.icons[self.index(name)]
+        return f"{icon} {name}" if icon else name
+
+    def conductivity(self, mat_idx, T):
+        """
+        按材料索引批量计算热导率(Horner法，一次遍历所有节点)
+
+        参数:
+            mat_idx (np.ndarray): 各节点的材料索引
+            T (np.ndarray): 各节点温度(℃)
+
+        返回:
+            np.ndarray: 热导率(W/m·K)
+        """
+        c = self.coefs[mat_idx]
+        k = c[..., 0].copy()
+        for j in range(1, c.shape[-1]):
+            k = k * T + c[..., j]
+        return k
+
+    def conductivity_derivative(self, mat_idx, T):
+        """热导率对温度的导数 dλ/dT (W/m·K²)"""
+        degree = self.coefs.shape[1] - 1
+        c = self.coefs[mat_idx][..., :-1] * np.arange(degree, 0, -1)
+        if c.shape[-1] == 0:
+            return np.zeros(np.shape(T))
+        d = c[..., 0].copy()
+        for j in range(1, c.shape[-1]):
+            d = d * T + c[..., j]
+        return d * np.ones(np.shape(T))
+
+    def linear_coefficients(self, name):
+        """
+        λ = a + bT 形式的系数
+
+        返回:
+            tuple 或 None: 线性(含常数)时返回(a, b)，高次项非零时返回None
+        """
+        c = self.coefs[self.index(name)]
+        if np.any(c[:-2] != 0):
+            return None
+        return c[-1], (c[-2] if len(c) > 1 else 0.0)
+
+
+def _read_material_records(path):
+    """读取一个材料数据文件中的材料记录"""
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)["materials"]
+    for record in records:
+        missing = [key for key in _REQUIRED_KEYS if key not in record]
+        if missing:
+            raise ValueError(f"{path} 中的材料 {record} 缺少字段: {missing}")
+    return records
+
+
+def load_material_table(paths=None):
+    """
+    从数据文件加载材料表
+
+    参数:
+        paths (list): 材料数据文件列表，默认为内置数据文件、
+            refractory_materials.local.json 以及环境变量
+            REFRACTORY_MATERIALS 中的文件(存在时)
+
+    返回:
+        MaterialTable: 材料表，后加载的文件中同名材料覆盖先前的数据
+    """
+    if paths is None:
+        paths = [DEFAULT_MATERIAL_FILE]
+        if LOCAL_MATERIAL_FILE.exists():
+            paths.append(LOCAL_MATERIAL_FILE)
+        paths += [
+            p for p in os.environ.get("REFRACTORY_MATERIALS", "").split(os.pathsep) if p
+        ]
+
+    materials = {}
+    for path in paths:
+        for record in _read_material_records(path):
+            materials[record["name"]] = record
+
+    records = list(materials.values())
+    degree = max(len(r["lambda_coefs"]) for r in records) - 1
+    coefs = np.zeros((len(records), degree + 1))
+    for i, record in enumerate(records):
+        c = record["lambda_coefs"]
+        coefs[i, degree + 1 - len(c) :] = c
+
+    def column(key, default):
+        values = [record.get(key) for record in records]
+        return np.array([default if v is None else v for v in values], dtype=float)
+
+    return MaterialTable(
+        names=tuple(r["name"] for r in records),
+        icons=tuple(r.get("icon", "") for r in records),
+        coefs=coefs,
+        T_max=column("T_max", np.nan),
+        density=column("density", np.nan),
+        heat_capacity=column("heat_capacity", DEFAULT_HEAT_CAPACITY),
+        default_factor=column("default_factor", 1.0),
+    )
+
+
+MATERIALS = load_material_table()
+
+
+def get_convection_coefficient(T):
+    """
+    根据温度计算对流换热系数
+
+    参数:
+        T (float): 壁面温度(℃)
+
+    返回:
+        float: 对流换热系数(W/m²·K)
+
+    说明:
+        - 使用线性插值法计算给定温度下的对流换热系数
+        - 数据来源: 工程常用对流换热系数表
+    """
+    # 对流换热系数参考表(W/m²·K)
+    CONVECTION_COEFF = {
+        50: 9.95,
+        55: 9.99,
+        60: 10.33,
+        65: 10.67,
+        70: 11.02,
+        75: 11.3,
+        80: 11.64,
+        85: 11.92,
+        90: 12.21,
+        95: 12.49,
+        100: 12.83,
+        105: 13.06,
+        110: 13.34,
+        115: 13.63,
+        120: 13.91,
+        125: 14.25,
+        130: 14.48,
+        135: 14.82,
+        140: 15.1,
+        145: 15.39,
+        150: 15.67,
+        155: 15.96,
+        160: 16.24,
+        165: 16.52,
+        170: 16.81,
+        175: 17.15,
+        180: 17.43,
+        185: 17.72,
+        190: 18.0,
+        195: 18.34,
+        200: 18.62,
+    }  # W/m²·K
+    """根据温度插值计算对流换热系数"""
+    temps = np.array(list(CONVECTION_COEFF.keys()))
+    coeffs = np.array(list(CONVECTION_COEFF.values()))
+    return np.interp(T, temps, coeffs)
+
+
+def node_layer_index(layers, dx=0.001):
+    """
+    计算每个节点所属的层号
+
+    参数:
+        layers (list): 层结构列表，每个元素包含thickness(m)
+        dx (float): 空间步长(m)
+
+    返回:
+        np.ndarray: 各节点的层号(整数数组)
+
+    说明:
+        - 位于层界面上的节点归属于下一层(与逐点推进的判断一致)
+    """
+    thickness = np.array([layer["thickness"] for layer in layers], dtype=float)
+    n_nodes = int(round(thickness.sum() / dx)) + 1
+    boundaries = np.cumsum(thickness)[:-1] - 1e-12
+    return np.searchsorted(boundaries, np.arange(n_nodes) * dx, side="right")
+
+
+def _layer_factors(layers):
+    """各层的热导率修正系数"""
+    return np.array(
+        [
+            layer.get(
+                "correction_factor",
+                MATERIALS.default_factor[MATERIALS.index(layer["material"])],
+            )
+            for layer in layers
+        ],
+        dtype=float,
+    )
+
+
+def build_material_profile(layers, dx=0.001):
+    """
+    构建材料分布剖面
+
+    参数:
+        layers (list): 层结构列表，每个元素包含:
+            - thickness: 层厚度(m)
+            - material: 材料名称
+            - correction_factor: 可选，热导率修正系数
+        dx (float): 空间步长(m)，默认0.001
+
+    返回:
+        tuple: (material_profile, n_nodes)
+            - material_profile: 材料属性剖面列表
+            - n_nodes: 总节点数
+
+    说明:
+        - 将连续的材料层离散化为节点表示
+        - 每个节点包含材料名称和修正系数
+    """
+    layer_idx = node_layer_index(layers, dx)
+    factors = _layer_factors(layers)
+    material_profile = [
+        {"name": layers[i]["material"], "factor": factors[i]} for i in layer_idx
+    ]
+    return material_profile, len(layer_idx)
+
+
+def _layer_conductivity(layers, factors, layer_idx, T):
+    """
+    按层号批量计算热导率及其对温度的导数
+
+    参数:
+        layers (list): 层结构列表
+        factors (np.ndarray): 各层修正系数
+        layer_idx (np.ndarray): 每个求值点所属的层号
+        T (np.ndarray): 求值点温度(℃)
+
+    返回:
+        tuple: (k, dk_dT) 两个与T同形的数组
+    """
+    mat_idx = MATERIALS.index([layer["material"] for layer in layers])[layer_idx]
+    factor = factors[layer_idx]
+    return (
+        MATERIALS.conductivity(mat_idx, T) * factor,
+        MATERIALS.conductivity_derivative(mat_idx, T) * factor,
+    )
+
+
+def _exterior_h_array(T_wall, T_amb):
+    """外壁对流换热系数，可对数组求值"""
+    # 基础值+温差修正，最小对流系数约束
+    return np.maximum(15 * (1 + 0.02 * np.maximum(T_wall - T_amb, 0)), 5.0)
+
+
+def _exterior_h(T_wall, T_amb):
+    """外壁对流换热系数及其对壁温的导数"""
+    over = T_wall > T_amb
+    return float(_exterior_h_array(T_wall, T_amb)), (0.3 if over else 0.0)
+
+
+def check_boundary_temperatures(T_in, T_amb):
+    """
+    检查边界温度: 模型只描述由内壁向空气散热的过程
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+
+    异常:
+        ValueError: 内壁温度低于空气温度时
+    """
+    if T_in < T_amb:
+        raise ValueError(f"内壁温度({T_in}℃)低于空气温度({T_amb}℃)，请检查边界条件")
+
+
+def wall_residual(T, T_in, T_amb, layers, dx=0.001, jacobian=False, edge_weight=None):
+    """
+    多层平壁离散方程的残差(可选返回带状三对角雅可比矩阵)
+
+    参数:
+        T (np.ndarray): 节点温度(℃)
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        layers (list): 层结构列表
+        dx (float): 空间步长(m)
+        jacobian (bool): 是否同时返回雅可比矩阵
+        edge_weight (np.ndarray): 可选，各边传热面积与外表面积之比，
+            默认为1(平壁)；圆筒壁为 r_e / R
+
+    返回:
+        np.ndarray 或 tuple: 残差数组；jacobian为True时返回(残差, ab)，
+        ab为scipy.linalg.solve_banded所需的(3, n)带状矩阵
+
+    说明:
+        - 守恒型差分格式: 每条边(节点e与e+1之间)的热导率取两侧节点
+          所在材料在边平均温度下的调和平均(同一层内即为该材料的λ)，
+          节点残差为流入与流出热流之差，层界面处热流连续
+        - 右边界: 导热热流 = 对流传热，热导率下限0.01
+    """
+    layer_idx = node_layer_index(layers, dx)
+    factors = _layer_factors(layers)
+
+    # 第e条边连接节点e与e+1，边上的平均温度
+    T_mid = 0.5 * (T[:-1] + T[1:])
+    kL, dkL = _layer_conductivity(layers, factors, layer_idx[:-1], T_mid)
+    kR, dkR = _layer_conductivity(layers, factors, layer_idx[1:], T_mid)
+
+    # 边热导率(调和平均)及其对边两端节点温度的偏导(两端相同)
+    s = kL + kR
+    safe = np.where(s != 0, s, 1.0)
+    k_edge = np.where(s != 0, 2 * kL * kR / safe, 0.0)
+    g_edge = np.where(s != 0, (kR**2 * dkL + kL**2 * dkR) / safe**2, 0.0)
+    w = 1.0 if edge_weight is None else edge_weight
+
+    n = len(T)
+    D = T[:-1] - T[1:]
+    res = np.empty(n)
+    res[0] = T[0] - T_in  # 左边界条件: 固定温度
+
+    # 内部节点: 热平衡方程 q(i-1→i) = q(i→i+1)
+    flux = w * k_edge * D / dx
+    res[1:-1] = flux[:-1] - flux[1:]
+
+    # 右边界: 对流边界条件
+    k = max(k_edge[-1], 0.01)  # 最小热导率约束
+    g = g_edge[-1] if k_edge[-1] > 0.01 else 0.0
+    w_last = 1.0 if edge_weight is None else edge_weight[-1]
+    k, g = k * w_last, g * w_last
+    T_wall = T[-1]
+    h, dh = _exterior_h(T_wall, T_amb)
+    res[-1] = k * D[-1] / dx - h * (T_wall - T_amb)
+
+    if not jacobian:
+        return res
+
+    # 边热流对左、右节点温度的偏导
+    dF_left = w * (g_edge * D + k_edge) / dx
+    dF_right = w * (g_edge * D - k_edge) / dx
+
+    # ab[0, j+1] = J[j, j+1], ab[1, j] = J[j, j], ab[2, j] = J[j+1, j]
+    ab = np.zeros((3, n))
+    ab[1, 0] = 1.0
+    ab[2, 0 : n - 2] = dF_left[:-1]  # J[i, i-1]
+    ab[1, 1:-1] = dF_right[:-1] - dF_left[1:]  # J[i, i]
+    ab[0, 2:] = -dF_right[1:]  # J[i, i+1]
+    ab[2, n - 2] = (g * D[-1] + k) / dx  # J[n-1, n-2]
+    ab[1, n - 1] = (g * D[-1] - k) / dx - dh * (T_wall - T_amb) - h
+    return res, ab
+
+
+def newton_banded(fun, T, tol=1e-6, max_iter=100):
+    """
+    三对角雅可比矩阵的牛顿迭代
+
+    参数:
+        fun (callable): fun(T) 返回(残差, ab)，ab为solve_banded格式的带状矩阵
+        T (np.ndarray): 初值
+        tol (float): 相对收敛容差
+        max_iter (int): 最大迭代次数
+
+    返回:
+        np.ndarray: 解
+
+    说明:
+        - 每步用solve_banded以O(n)求解，带回溯线搜索保证残差范数下降
+    """
+    res, ab = fun(T)
+    norm = np.linalg.norm(res)
+    for _ in range(max_iter):
+        step = solve_banded((1, 1), ab, -res)
+        # 回溯线搜索，保证残差范数下降
+        alpha = 1.0
+        while True:
+            T_new = T + alpha * step
+            res_new, ab_new = fun(T_new)
+            norm_new = np.linalg.norm(res_new)
+            if norm_new <= norm or alpha < 1e-4:
+                break
+            alpha *= 0.5
+        T, res, ab, norm = T_new, res_new, ab_new, norm_new
+        if np.max(np.abs(step)) <= tol * max(np.max(np.abs(T)), 1.0):
+            return T
+    raise ValueError("温度场迭代未收敛，请检查材料参数或边界条件")
+
+
+def bisect_increasing(residual, n, x_hi, rtol=1e-10, max_iter=200):
+    """
+    对n个单调递增、在0处为负的函数同时求根
+
+    参数:
+        residual (callable): residual(x) 对形状(n,)的x返回形状(n,)的残差
+        n (int): 方程个数
+        x_hi (float): 初始上界，残差仍为负时按4倍扩大
+        rtol (float): 相对容差
+        max_iter (int): 最大二分次数
+
+    返回:
+        np.ndarray: 根
+    """
+    lo = np.zeros(n)
+    hi = np.full(n, float(x_hi))
+    for _ in range(100):
+        low = residual(hi) < 0
+        if not low.any():
+            break
+        lo[low] = hi[low]
+        hi[low] *= 4
+
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        below = residual(mid) < 0
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+        if np.all(hi - lo <= rtol * np.maximum(hi, 1.0)):
+            break
+    return 0.5 * (lo + hi)
+
+
+def _result_data(layers, interface_temps, q_final):
+    """构建结果数据结构(层号、材料、厚度、界面温度和热流密度)"""
+    return {
+        "层号": list(range(1, len(layers) + 1)),
+        "材料": [layer["material"] for layer in layers],
+        "厚度(mm)": [round(layer["thickness"] * 1000, 2) for layer in layers],
+        "界面温度(℃)": [round(float(T), 2) for T in interface_temps],
+        "热流密度(W/m²)": round(float(q_final), 1),
+    }
+
+
+def corrected_solver(T_in, T_amb, layers, dx=0.001, tol=1e-6, max_iter=100):
+    """
+    多层平壁导热求解器(带物理修正)
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        layers (list): 层结构列表
+        dx (float): 空间步长(m)，默认0.001
+        tol (float): 牛顿迭代的相对收敛容差
+        max_iter (int): 最大迭代次数
+
+    返回:
+        tuple: (temps, positions, result_data)
+            - temps: 温度分布数组(℃)
+            - positions: 位置坐标数组(m)
+            - result_data: 包含层号、材料、厚度、界面温度和热流密度的字典
+
+    说明:
+        - 使用有限差分法求解一维稳态导热方程
+        - 残差全部向量化计算，雅可比矩阵为解析的三对角矩阵，
+          采用带回溯的牛顿迭代，每步用solve_banded以O(n)求解
+        - 包含多项物理修正:
+            * 界面热导率调和平均处理
+            * 边界条件物理约束
+            * 温度场合理性校验
+    """
+    n_nodes = len(node_layer_index(layers, dx))
+    positions = np.linspace(0, sum(l["thickness"] for l in layers), n_nodes)
+
+    # 初始化温度场(线性分布)
+    T = np.linspace(T_in, max(T_amb + 50, 100), n_nodes)  # 线性初值
+    T = np.clip(T, T_amb + 20, None)  # 温度下限约束
+
+    T = newton_banded(
+        lambda T: wall_residual(T, T_in, T_amb, layers, dx, jacobian=True),
+        T,
+        tol,
+        max_iter,
+    )
+    temps = T
+
+    # 物理合理性校验(温度不应低于环境温度-5℃)
+    if np.any(temps < T_amb - 5):
+        raise ValueError("温度计算结果出现非物理值，请检查材料参数或边界条件")
+
+    # 计算最终热流密度(基于右边界对流换热)
+    T_wall = temps[-1]
+    h, _ = _exterior_h(T_wall, T_amb)  # 对流系数
+    q_final = h * (T_wall - T_amb)  # 热流密度(W/m²)
+
+    # 计算各层界面索引
+    current_position = 0.0
+    interface_indices = []
+    for layer in layers:
+        current_position += layer["thickness"]
+        idx = int(round(current_position / dx))  # 计算节点索引
+        interface_indices.append(min(idx, len(temps) - 1))  # 确保不越界
+
+    # 构建结果数据结构
+    result_data = _result_data(
+        layers, [temps[idx] for idx in interface_indices[:-1]] + [temps[-1]], q_final
+    )
+
+    return temps, positions, result_data
+
+
+# ---------------------------------------------------------------------------
+# λ = a + bT 材料的解析解(Kirchhoff变换)
+# ---------------------------------------------------------------------------
+def layer_linear_coefficients(layers):
+    """
+    各层(含修正系数)的线性热导率系数
+
+    参数:
+        layers (list): 层结构列表
+
+    返回:
+        np.ndarray 或 None: 形状(n_layers, 2)的[a, b]数组，
+        任一层材料为非线性时返回None
+    """
+    factors = _layer_factors(layers)
+    coefs = []
+    for layer, factor in zip(layers, factors):
+        ab = MATERIALS.linear_coefficients(layer["material"])
+        if ab is None:
+            return None
+        coefs.append((ab[0] * factor, ab[1] * factor))
+    return np.array(coefs, dtype=float)
+
+
+def _kirchhoff_temperature(T1, q_len, a, b):
+    """
+    已知热端温度和单位面积热阻项，求线性λ层冷端温度
+
+    参数:
+        T1: 热端温度(℃)
+        q_len: 热流密度与距离的乘积 q·x (W/m)
+        a, b: λ = a + bT 的系数
+
+    返回:
+        冷端温度(℃)，支持numpy广播
+
+    说明:
+        - 由 ∫λdT = q·x 得 Φ(T2) = Φ(T1) - q·x，Φ(T) = aT + bT²/2
+        - 解二次方程时取与热端λ同号的根；若q过大无实根，
+          则取λ=0对应的温度(使外边界残差为正，便于求根)
+    """
+    T1 = np.asarray(T1, dtype=float)
+    q_len = np.asarray(q_len, dtype=float)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    linear = b == 0
+    b_safe = np.where(linear, 1.0, b)
+    a_safe = np.where(a == 0, 1e-300, a)
+    phi1 = a * T1 + 0.5 * b * T1**2
+    disc = np.maximum(a**2 + 2 * b * (phi1 - q_len), 0.0)
+    sign = np.where(a + b * T1 >= 0, 1.0, -1.0)
+    T_quad = (-a + sign * np.sqrt(disc)) / b_safe
+    return np.where(linear, T1 - q_len / a_safe, T_quad)
+
+
+def chain_temperatures(q, T_in, coefs, thickness):
+    """
+    按层依次计算各界面温度
+
+    参数:
+        q: 热流密度(W/m²)，可为数组(批量计算)
+        T_in (float): 内壁温度(℃)
+        coefs (np.ndarray): 各层[a, b]，形状(n_layers, 2)
+        thickness (array): 各层厚度(m)
+
+    返回:
+        list: 各层冷端温度，与q同形
+    """
+    temps = []
+    T = np.broadcast_to(np.asarray(T_in, dtype=float), np.shape(q))
+    for (a, b), L in zip(coefs, thickness):
+        T = _kirchhoff_temperature(T, np.asarray(q) * L, a, b)
+        temps.append(T)
+    return temps
+
+
+def analytic_solver(T_in, T_amb, layers, dx=0.001, coefs=None):
+    """
+    线性λ多层平壁的解析求解器
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        layers (list): 层结构列表，各层材料须满足 λ = a + bT
+        dx (float): 输出温度分布的空间步长(m)
+        coefs (np.ndarray): 可选，各层[a, b]系数，默认由材料表得到
+
+    返回:
+        tuple: (temps, positions, result_data)，与corrected_solver相同
+
+    说明:
+        - 每层的温度分布由Kirchhoff变换得到解析式，
+          只需对热流密度q这一个未知量求根(brentq)，
+          使外壁对流传热 h(Tw)·(Tw - T_amb) 等于q
+    """
+    if coefs is None:
+        coefs = layer_linear_coefficients(layers)
+        if coefs is None:
+            raise ValueError("存在热导率非线性的材料，无法使用解析解")
+    check_boundary_temperatures(T_in, T_amb)
+    thickness = np.array([layer["thickness"] for layer in layers], dtype=float)
+
+    def boundary_residual(q):
+        T_wall = float(chain_temperatures(q, T_in, coefs, thickness)[-1])
+        h, _ = _exterior_h(T_wall, T_amb)
+        return q - h * (T_wall - T_amb)
+
+    if T_in == T_amb:
+        q = 0.0  # 没有温差，不传热(舍入误差会使q=0处的残差略大于0)
+    else:
+        # q=0时外壁为内壁温度，残差为负；逐步放大上界直到残差变号
+        q_hi = max(T_in - T_amb, 1.0) * 10.0
+        while boundary_residual(q_hi) < 0:
+            q_hi *= 4
+        q = brentq(boundary_residual, 0.0, q_hi, xtol=1e-10, rtol=1e-12)
+
+    interface_temps = [float(T) for T in chain_temperatures(q, T_in, coefs, thickness)]
+
+    # 按给定步长输出各节点温度
+    n_nodes = len(node_layer_index(layers, dx))
+    positions = np.linspace(0, thickness.sum(), n_nodes)
+    layer_idx = np.minimum(
+        np.searchsorted(np.cumsum(thickness), positions, side="right"), len(layers) - 1
+    )
+    starts = np.concatenate(([0.0], np.cumsum(thickness)[:-1]))
+    T_hot = np.array([T_in] + interface_temps[:-1])
+    temps = _kirchhoff_temperature(
+        T_hot[layer_idx],
+        q * (positions - starts[layer_idx]),
+        coefs[layer_idx, 0],
+        coefs[layer_idx, 1],
+    )
+
+    if np.any(temps < T_amb - 5):
+        raise ValueError("温度计算结果出现非物理值，请检查材料参数或边界条件")
+
+    return temps, positions, _result_data(layers, interface_temps, q)
+
+
+def solve_wall(T_in, T_amb, layers, dx=0.001, mode="auto"):
+    """
+    多层平壁求解入口
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        layers (list): 层结构列表
+        dx (float): 空间步长(m)
+        mode (str): "auto" 全部为线性材料时用解析解，否则用数值解；
+            "numerical" 始终用有限差分数值解
+
+    返回:
+        tuple: (temps, positions, result_data, method)，
+        method为实际使用的方法("analytic"或"numerical")
+    """
+    if mode not in ("auto", "numerical"):
+        raise ValueError(f"未知的求解方式: {mode}")
+    check_boundary_temperatures(T_in, T_amb)
+    coefs = layer_linear_coefficients(layers) if mode == "auto" else None
+    if coefs is not None:
+        return (*analytic_solver(T_in, T_amb, layers, dx, coefs), "analytic")
+    return (*corrected_solver(T_in, T_amb, layers, dx), "numerical")
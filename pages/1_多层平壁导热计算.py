@@ -16,402 +16,20 @@
 3. 点击计算按钮获取结果
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
-from scipy.optimize import fsolve
 import plotly.graph_objects as go
 import streamlit as st
 import pandas as pd
 
-# 材料热导率数据库（单位：W/m·K）
-# 每种材料包含：
-# - lambda: 热导率与温度的函数关系
-# - T_max: 最高使用温度(℃)
-# - default_factor: 默认修正系数
-MATERIAL_DB = {
-    "低水泥浇注料": {"lambda": lambda T: 1.5698, "default_factor": 1.0},
-    "轻质浇注料": {"lambda": lambda T: 0.5016, "default_factor": 1.0},
-    "炉顶密封料": {"lambda": lambda T: 0.1691, "default_factor": 1.0},
-    "🧱 耐火粘土砖 (2070 kg/m³)": {
-        "lambda": lambda T: 0.84 + 0.00058 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱 耐火粘土砖 (2100 kg/m³)": {
-        "lambda": lambda T: 0.81 + 0.0006 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱 轻质耐火粘土砖 (1300 kg/m³)": {
-        "lambda": lambda T: 0.407 + 0.000349 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱 轻质耐火粘土砖 (1000 kg/m³)": {
-        "lambda": lambda T: 0.291 + 0.000256 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱 硅砖": {
-        "lambda": lambda T: 0.93 + 0.000698 * T,
-        "T_max": 1620,
-        "default_factor": 1.0,
-    },
-    "🧱 半硅砖": {
-        "lambda": lambda T: 0.87 + 0.00052 * T,
-        "T_max": 1500,
-        "default_factor": 1.0,
-    },
-    "🧱 镁砖": {
-        "lambda": lambda T: 4.65 - 0.001745 * T,
-        "T_max": 1520,
-        "default_factor": 1.0,
-    },
-    "🧱 铬镁砖": {
-        "lambda": lambda T: 1.28 + 0.000407 * T,
-        "T_max": 1530,
-        "default_factor": 1.0,
-    },
-    "🧱 碳化硅砖": {
-        "lambda": lambda T: 20.9 - 10.467 * T,
-        "T_max": 1700,
-        "default_factor": 1.0,
-    },
-    "🧱 高铝砖(LZ)-65": {
-        "lambda": lambda T: 2.09 + 0.001861 * T,
-        "T_max": 1500,
-        "default_factor": 1.0,
-    },
-    "🧱 高铝砖(LZ)-55": {
-        "lambda": lambda T: 2.09 + 0.001861 * T,
-        "T_max": 1470,
-        "default_factor": 1.0,
-    },
-    "🧱 高铝砖(LZ)-48": {
-        "lambda": lambda T: 2.09 + 0.001861 * T,
-        "T_max": 1420,
-        "default_factor": 1.0,
-    },
-    "🧱 抗渗碳砖(重质)": {
-        "lambda": lambda T: 0.698 + 0.000639 * T,
-        "T_max": 1400,
-        "default_factor": 1.0,
-    },
-    "🧱 抗渗碳砖(轻质)": {
-        "lambda": lambda T: 0.15 + 0.000128 * T,
-        "T_max": 1400,
-        "default_factor": 1.0,
-    },
-    "🧱 轻质耐火粘土砖(800 kg/m³)": {
-        "lambda": lambda T: 0.21 + 0.0002 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱 轻质耐火粘土砖(600 kg/m³)": {
-        "lambda": lambda T: 0.13 + 0.00023 * T,
-        "T_max": 1300,
-        "default_factor": 1.0,
-    },
-    "🧱红砖": {
-        "lambda": lambda T: 0.814 + 0.000465 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "🟫 轻质浇注料(1.4)": {
-        "lambda": lambda T: 0.15 + 0.0004 * T,
-        "T_max": 1150,
-        "default_factor": 1.0,
-    },
-    "🟫 轻质浇注料(1.8)": {
-        "lambda": lambda T: 0.1 + 0.0007 * T,
-        "T_max": 1250,
-        "default_factor": 1.0,
-    },
-    "🟫 重质浇注料(2.2)": {
-        "lambda": lambda T: 0.45 + 0.0005 * T,
-        "T_max": 1400,
-        "default_factor": 1.0,
-    },
-    "🟫 钢筋混凝土": {"lambda": lambda T: 1.55, "T_max": None, "default_factor": 1.0},
-    "🟫 泡沫混凝土": {"lambda": lambda T: 0.16, "T_max": None, "default_factor": 1.0},
-    "🪟 玻璃绵": {"lambda": lambda T: 0.052, "T_max": None, "default_factor": 1.0},
-    "⬜ 生石灰": {"lambda": lambda T: 0.12, "T_max": None, "default_factor": 1.0},
-    "⬜ 石膏板": {"lambda": lambda T: 0.41, "T_max": None, "default_factor": 1.0},
-    # 新增材料
-    "⬜ 岩棉板(100 kg/m³)": {
-        "lambda": lambda T: 3.2 - 0.00291 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "⬜ 混合纤维板(Al₂O₃≥72%)(加热线收缩≤2%)(1400℃x24h)(ρ≤400 kg/m³)": {
-        "lambda": lambda T: 3.05 - 0.00105 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "⬜ 混合纤维板(Al₂O₃≥68%)(加热线收缩≤2%)(1400℃x24h)(ρ≤300 kg/m³)": {
-        "lambda": lambda T: 3.05 - 0.00105 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 耐火纤维毯(毡)(96 kg/m³)": {
-        "lambda": lambda T: 3.18 - 0.00194 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 耐火纤维毯(毡)(128 kg/m³)": {
-        "lambda": lambda T: 3.18 - 0.00174 * T,
-        "default_factor": 1.0,
-    },
-    "☁️ 耐火纤维毯(毡)(160 kg/m³)": {
-        "lambda": lambda T: 3.17 - 0.00163 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 耐火纤维毯(毡)(192 kg/m³)": {
-        "lambda": lambda T: 3.13 - 0.00149 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 耐火纤维毯(毡)(288 kg/m³)": {
-        "lambda": lambda T: 3.05 - 0.00125 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 氧化铝纤维(Al₂O₃: 80～95%)": {
-        "lambda": lambda T: 3.05 - 0.00135 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "☁️ 莫来石纤维(Al₂O₃: 72%)": {
-        "lambda": lambda T: 3.05 - 0.00135 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-    "🌀 棉卷(加热线收缩≤2%)(1400℃x24h)(96 kg/m³)": {
-        "lambda": lambda T: 3.05 - 0.00135 * T,
-        "T_max": None,
-        "default_factor": 1.0,
-    },
-}
-
-
-def get_convection_coefficient(T):
-    """
-    根据温度计算对流换热系数
-
-    参数:
-        T (float): 壁面温度(℃)
-
-    返回:
-        float: 对流换热系数(W/m²·K)
-
-    说明:
-        - 使用线性插值法计算给定温度下的对流换热系数
-        - 数据来源: 工程常用对流换热系数表
-    """
-    # 对流换热系数参考表(W/m²·K)
-    CONVECTION_COEFF = {
-        50: 9.95,
-        55: 9.99,
-        60: 10.33,
-        65: 10.67,
-        70: 11.02,
-        75: 11.3,
-        80: 11.64,
-        85: 11.92,
-        90: 12.21,
-        95: 12.49,
-        100: 12.83,
-        105: 13.06,
-        110: 13.34,
-        115: 13.63,
-        120: 13.91,
-        125: 14.25,
-        130: 14.48,
-        135: 14.82,
-        140: 15.1,
-        145: 15.39,
-        150: 15.67,
-        155: 15.96,
-        160: 16.24,
-        165: 16.52,
-        170: 16.81,
-        175: 17.15,
-        180: 17.43,
-        185: 17.72,
-        190: 18.0,
-        195: 18.34,
-        200: 18.62,
-    }  # W/m²·K
-    """根据温度插值计算对流换热系数"""
-    temps = np.array(list(CONVECTION_COEFF.keys()))
-    coeffs = np.array(list(CONVECTION_COEFF.values()))
-    return np.interp(T, temps, coeffs)
-
-
-def build_material_profile(layers, dx=0.001):
-    """
-    构建材料分布剖面
-
-    参数:
-        layers (list): 层结构列表，每个元素包含:
-            - thickness: 层厚度(m)
-            - material: 材料名称
-            - correction_factor: 可选，热导率修正系数
-        dx (float): 空间步长(m)，默认0.001
-
-    返回:
-        tuple: (material_profile, n_nodes)
-            - material_profile: 材料属性剖面列表
-            - n_nodes: 总节点数
-
-    说明:
-        - 将连续的材料层离散化为节点表示
-        - 每个节点包含材料名称和修正系数
-    """
-    material_profile = []
-    current_pos = 0.0
-    layer_idx = 0
-
-    total_thickness = sum(layer["thickness"] for layer in layers)
-    n_nodes = int(round(total_thickness / dx)) + 1
-
-    for i in range(n_nodes):
-        pos = i * dx
-        while (
-            layer_idx < len(layers) - 1
-            and pos >= current_pos + layers[layer_idx]["thickness"] - 1e-12
-        ):
-            current_pos += layers[layer_idx]["thickness"]
-            layer_idx += 1
-
-        material_profile.append(
-            {
-                "name": layers[layer_idx]["material"],
-                "factor": layers[layer_idx].get(
-                    "correction_factor",
-                    MATERIAL_DB[layers[layer_idx]["material"]]["default_factor"],
-                ),
-            }
-        )
-
-    return material_profile, n_nodes
-
-
-def corrected_solver(T_in, T_amb, layers, dx=0.001):
-    """
-    多层平壁导热求解器(带物理修正)
-
-    参数:
-        T_in (float): 内壁温度(℃)
-        T_amb (float): 环境空气温度(℃)
-        layers (list): 层结构列表
-        dx (float): 空间步长(m)，默认0.001
-
-    返回:
-        tuple: (temps, positions, result_data)
-            - temps: 温度分布数组(℃)
-            - positions: 位置坐标数组(m)
-            - result_data: 包含层号、材料、厚度、界面温度和热流密度的字典
-
-    说明:
-        - 使用有限差分法求解一维稳态导热方程
-        - 包含多项物理修正:
-            * 界面热导率调和平均处理
-            * 边界条件物理约束
-            * 温度场合理性校验
-    """
-    material_profile, n_nodes = build_material_profile(layers, dx)
-    positions = np.linspace(0, sum(l["thickness"] for l in layers), n_nodes)
-
-    def residual_eq(T):
-        """计算残差方程的向量函数"""
-        residuals = [T[0] - T_in]  # 左边界条件: 固定温度
-
-        # 内部节点处理 - 热平衡方程
-        for i in range(1, n_nodes - 1):
-            # 获取相邻节点材料属性
-            mat_prev = material_profile[i - 1]
-            mat_next = material_profile[i + 1]
-
-            # 计算界面热导率(考虑温度相关性)
-            k_prev = (
-                MATERIAL_DB[mat_prev["name"]]["lambda"]((T[i - 1] + T[i]) / 2)
-                * mat_prev["factor"]
-            )
-            k_next = (
-                MATERIAL_DB[mat_next["name"]]["lambda"]((T[i] + T[i + 1]) / 2)
-                * mat_next["factor"]
-            )
-
-            # 界面热导率采用调和平均(保证热流连续)
-            k_interface = (
-                2 * k_prev * k_next / (k_prev + k_next) if (k_prev + k_next) != 0 else 0
-            )
-
-            # 热平衡方程: q(i-1→i) = q(i→i+1)
-            residuals.append(
-                k_prev * (T[i - 1] - T[i]) / dx - k_interface * (T[i] - T[i + 1]) / dx
-            )
-
-        # 右边界处理 - 对流边界条件
-        mat_prev = material_profile[-2]  # 最后一个内部节点材料
-        T_wall = T[-1]  # 壁面温度
-        T_prev = T[-2]  # 最后一个内部节点温度
-
-        # 计算导热系数(带最小值约束)
-        k = max(
-            MATERIAL_DB[mat_prev["name"]]["lambda"]((T_prev + T_wall) / 2)
-            * mat_prev["factor"],
-            0.01,  # 最小热导率约束
-        )
-
-        # 计算对流换热系数(带物理约束)
-        h = 15 * (1 + 0.02 * max(T_wall - T_amb, 0))  # 基础值+温差修正
-        h = max(h, 5.0)  # 最小对流系数约束
-
-        # 边界热平衡方程: 导热热流 = 对流传热
-        residuals.append(k * (T_prev - T_wall) / dx - h * (T_wall - T_amb))
-
-        return residuals
-
-    # 初始化温度场(线性分布)
-    T_initial = np.linspace(T_in, max(T_amb + 50, 100), n_nodes)  # 线性初值
-    T_initial = np.clip(T_initial, T_amb + 20, None)  # 温度下限约束
-
-    # 求解非线性方程组
-    solution = fsolve(
-        residual_eq, T_initial, xtol=1e-6, maxfev=5000  # 容差  # 最大函数调用次数
-    )
-    temps = solution
-
-    # 物理合理性校验(温度不应低于环境温度-5℃)
-    if np.any(temps < T_amb - 5):
-        raise ValueError("温度计算结果出现非物理值，请检查材料参数或边界条件")
-
-    # 计算最终热流密度(基于右边界对流换热)
-    T_wall = temps[-1]
-    h = max(15 * (1 + 0.02 * max(T_wall - T_amb, 0)), 5.0)  # 对流系数
-    q_final = h * (T_wall - T_amb)  # 热流密度(W/m²)
-
-    # 计算各层界面索引
-    current_position = 0.0
-    interface_indices = []
-    for layer in layers:
-        current_position += layer["thickness"]
-        idx = int(round(current_position / dx))  # 计算节点索引
-        interface_indices.append(min(idx, len(temps) - 1))  # 确保不越界
-
-    # 构建结果数据结构
-    result_data = {
-        "层号": list(range(1, len(layers) + 1)),
-        "材料": [layer["material"] for layer in layers],
-        "厚度(mm)": [round(layer["thickness"] * 1000, 2) for layer in layers],
-        "界面温度(℃)": [round(temps[idx], 2) for idx in interface_indices[:-1]]
-        + [round(temps[-1], 2)],
-        "热流密度(W/m²)": round(q_final, 1),
-    }
-
-    return solution, positions, result_data
+# 材料表和求解器位于仓库根目录的 multilayer_wall.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from multilayer_wall import MATERIALS, solve_wall  # noqa: E402
+from wall_optimizer import OBJECTIVES, optimize_lining  # noqa: E402
+from wall_cylinder import solve_cylinder  # noqa: E402
+from wall_transient import transient_solver  # noqa: E402
 
 
 def web_plot(x_meters, y, layers):
@@ -517,6 +135,123 @@ def web_plot(x_meters, y, layers):
     return fig
 
 
+@st.cache_data(max_entries=32)
+def run_optimization(T_in, T_amb, layer_specs, T_cold_max, objective, unit_costs):
+    """缓存的厚度优化，相同的输入直接返回上次结果"""
+    return optimize_lining(
+        T_in, T_amb, layer_specs, T_cold_max, objective, dict(unit_costs)
+    )
+
+
+@st.cache_data(max_entries=16)
+def run_transient(layers, schedule, T_amb, dt, initial):
+    """缓存的非稳态计算"""
+    return transient_solver(layers, schedule, T_amb, dt=dt, initial=initial)
+
+
+def transient_plot(result, layers):
+    """
+    热面、各层界面及冷面温度随时间的变化曲线
+
+    参数:
+        result (TransientResult): 非稳态计算结果
+        layers (list): 层结构列表
+
+    返回:
+        plotly.graph_objects.Figure: 温度-时间曲线图
+    """
+    hours = result.times / 3600
+    boundaries = np.cumsum([0.0] + [layer["thickness"] for layer in layers])
+    indices = np.minimum(
+        np.round(boundaries / (result.positions[1] - result.positions[0])).astype(int),
+        len(result.positions) - 1,
+    )
+    names = (
+        ["热面"] + [f"第{i+1}/{i+2}层界面" for i in range(len(layers) - 1)] + ["冷面"]
+    )
+
+    fig = go.Figure()
+    for name, idx in zip(names, indices):
+        fig.add_trace(
+            go.Scatter(x=hours, y=result.temps[:, idx], mode="lines", name=name)
+        )
+    fig.add_trace(
+        go.Scatter(
+            x=hours,
+            y=result.q_out,
+            mode="lines",
+            name="冷面散热热流密度",
+            line=dict(dash="dot"),
+            yaxis="y2",
+        )
+    )
+    fig.update_layout(
+        height=500,
+        xaxis_title="<b>时间 (h)</b>",
+        yaxis=dict(title="<b>温度 (℃)</b>"),
+        yaxis2=dict(title="<b>热流密度 (W/m²)</b>", overlaying="y", side="right"),
+        legend=dict(orientation="h", y=-0.2),
+    )
+    return fig
+
+
+def pareto_plot(result, objective_label):
+    """
+    Pareto前沿及全部可行方案的散点图
+
+    参数:
+        result (OptimizationResult): 优化结果
+        objective_label (str): 横轴名称
+
+    返回:
+        plotly.graph_objects.Figure: 散点图
+    """
+    feasible = np.flatnonzero(result.feasible & ~np.isnan(result.objective))
+    # 可行方案较多时抽样显示，避免浏览器卡顿
+    if len(feasible) > 5000:
+        feasible = np.random.default_rng(0).choice(feasible, 5000, replace=False)
+    front = result.pareto
+
+    def hover(indices):
+        return [
+            "<br>".join(
+                f"{m}: {t * 1000:.0f}mm"
+                for m, t in zip(result.materials[i], result.thickness[i])
+            )
+            for i in indices
+        ]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scattergl(
+            x=result.objective[feasible],
+            y=result.heat_flux[feasible],
+            mode="markers",
+            marker=dict(size=3, color="rgba(150, 150, 150, 0.5)"),
+            name="可行方案",
+            text=hover(feasible),
+            hovertemplate="%{text}<br>热流密度: %{y:.1f}W/m²<extra></extra>",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=result.objective[front],
+            y=result.heat_flux[front],
+            mode="lines+markers",
+            marker=dict(size=6, color="#d62728"),
+            name="Pareto前沿",
+            text=hover(front),
+            hovertemplate="%{text}<br>热流密度: %{y:.1f}W/m²<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        height=500,
+        xaxis_title=f"<b>{objective_label}</b>",
+        yaxis_title="<b>热流密度 (W/m²)</b>",
+    )
+    return fig
+
+
 # UI
 st.title("多层平壁导热计算")
 # 输入参数
@@ -526,6 +261,25 @@ with col1:
     T_in = st.number_input("内壁温度 (℃)", min_value=0.0, value=1300.0, step=50.0)
 with col2:
     T_air = st.number_input("空气温度 (℃)", min_value=0.0, value=20.0, step=5.0)
+SOLVER_MODES = {
+    "解析解(非线性材料自动改用数值解)": "auto",
+    "数值解(有限差分)": "numerical",
+}
+solver_mode = st.radio("求解方式", list(SOLVER_MODES), horizontal=True)
+col1, col2 = st.columns(2)
+with col1:
+    geometry = st.radio("几何形状", ["平壁", "圆筒壁(钢包、中间包等)"], horizontal=True)
+with col2:
+    r_inner = (
+        st.number_input(
+            "内半径 (mm)",
+            min_value=1.0,
+            value=1500.0,
+            step=50.0,
+            disabled=geometry == "平壁",
+        )
+        / 1000
+    )
 # 添加导热层
 st.header("添加导热层")
 layers = []
@@ -541,8 +295,9 @@ with st.expander("点击添加导热层"):
         )  # 将mm转换为m
         material = st.selectbox(
             f"材料 - 第 {i+1} 层",
-            options=list(MATERIAL_DB.keys()),
-            index=min(i, len(MATERIAL_DB) - 1),
+            options=MATERIALS.names,
+            index=min(i, len(MATERIALS) - 1),
+            format_func=MATERIALS.label,
         )
         layers.append({"thickness": thickness, "material": material})
 
@@ -551,44 +306,254 @@ if st.button("计算"):
         st.error("请至少添加一层")
     else:
         # 计算温度分布
-        temps, pos, result_data = corrected_solver(
-            T_in=T_in, T_amb=T_air, layers=layers
+        try:
+            if geometry == "平壁":
+                temps, pos, result_data, method = solve_wall(
+                    T_in=T_in,
+                    T_amb=T_air,
+                    layers=layers,
+                    mode=SOLVER_MODES[solver_mode],
+                )
+            else:
+                temps, pos, result_data, method = solve_cylinder(
+                    T_in=T_in,
+                    T_amb=T_air,
+                    r_inner=r_inner,
+                    layers=layers,
+                    mode=SOLVER_MODES[solver_mode],
+                )
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            line_heat_flux = result_data.pop("线热流密度(W/m)", None)
+            # result_data = {
+            #     "层号": list(range(1, len(layers) + 1)),
+            #     "材料": [layer["material"] for layer in layers],
+            #     "厚度(mm)": [round(layer["thickness"] * 1000, 2) for layer in layers],
+            #     "界面温度(℃)": [round(temps[idx], 1) for idx in interface_indices[:-1]]
+            #     + [round(temps[-1], 1)],
+            #     "热流密度(W/m²)": round(q_final, 1),
+            # }
+            result_data_table = pd.DataFrame(result_data)
+            result_data_table.set_index("层号", inplace=True)
+            # 删除 热流密度(W/m²)
+            result_data_table.drop("热流密度(W/m²)", axis=1, inplace=True)
+            # 显示计算结果
+            st.subheader("计算结果")
+            st.caption(
+                "采用解析解(λ = a + bT，Kirchhoff变换)"
+                if method == "analytic"
+                else "采用有限差分数值解"
+            )
+            # 显示表格
+            st.table(result_data_table)
+            # 检查各层热面温度是否超过最高使用温度
+            hot_faces = [T_in] + result_data["界面温度(℃)"][:-1]
+            for layer, T_hot in zip(layers, hot_faces):
+                T_max = MATERIALS.T_max[MATERIALS.index(layer["material"])]
+                if T_hot > T_max:
+                    st.warning(
+                        f"{layer['material']} 热面温度 {T_hot:.1f}℃ "
+                        f"超过最高使用温度 {T_max:.0f}℃"
+                    )
+            # 显示图表
+            st.plotly_chart(web_plot(pos, temps, layers))
+            # 显示关键参数
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.metric(
+                    "总厚度",
+                    f"{sum(round(layer['thickness'] * 1000, 2) for layer in layers):.2f} mm",
+                )
+            with col2:
+                st.metric("热流密度", f"{result_data['热流密度(W/m²)']:.2f} W/m²")
+            if line_heat_flux is not None:
+                st.metric("单位长度热损失", f"{line_heat_flux:.1f} W/m")
+
+            temps_df = pd.DataFrame({"位置(mm)": pos * 1000, "温度(℃)": temps})
+            csv_data = temps_df.to_csv(index=False).encode("utf-8")
+            st.download_button(
+                label="Download CSV",
+                data=csv_data,
+                file_name="data.csv",
+                mime="text/csv",
+                icon=":material/download:",
+            )
+
+# 内衬厚度优化
+st.header("内衬厚度优化")
+OBJECTIVE_LABELS = dict(
+    zip(OBJECTIVES, ("总厚度 (mm)", "面密度 (kg/m²)", "成本 (元/m²)"))
+)
+with st.expander("按上面的层数设置各层候选材料和厚度范围"):
+    layer_specs = []
+    for i, layer in enumerate(layers):
+        st.subheader(f"第 {i+1} 层")
+        candidates = st.multiselect(
+            f"候选材料 - 第 {i+1} 层",
+            options=MATERIALS.names,
+            default=[layer["material"]],
+            format_func=MATERIALS.label,
         )
-        # result_data = {
-        #     "层号": list(range(1, len(layers) + 1)),
-        #     "材料": [layer["material"] for layer in layers],
-        #     "厚度(mm)": [round(layer["thickness"] * 1000, 2) for layer in layers],
-        #     "界面温度(℃)": [round(temps[idx], 1) for idx in interface_indices[:-1]]
-        #     + [round(temps[-1], 1)],
-        #     "热流密度(W/m²)": round(q_final, 1),
-        # }
-        result_data_table = pd.DataFrame(result_data)
-        result_data_table.set_index("层号", inplace=True)
-        # 删除 热流密度(W/m²)
-        result_data_table.drop("热流密度(W/m²)", axis=1, inplace=True)
-        # 显示计算结果
-        st.subheader("计算结果")
-        # 显示表格
-        st.table(result_data_table)
-        # 显示图表
-        st.plotly_chart(web_plot(pos, temps, layers))
-        # 显示关键参数
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.metric(
-                "总厚度",
-                f"{sum(round(layer['thickness'] * 1000, 2) for layer in layers):.2f} mm",
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            t_min = st.number_input(
+                f"最小厚度 (mm) - 第 {i+1} 层", min_value=1.0, value=50.0, step=10.0
+            )
+        with c2:
+            t_max = st.number_input(
+                f"最大厚度 (mm) - 第 {i+1} 层", min_value=1.0, value=300.0, step=10.0
+            )
+        with c3:
+            t_step = st.number_input(
+                f"厚度步长 (mm) - 第 {i+1} 层", min_value=1.0, value=10.0, step=5.0
             )
-        with col2:
-            st.metric("热流密度", f"{result_data['热流密度(W/m²)']:.2f} W/m²")
-
-        temps_df = pd.DataFrame({"位置(mm)": pos * 1000, "温度(℃)": temps})
-        csv_data = temps_df.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            label="Download CSV",
-            data=csv_data,
-            file_name="data.csv",
-            mime="text/csv",
-            icon=":material/download:",
+        layer_specs.append(
+            {
+                "materials": candidates,
+                "thickness_range": (t_min / 1000, max(t_max, t_min) / 1000),
+                "step": t_step / 1000,
+            }
+        )
+
+    c1, c2 = st.columns(2)
+    with c1:
+        T_cold_max = st.number_input(
+            "冷面温度上限 (℃)", min_value=0.0, value=80.0, step=5.0
+        )
+    with c2:
+        objective = st.radio(
+            "优化目标",
+            OBJECTIVES,
+            format_func=lambda o: OBJECTIVE_LABELS[o].split(" ")[0],
+            horizontal=True,
+        )
+    unit_costs = {}
+    if objective == "cost":
+        selected = sorted({m for spec in layer_specs for m in spec["materials"]})
+        cost_table = st.data_editor(
+            pd.DataFrame({"材料": selected, "单价(元/m³)": [0.0] * len(selected)}),
+            disabled=["材料"],
+            hide_index=True,
+        )
+        unit_costs = dict(zip(cost_table["材料"], cost_table["单价(元/m³)"]))
+
+    if st.button("优化"):
+        if any(not spec["materials"] for spec in layer_specs):
+            st.error("每层至少选择一种候选材料")
+        else:
+            try:
+                result = run_optimization(
+                    T_in,
+                    T_air,
+                    layer_specs,
+                    T_cold_max,
+                    objective,
+                    tuple(sorted(unit_costs.items())),
+                )
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.caption(
+                    f"共 {len(result.heat_flux)} 个方案，"
+                    f"满足约束 {int(result.feasible.sum())} 个，"
+                    f"Pareto前沿 {len(result.pareto)} 个"
+                )
+                if result.missing:
+                    st.warning(
+                        "以下材料缺少密度，含这些材料的方案无法计算重量，"
+                        "未参与比较："
+                        + "、".join(MATERIALS.label(m) for m in result.missing)
+                    )
+                if len(result.pareto):
+                    st.plotly_chart(pareto_plot(result, OBJECTIVE_LABELS[objective]))
+                    front = result.pareto
+                    front_table = pd.DataFrame(
+                        {
+                            f"第{j+1}层": [
+                                f"{MATERIALS.label(m)} {t * 1000:.0f}mm"
+                                for m, t in zip(
+                                    result.materials[front, j],
+                                    result.thickness[front, j],
+                                )
+                            ]
+                            for j in range(result.thickness.shape[1])
+                        }
+                    )
+                    front_table[OBJECTIVE_LABELS[objective]] = np.round(
+                        result.objective[front], 1
+                    )
+                    front_table["热流密度(W/m²)"] = np.round(result.heat_flux[front], 1)
+                    front_table["冷面温度(℃)"] = np.round(
+                        result.interface_temps[front, -1], 1
+                    )
+                    st.dataframe(front_table, hide_index=True)
+                else:
+                    st.warning("没有满足约束的方案，请放宽厚度范围或冷面温度上限")
+
+# 非稳态升温/降温计算
+st.header("非稳态升温/降温计算")
+with st.expander("按上面的导热层和边界条件计算烘炉升温或停炉降温过程"):
+    schedule_table = st.data_editor(
+        pd.DataFrame(
+            {
+                "时间(h)": [0.0, 8.0, 12.0, 24.0, 48.0],
+                "热面温度(℃)": [T_air, 600.0, 600.0, T_in, T_in],
+            }
+        ),
+        num_rows="dynamic",
+        hide_index=True,
+    )
+    INITIAL_STATES = {"新砌炉衬(环境温度)": "uniform", "稳态运行(停炉降温)": "steady"}
+    c1, c2 = st.columns(2)
+    with c1:
+        initial_state = st.radio("初始状态", list(INITIAL_STATES), horizontal=True)
+    with c2:
+        time_step = st.number_input("时间步长 (s)", min_value=0.1, value=10.0, step=5.0)
+
+    # 材料表中没有密度数据的材料需要手动输入
+    transient_layers = []
+    for i, layer in enumerate(layers):
+        layer = dict(layer)
+        if np.isnan(MATERIALS.density[MATERIALS.index(layer["material"])]):
+            layer["density"] = st.number_input(
+                f"体积密度 (kg/m³) - 第 {i+1} 层 {layer['material']}",
+                min_value=1.0,
+                value=None,
+                step=100.0,
+            )
+        transient_layers.append(layer)
+
+    schedule = schedule_table.dropna().sort_values("时间(h)").to_numpy(dtype=float)
+    schedule[:, 0] *= 3600
+    transient_args = (
+        transient_layers,
+        schedule.tolist(),
+        T_air,
+        time_step,
+        INITIAL_STATES[initial_state],
+    )
+    if st.button("非稳态计算"):
+        if len(schedule) < 2:
+            st.error("升温曲线至少需要两个点")
+        elif any(layer.get("density", 0) is None for layer in transient_layers):
+            st.error("请输入缺少的材料体积密度")
+        else:
+            st.session_state["transient_args"] = transient_args
+
+    # 计算结果在按钮之外显示，拖动时刻滑块重新运行页面时不会消失；
+    # 输入改变后需重新计算，run_transient已缓存，重复调用直接取结果
+    if st.session_state.get("transient_args") == transient_args:
+        result = run_transient(*transient_args)
+        st.caption(
+            f"共 {result.n_steps} 个时间步，矩阵分解 {result.n_factorizations} 次"
+        )
+        st.plotly_chart(transient_plot(result, layers))
+        hour = st.select_slider(
+            "温度分布时刻 (h)",
+            options=np.round(result.times / 3600, 3).tolist(),
+            value=round(result.times[-1] / 3600, 3),
         )
+        k = int(np.argmin(np.abs(result.times / 3600 - hour)))
+        st.plotly_chart(web_plot(result.positions, result.temps[k], layers))
@@ -1,10 +1,62 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+
+# 坯壳厚度模型位于仓库根目录的 mold_shell.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from mold_shell import (  # noqa: E402
+    MoldParameters,
+    exit_shell_sweep,
+    shell_profile,
+    sqrt_law_thickness,
+    stefan_shell_profile,
+    stefan_shell_sweep,
+)
+
+# 数值解扫描的最大网格点数(每个方向)
+MAX_STEFAN_POINTS = 20
 
 st.set_page_config(layout="wide")
 
+
+@st.cache_data(max_entries=64)
+def compute_profile(params):
+    """缓存的沿程坯壳厚度，相同的输入直接返回上次结果"""
+    return shell_profile(params)
+
+
+@st.cache_data(max_entries=64)
+def compute_stefan_profile(params, T_liquidus, T_solidus):
+    """缓存的一维凝固数值解"""
+    return stefan_shell_profile(params, T_liquidus=T_liquidus, T_solidus=T_solidus)
+
+
+@st.cache_data(max_entries=16)
+def compute_sweep(params, v_range, superheat_range, n_points, stefan=None):
+    """缓存的拉速×过热度扫描，拉速单位m/min；stefan为(液相线, 固相线)时用数值解"""
+    velocities = np.linspace(*v_range, n_points)
+    superheats = np.linspace(*superheat_range, n_points)
+    if stefan is None:
+        exit_shell = exit_shell_sweep(params, velocities / 60, superheats)
+    else:
+        T_liquidus, T_solidus = stefan
+        _, shell = stefan_shell_sweep(
+            params,
+            velocities / 60,
+            superheats,
+            T_liquidus=T_liquidus,
+            T_solidus=T_solidus,
+            n_steps=100,
+        )
+        exit_shell = shell[..., -1]
+    return velocities, superheats, exit_shell
+
+
 # UI
 st.title("连铸结晶器区域钢壳厚度计算")
 cols1, cols2 = st.columns(2, border=True)
@@ -59,6 +111,22 @@ with cols1:
         ck = c2.number_input(
             "结晶器冷却强度（L/（minmm））", min_value=0.0, value=2.0, step=0.2
         )
+        c2.caption("凝固参数（数值解）")
+        T_liquidus = c2.number_input(
+            "液相线温度（℃）", min_value=1000.0, value=1520.0, step=5.0
+        )
+        T_solidus = c2.number_input(
+            "固相线温度（℃）",
+            min_value=1000.0,
+            max_value=T_liquidus - 1.0,
+            value=min(1480.0, T_liquidus - 1.0),
+            step=5.0,
+        )
+        show_stefan = c2.toggle(
+            "显示数值解",
+            value=True,
+            help="一维非稳态凝固焓法计算，表面热流取冷却水带走的平均热流密度",
+        )
     with col3:
         c3 = st.container()
         c3.caption("钢的尺寸参数")
@@ -83,48 +151,40 @@ with cols2:
     st.header("计算结果")
 
     # 数据计算
-    I = 2 * (width + thickness) * ck / 60 / 1000  # m3/s
-
-    def ht(z):
-        return (
-            2
-            / 3
-            * rho
-            * c
-            * lvelocity
-            * (c * mu / steel_lambda) ** (-2 / 3)
-            * (z * lvelocity * rho / mu) ** (-1 / 2)
-        ) * 10
-
-    location = [0]
-    ezdf = [0]
-    htdf = []
-    for z in np.arange(0.05, length + 0.01, 0.01):
-        heat_transfer = ht(z)
-        htdf.append(heat_transfer)
-        heat_transfer_mean = np.mean(htdf)
-        # heat_transfer_mean = 9021
-        ez = (
-            z
-            / rho
-            / L
-            / velocity
-            * (
-                cw * I * rhow / area * waterdelatT
-                - 2 * heat_transfer_mean / 1000 * (deltaT) ** 0.5
-            )
-        )
-        # tolerance = 1e-6
-        # if abs(z - 0.80) < tolerance:
-        #     st.write("x:", round(z, 2), "ht", round(heat_transfer_mean, 2))
-        location.append(z * 100)
-        ezdf.append(round(ez / 2 * 1000, 2))
+    params = MoldParameters(
+        rho=rho,
+        c=c,
+        mu=mu,
+        steel_lambda=steel_lambda,
+        L=L,
+        superheat=deltaT,
+        lvelocity=lvelocity,
+        area=area,
+        length=length,
+        ck=ck,
+        width=width,
+        thickness=thickness,
+        velocity=velocity,
+        water_delta_T=waterdelatT,
+        cw=cw,
+        rhow=rhow,
+    )
+    location, ezdf = compute_profile(params)
     # 数据整理与输出
     data_df = pd.DataFrame(
         {"从弯月面向下的距离（cm）": location, "钢壳厚度（mm）": ezdf}
     )
-    tradition = 20 * (z / velocity / 60) ** 0.5
+    tradition = sqrt_law_thickness(location[-1] / 100, velocity)
     fig = px.line(data_frame=data_df, x="从弯月面向下的距离（cm）", y="钢壳厚度（mm）")
+    if show_stefan:
+        stefan_location, stefan_shell = compute_stefan_profile(
+            params, T_liquidus, T_solidus
+        )
+        fig.data[0].name = "经验公式"
+        fig.data[0].showlegend = True
+        fig.add_scatter(
+            x=stefan_location, y=stefan_shell, mode="lines", name="数值解（焓法）"
+        )
     st.plotly_chart(fig)
     st.write(
         "按照上海宝钢凝固系数与传统凝固平方根定律计算结果，结晶器出口钢壳厚度为：",
@@ -139,6 +199,12 @@ with cols2:
         ),
         "%",
     )
+    if show_stefan:
+        st.write(
+            "一维凝固数值解的结晶器出口钢壳厚度为：",
+            round(float(stefan_shell[-1]), 2),
+            "mm。",
+        )
     with st.popover("查看与下载计算结果", use_container_width=True):
         st.data_editor(
             data_df,
@@ -153,3 +219,41 @@ with cols2:
             hide_index=True,
             num_rows="dynamic",
         )
+
+    st.subheader("出口坯壳厚度：拉速×过热度扫描")
+    sc1, sc2, sc3 = st.columns(3)
+    v_range = sc1.slider("拉坯速度范围（m/min）", 0.3, 3.0, (0.8, 2.0), step=0.1)
+    superheat_range = sc2.slider("过热度范围（℃）", 0.0, 60.0, (10.0, 50.0), step=5.0)
+    n_points = sc3.number_input("网格点数", min_value=5, max_value=400, value=100)
+    sweep_model = st.radio(
+        "计算方法", ["经验公式", "数值解（焓法）"], horizontal=True, key="sweep_model"
+    )
+    if sweep_model == "经验公式":
+        velocities, superheats, exit_shell = compute_sweep(
+            params, v_range, superheat_range, int(n_points)
+        )
+    else:
+        if n_points > MAX_STEFAN_POINTS:
+            st.caption(f"数值解扫描的网格点数限制为 {MAX_STEFAN_POINTS}")
+        velocities, superheats, exit_shell = compute_sweep(
+            params,
+            v_range,
+            superheat_range,
+            min(int(n_points), MAX_STEFAN_POINTS),
+            stefan=(T_liquidus, T_solidus),
+        )
+    sweep_fig = go.Figure(
+        go.Heatmap(
+            x=superheats,
+            y=velocities,
+            z=exit_shell,
+            colorscale="Viridis",
+            colorbar=dict(title="mm"),
+            hovertemplate="过热度: %{x:.1f}℃<br>拉速: %{y:.2f}m/min"
+            "<br>出口坯壳厚度: %{z:.2f}mm<extra></extra>",
+        )
+    )
+    sweep_fig.update_layout(
+        xaxis_title="钢水过热度（℃）", yaxis_title="拉坯速度（m/min）"
+    )
+    st.plotly_chart(sweep_fig)
@@ -1,7 +1,55 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
-import math
 import numpy as np
+import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+# 水滴流速模型位于仓库根目录的 spray_nozzle.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from spray_nozzle import (  # noqa: E402
+    histogram_bins,
+    impact_velocity,
+    mean_velocity,
+    rosin_rammler_bins,
+    sauter_diameter,
+    velocity_grid,
+)
+
+DISTRIBUTIONS = ("单一粒径", "Rosin–Rammler分布", "实测分布")
+# 直径-距离流速图中最多显示的粒径级数
+MAX_FIELD_COLUMNS = 200
+DEFAULT_HISTOGRAM = pd.DataFrame(
+    {
+        "直径（μm）": [50.0, 100.0, 150.0, 200.0, 300.0],
+        "体积分数（%）": [10.0, 25.0, 35.0, 20.0, 10.0],
+    }
+)
+
+
+@st.cache_data(max_entries=32)
+def size_distribution(kind, diameter, spread, n_bins, histogram):
+    """缓存的粒径分布，直径单位μm，返回(d(m), weights)"""
+    if kind == "单一粒径":
+        return np.array([diameter / 1e6]), np.array([1.0])
+    if kind == "Rosin–Rammler分布":
+        return rosin_rammler_bins(diameter / 1e6, spread, n_bins)
+    d, fraction = histogram
+    return histogram_bins(np.asarray(d) / 1e6, fraction)
+
+
+@st.cache_data(max_entries=32)
+def velocity_curves(x, d, weights, Q, props):
+    """缓存的平均流速曲线(nx, nq)和直径-距离流速场(nx, 至多MAX_FIELD_COLUMNS列)"""
+    d_field = d[:: max(len(d) // MAX_FIELD_COLUMNS, 1)]
+    return (
+        mean_velocity(x, d, weights, Q, **props),
+        d_field,
+        velocity_grid(x, d_field, Q[:1], **props)[..., 0],
+    )
+
 
 st.set_page_config(layout="wide")
 st.header("雾化喷嘴出口附近流速计算", divider="rainbow")
@@ -17,39 +65,110 @@ with col1:
     rhowater = con1.number_input(
         "水滴密度 kg/m3", min_value=0.0, value=1000.0, step=100.0
     )
-    diameterdrop = con1.number_input(
-        "水滴直径 μm", min_value=50.0, value=150.0, step=10.0
+    fluxwater = con1.number_input(
+        "喷淋水流量 L/min", min_value=1.0, value=10.0, step=5.0
     )
-    fluxwater = (
-        con1.number_input("喷淋水流量 L/min", min_value=1.0, value=10.0, step=5.0)
-        / 1000
-        / 60
+    extra_flux = con1.multiselect(
+        "对比其他流量 L/min", [2.0, 5.0, 15.0, 20.0, 30.0, 50.0], default=[5.0, 20.0]
     )
     con2 = st.container()
     length = con2.number_input(
-        "需要查看的出口范围", min_value=0.0, value=300.0, step=10.0
+        "需要查看的出口范围 (mm)", min_value=1.0, value=300.0, step=10.0
+    )
+    distance = con2.number_input(
+        "喷嘴至铸坯表面距离 (mm)",
+        min_value=0.0,
+        max_value=length,
+        value=min(200.0, length),
+        step=10.0,
     )
 
+    con3 = st.container()
+    con3.caption("水滴粒径分布")
+    kind = con3.radio("分布类型", DISTRIBUTIONS, index=1)
+    spread, n_bins, histogram = 2.5, 2000, None
+    if kind == "实测分布":
+        table = con3.data_editor(
+            DEFAULT_HISTOGRAM, num_rows="dynamic", hide_index=True, key="histogram"
+        ).dropna()
+        histogram = (
+            tuple(table["直径（μm）"].astype(float)),
+            tuple(table["体积分数（%）"].astype(float)),
+        )
+        diameterdrop = None
+    else:
+        diameterdrop = con3.number_input(
+            "水滴直径 μm" if kind == "单一粒径" else "特征直径 μm",
+            min_value=10.0,
+            value=150.0,
+            step=10.0,
+        )
+    if kind == "Rosin–Rammler分布":
+        spread = con3.number_input(
+            "分布指数 n", min_value=0.5, max_value=10.0, value=2.5, step=0.1
+        )
+        n_bins = con3.number_input(
+            "粒径分级数", min_value=10, max_value=20000, value=2000, step=100
+        )
+
 with col2:
+    try:
+        d, weights = size_distribution(kind, diameterdrop, spread, n_bins, histogram)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
 
-    numbers_location = np.linspace(start=0, stop=length, num=100)
-    locations = numbers_location.tolist()
-    velocitys = []
-    for i in range(len(locations)):
-        velocitys.append(
-            velocity0
-            * math.exp(
-                -0.33
-                * (rhoair / rhowater)
-                * locations[i]
-                / 1000
-                * diameterdrop
-                / 1000000
-                / fluxwater**2
-            )
-        )
+    props = dict(v0=velocity0, rho_air=rhoair, rho_water=rhowater)
+    fluxes = np.array([fluxwater] + sorted(set(extra_flux) - {fluxwater}))
+    Q = fluxes / 1000 / 60
+    locations = np.linspace(start=0, stop=length, num=100)
+    v_mean, d_field, v_field = velocity_curves(locations / 1000, d, weights, Q, props)
+    v_impact = impact_velocity(distance / 1000, d, weights, Q, **props)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("铸坯表面平均撞击速度 (m/s)", f"{v_impact[0]:.3f}")
+    m2.metric("Sauter平均直径 D32 (μm)", f"{sauter_diameter(d, weights) * 1e6:.1f}")
+    m3.metric("粒径分级数", len(d))
 
     fig = px.line()
-    fig.add_scatter(x=locations, y=velocitys, name="流速（m/s）")
-    fig.update_layout(title="出口流速随位置的变化关系(m/s)", height=550)
+    for flux, v in zip(fluxes, v_mean.T):
+        fig.add_scatter(x=locations, y=v, name=f"{flux:g} L/min")
+    fig.add_vline(x=distance, line_dash="dash", annotation_text="铸坯表面")
+    fig.update_layout(
+        title="出口流速随位置的变化关系(m/s，按水流量平均)",
+        xaxis_title="距喷嘴出口距离 (mm)",
+        yaxis_title="流速 (m/s)",
+        height=550,
+    )
     st.plotly_chart(fig)
+
+    if len(d) > 1:
+        c1, c2 = st.columns(2)
+        with c1:
+            field_fig = go.Figure(
+                go.Heatmap(
+                    x=d_field * 1e6,
+                    y=locations,
+                    z=v_field,
+                    colorscale="Viridis",
+                    colorbar=dict(title="m/s"),
+                    hovertemplate="直径: %{x:.0f}μm<br>距离: %{y:.0f}mm"
+                    "<br>流速: %{z:.3f}m/s<extra></extra>",
+                )
+            )
+            field_fig.update_layout(
+                title=f"各粒径水滴的流速({fluxwater:g} L/min)",
+                xaxis_title="水滴直径 (μm)",
+                yaxis_title="距喷嘴出口距离 (mm)",
+            )
+            st.plotly_chart(field_fig)
+        with c2:
+            plot = px.bar if len(d) <= 50 else px.area
+            dist_fig = plot(x=d * 1e6, y=weights * 100)
+            dist_fig.update_layout(
+                title="粒径分布",
+                xaxis_title="水滴直径 (μm)",
+                yaxis_title="体积分数 (%)",
+                bargap=0,
+            )
+            st.plotly_chart(dist_fig)
@@ -1,9 +1,48 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
 import streamlit as st
 
+# 温度场求解相关模块位于 casting_temp_simulation/2_codes
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "casting_temp_simulation" / "2_codes")
+)
+from field_render import add_temperature_field  # noqa: E402
+from run_simulation import steel_summary  # noqa: E402
+from simulation_jobs import (  # noqa: E402
+    ACTIVE_STATES,
+    CANCELLED,
+    DONE,
+    FAILED,
+    INTERRUPTED,
+    JobLimitError,
+    SimulationJobManager,
+)
+from thermal_properties import steel_catalog  # noqa: E402
+
 st.set_page_config(layout="wide")
 st.title("连铸区温度场模拟计算")
 tab1, tab2, tab3 = st.tabs(["🎢工艺及介质参数", "🧰设备参数", "▶️钢物性参数及计算条件"])
 
+
+@st.cache_resource
+def get_job_manager():
+    """所有会话共享的后台计算任务管理器"""
+    return SimulationJobManager(max_workers=2, max_jobs_per_user=1)
+
+
+@st.cache_resource(max_entries=16)
+def field_history(job_id):
+    """任务的温度场历史(按需读取单帧，已读取的块在会话间共享)"""
+    store = get_job_manager().fields(job_id)
+    if store is None:
+        raise FileNotFoundError(job_id)  # 不缓存，任务开始写入后再读取
+    return store
+
+
 with tab1:  # process
     with st.form("工艺及介质参数设置"):
         process_kind = st.selectbox(
@@ -26,12 +65,196 @@ with tab1:  # process
             "拉坯速度 (m/min)", min_value=0.0, value=1.3, step=0.1
         )
         process_casting_convection_fix_K = st.number_input(
-            "结晶器对流换热密度修正系数 ", min_value=0.0, value=1, step=0.1
+            "结晶器对流换热密度修正系数 ", min_value=0.0, value=1.0, step=0.1
         )
 
         submitted = st.form_submit_button("提交")
 # with tab2:
 #     with st.form("设备参数设置"):
 
-# with tab3:
-#     with st.form("钢物性参数及计算条件设置"):
+with tab3:
+    manager = get_job_manager()
+
+    # 用户名和任务ID保存在URL参数中，刷新浏览器后可以重新连接到运行中的任务
+    owner = st.text_input("用户名", value=st.query_params.get("user", ""))
+    if owner:
+        st.query_params["user"] = owner
+
+    col1, col2 = st.columns([3, 7], border=True)
+    with col1:
+        with st.form("钢物性参数及计算条件设置"):
+            grade = st.selectbox("钢号", list(steel_catalog.preset_elements))
+            half_width = st.number_input(
+                "断面半宽 (mm)", min_value=10.0, value=82.5, step=5.0
+            )
+            half_thickness = st.number_input(
+                "断面半厚 (mm)", min_value=10.0, value=82.5, step=5.0
+            )
+            n_grid = st.number_input("网格数", min_value=11, value=61, step=10)
+            h_conv = st.number_input(
+                "对流换热系数 (W/(m²·K))", min_value=0.0, value=100.0, step=10.0
+            )
+            T_inf = st.number_input("环境温度 (℃)", value=10.0, step=5.0)
+            dt = st.number_input(
+                "时间步长 (s)", min_value=0.001, value=0.02, step=0.01, format="%.3f"
+            )
+            total_time = st.number_input(
+                "总模拟时间 (s)", min_value=1.0, value=300.0, step=60.0
+            )
+            start = st.form_submit_button("开始计算", disabled=not owner)
+
+        if start:
+            params = {
+                "Lx": half_width / 1000,
+                "Ly": half_thickness / 1000,
+                "nx": int(n_grid),
+                "ny": int(n_grid),
+                "h_top": h_conv,
+                "h_right": h_conv,
+                "T_inf_top": T_inf,
+                "T_inf_right": T_inf,
+                "dt": dt,
+                "total_time": total_time,
+                "initial_temp": process_casting_temp,
+            }
+            # 按钢号的预设成分和默认公式计算液相线/固相线，随任务保存用于绘制等温线
+            summary = steel_summary(
+                {
+                    "grade": grade,
+                    "kind": process_kind,
+                    "composition": {},
+                    "liquidus_formula": None,
+                    "solidus_formula": None,
+                }
+            )
+            steel = {
+                "grade": grade,
+                "kind": process_kind,
+                "liquid_temp": summary["liquid_temp"],
+                "solid_temp": summary["solid_temp"],
+            }
+            try:
+                st.query_params["job"] = manager.submit(owner, params, steel=steel)
+            except JobLimitError as e:
+                st.warning(str(e))
+
+        if owner:
+            jobs = manager.jobs_for(owner)
+            if jobs:
+                st.caption("我的任务")
+                job_ids = [j["job_id"] for j in jobs]
+                submitted_at = {
+                    j["job_id"]: time.strftime(
+                        "%m-%d %H:%M:%S", time.localtime(j["submitted"])
+                    )
+                    for j in jobs
+                }
+                current = st.query_params.get("job")
+                selected = st.selectbox(
+                    "任务",
+                    job_ids,
+                    index=job_ids.index(current) if current in job_ids else 0,
+                    format_func=lambda j: f"{j} (提交于 {submitted_at[j]})",
+                )
+                st.query_params["job"] = selected
+
+    def job_panel(job_id, status):
+        """显示任务进度、温度场和测点曲线"""
+
+        st.progress(
+            status["progress"],
+            text=f"任务 {job_id}: {status['status']}，"
+            f"模拟时间 {status.get('sim_time', 0):.1f}s",
+        )
+        if status["status"] in ACTIVE_STATES:
+            if st.button("取消任务"):
+                manager.cancel(job_id)
+        elif status["status"] == FAILED:
+            st.error(status.get("error", "计算失败"))
+        elif status["status"] == CANCELLED:
+            st.warning("任务已取消")
+        elif status["status"] == INTERRUPTED:
+            st.warning("任务已中断(服务已重启)，请重新提交")
+
+        try:
+            store = field_history(job_id)
+        except FileNotFoundError:
+            store = None
+        # 写入方关闭时才写出最后不满一块的帧并标记完成，以存储本身的状态为准
+        if store is not None and not store.complete:
+            store.refresh()
+
+        params = manager.params(job_id)
+        if store is not None and store.n_frames and status["status"] == DONE:
+            # 计算完成后可以回看任意时刻，只读取所选的一帧
+            times = store.times
+            k = st.select_slider(
+                "时刻",
+                options=range(store.n_frames),
+                value=store.n_frames - 1,
+                format_func=lambda i: f"{times[i]:.1f} s",
+                key=f"frame_{job_id}",
+            )
+            field, title = store.frame(k), f"温度场 (t={times[k]:.1f}s)"
+        else:
+            field = manager.snapshot(job_id)
+            title = "最终温度场" if status["status"] == DONE else "当前温度场"
+            times, k = None, None
+        if field is not None and params is not None:
+            steel = manager.steel(job_id) or {}
+            isotherms = {
+                label: steel[key]
+                for label, key in (("液相线", "liquid_temp"), ("固相线", "solid_temp"))
+                if steel.get(key) is not None
+            }
+            # 温度场为1/4断面，降采样并镜像后以图像形式显示
+            fig = add_temperature_field(
+                go.Figure(),
+                field,
+                np.linspace(0, params["Lx"], field.shape[1]),
+                np.linspace(0, params["Ly"], field.shape[0]),
+                isotherms=isotherms,
+            )
+            fig.update_layout(title=title, height=500)
+            st.plotly_chart(fig, use_container_width=True)
+
+        if store is not None:
+            t, probes = store.probe_series()
+            if len(t):
+                probe_fig = go.Figure(
+                    [go.Scatter(x=t, y=v, name=name) for name, v in probes.items()]
+                )
+                if times is not None:
+                    probe_fig.add_vline(x=times[k], line_dash="dash")
+                probe_fig.update_layout(
+                    title="测点温度",
+                    xaxis_title="时间 (s)",
+                    yaxis_title="温度 (℃)",
+                    height=350,
+                )
+                st.plotly_chart(probe_fig, use_container_width=True)
+
+    @st.fragment(run_every=1.0)
+    def live_job_panel(job_id):
+        """计算进行中每秒刷新本片段；任务结束后整页重跑，改为不再轮询的面板"""
+        status = manager.status(job_id)
+        if status is None or status["status"] not in ACTIVE_STATES:
+            st.rerun()
+        job_panel(job_id, status)
+
+    @st.fragment
+    def finished_job_panel(job_id, status):
+        """已结束的任务: 只在操作时间滑块时重跑"""
+        job_panel(job_id, status)
+
+    with col2:
+        job_id = st.query_params.get("job")
+        status = manager.status(job_id) if job_id else None
+        if not job_id:
+            st.info("请输入用户名并提交计算任务")
+        elif status is None:
+            st.warning(f"任务 {job_id} 不存在")
+        elif status["status"] in ACTIVE_STATES:
+            live_job_panel(job_id)
+        else:
+            finished_job_panel(job_id, status)
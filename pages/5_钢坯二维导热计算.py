@@ -1,118 +1,206 @@
-import streamlit as st
+import sys
+from pathlib import Path
+
 import numpy as np
+import streamlit as st
 import plotly.graph_objects as go
-from scipy.integrate import solve_ivp
 
-# 设置页面标题
-st.title("钢坯二维导热计算")
+# 线法求解器位于仓库根目录的 billet_conduction.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from billet_conduction import (  # noqa: E402
+    DEFAULT_MEMORY_BUDGET_MB,
+    METHODS,
+    display_frames,
+)
+from billet_cache import BilletCache  # noqa: E402
 
-# 定义材料的热物理参数
-# 导热系数 (W/(m·K))
-k = 40.0
-# 比热容 (J/(kg·K))
-c = 450.0
-# 密度 (kg/m^3)
-rho = 7800.0
-
-# 定义计算区域的尺寸
-# X方向长度 (m)
-Lx = 0.5
-# Y方向长度 (m)
-Ly = 0.5
-
-# 定义网格划分
-# X方向网格数
-Nx = 250
-# Y方向网格数
-Ny = 250
-
-# 定义时间步长和总时间
-# 时间步长 (s)
-dt = 0.1
-# 总时间 (s)
-total_time = 1000.0
-
-# 定义初始温度分布
-# 初始温度 (K)
-initial_temperature = 300.0
-
-# 定义边界条件
-# 左边界温度 (K)
-left_boundary_temperature = 1000.0
-# 右边界温度 (K)
-right_boundary_temperature = 300.0
-# 上边界温度 (K)
-top_boundary_temperature = 1000.0
-# 下边界温度 (K)
-bottom_boundary_temperature = 300.0
-
-# 定义空间步长
-# X方向空间步长 (m)
-dx = Lx / (Nx - 1)
-# Y方向空间步长 (m)
-dy = Ly / (Ny - 1)
-
-# 定义热扩散系数
-alpha = k / (rho * c)
-
-# 定义初始温度场
-T = np.full((Ny, Nx), initial_temperature)
-
-
-# 定义边界条件函数
-def apply_boundary_conditions(T):
-    """
-    应用边界条件到温度场
-    """
-    T[:, 0] = left_boundary_temperature
-    T[:, -1] = right_boundary_temperature
-    T[0, :] = top_boundary_temperature
-    T[-1, :] = bottom_boundary_temperature
 
+@st.cache_resource
+def billet_cache():
+    """进程内共享的结果缓存(温度帧保存在磁盘上，跨重跑和重启复用)"""
+    return BilletCache()
 
-# 应用初始边界条件
-apply_boundary_conditions(T)
 
+def run_billet(params):
+    """按参数缓存的二维导热计算，相同的输入直接返回上次结果"""
+    cache = billet_cache()
+    if cache.get(params) is not None:
+        return cache.solve(params)
+    with st.spinner("正在求解二维导热方程…"):
+        return cache.solve(params)
 
-# 定义微分方程右侧函数
-def heat_equation(t, T_flat):
-    """
-    二维导热方程的右侧函数
-    """
-    T = T_flat.reshape((Ny, Nx))
-    T_new = T.copy()
-
-    for i in range(1, Ny - 1):
-        for j in range(1, Nx - 1):
-            T_new[i, j] = (
-                T[i, j]
-                + alpha * dt / dx**2 * (T[i, j + 1] - 2 * T[i, j] + T[i, j - 1])
-                + alpha * dt / dy**2 * (T[i + 1, j] - 2 * T[i, j] + T[i - 1, j])
-            )
 
-    apply_boundary_conditions(T_new)
-    return T_new.flatten()
+@st.cache_data(max_entries=8)
+def animation_figure(params, max_points, max_frames):
+    """
+    温度场动画(全部帧一次发送到浏览器，播放时服务端不参与)
 
+    参数:
+        params (tuple): 计算参数
+        max_points (int): 每个方向的最大显示点数
+        max_frames (int): 最大帧数
 
-# 定义时间点数组
-t_eval = np.arange(0, total_time + dt, dt)
+    返回:
+        plotly.graph_objects.Figure: 带播放按钮和时间滑块的热图动画
+    """
+    times, x, y, frames, zmin, zmax = display_frames(
+        run_billet(params), max_points, max_frames
+    )
+    heatmap = dict(
+        x=x,
+        y=y,
+        zmin=zmin,
+        zmax=zmax,
+        colorscale="hot",
+        colorbar=dict(title="K"),
+        hovertemplate="X: %{x:.3f} m<br>Y: %{y:.3f} m<br>T: %{z} K<extra></extra>",
+    )
+    fig = go.Figure(
+        data=[go.Heatmap(z=frames[-1], **heatmap)],
+        frames=[
+            go.Frame(data=[go.Heatmap(z=f)], name=f"{t:.1f}")
+            for t, f in zip(times, frames)
+        ],
+    )
+    play = dict(frame=dict(duration=100, redraw=True), transition=dict(duration=0))
+    fig.update_layout(
+        title="温度场随时间的变化",
+        xaxis_title="X (m)",
+        yaxis_title="Y (m)",
+        yaxis=dict(scaleanchor="x", scaleratio=1, autorange="reversed"),
+        height=700,
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="left",
+                x=0,
+                y=-0.08,
+                xanchor="left",
+                yanchor="top",
+                buttons=[
+                    dict(
+                        label="▶ 播放",
+                        method="animate",
+                        args=[None, dict(play, fromcurrent=True)],
+                    ),
+                    dict(
+                        label="⏸ 暂停",
+                        method="animate",
+                        args=[[None], dict(play, mode="immediate")],
+                    ),
+                ],
+            )
+        ],
+        sliders=[
+            dict(
+                active=len(times) - 1,
+                x=0.15,
+                len=0.85,
+                y=-0.05,
+                currentvalue=dict(prefix="时间 (s): "),
+                steps=[
+                    dict(
+                        label=f"{t:.1f}",
+                        method="animate",
+                        args=[[f"{t:.1f}"], dict(play, mode="immediate")],
+                    )
+                    for t in times
+                ],
+            )
+        ],
+    )
+    return fig
 
-# 使用solve_ivp求解微分方程
-sol = solve_ivp(heat_equation, [0, total_time], T.flatten(), t_eval=t_eval)
 
-# 创建初始 plotly 图形
-fig = go.Figure(data=[go.Heatmap(z=sol.y[:, 0].reshape((Ny, Nx)), colorscale="hot")])
-fig.update_layout(
-    title="时间: 0.00 s",
-    xaxis_title="X (m)",
-    yaxis_title="Y (m)",
-    yaxis=dict(scaleanchor="x", scaleratio=1),
-)
+# 设置页面标题
+st.set_page_config(layout="wide")
+st.title("钢坯二维导热计算")
 
-# 可视化结果
-placeholder = st.empty()
-for i, t in enumerate(t_eval):
-    with placeholder.container():
-        fig.data[0].z = sol.y[:, i].reshape((Ny, Nx))
-        fig.update_layout(title=f"时间: {t:.2f} s")
-        st.plotly_chart(fig, use_container_width=True)
+col1, col2 = st.columns([1, 3], border=True)
+with col1:
+    st.caption("材料的热物理参数")
+    # 导热系数 (W/(m·K))、比热容 (J/(kg·K))、密度 (kg/m^3)
+    k = st.number_input("导热系数 (W/(m·K))", min_value=0.1, value=40.0)
+    c = st.number_input("比热容 (J/(kg·K))", min_value=1.0, value=450.0)
+    rho = st.number_input("密度 (kg/m³)", min_value=1.0, value=7800.0)
+
+    st.caption("计算区域与网格")
+    Lx = st.number_input("X方向长度 (m)", min_value=0.01, value=0.5)
+    Ly = st.number_input("Y方向长度 (m)", min_value=0.01, value=0.5)
+    Nx = st.number_input("X方向节点数", min_value=3, max_value=400, value=250)
+    Ny = st.number_input("Y方向节点数", min_value=3, max_value=400, value=250)
+
+    st.caption("时间")
+    total_time = st.number_input("总时间 (s)", min_value=1.0, value=1000.0)
+    output_interval = st.number_input(
+        "输出间隔 (s)", min_value=0.1, value=10.0, help="积分步长由求解器自动控制"
+    )
+    method = st.selectbox("积分方法", list(METHODS))
+    memory_budget_mb = st.number_input(
+        "结果内存上限 (MB)",
+        min_value=1.0,
+        value=DEFAULT_MEMORY_BUDGET_MB,
+        step=64.0,
+        help="输出帧数超过上限时自动加大输出间隔",
+    )
+
+    st.caption("初始与边界温度 (K)")
+    initial_temperature = st.number_input("初始温度", value=300.0)
+    left = st.number_input("左边界温度", value=1000.0)
+    right = st.number_input("右边界温度", value=300.0)
+    top = st.number_input("上边界温度", value=1000.0)
+    bottom = st.number_input("下边界温度", value=300.0)
+
+with col2:
+    params = dict(
+        k=k,
+        c=c,
+        rho=rho,
+        Lx=Lx,
+        Ly=Ly,
+        Nx=int(Nx),
+        Ny=int(Ny),
+        total_time=total_time,
+        initial_temperature=initial_temperature,
+        left=left,
+        right=right,
+        top=top,
+        bottom=bottom,
+        output_interval=output_interval,
+        method=method,
+        memory_budget_mb=memory_budget_mb,
+    )
+    try:
+        result = run_billet(tuple(params.items()))
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    if result.decimated:
+        st.warning(
+            f"输出帧数超过内存上限，已改为每 {result.times[1]:.2f} s 输出一帧"
+            f"(共 {len(result.times)} 帧)"
+        )
+
+    # 可视化结果: 降采样、量化后一次发送，浏览器端播放
+    max_points = st.slider("显示分辨率", 20, 250, 100, step=10)
+    max_frames = st.slider("动画帧数", 10, 300, 100, step=10)
+    fig = animation_figure(tuple(params.items()), max_points, max_frames)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"内部节点 {(result.x.size - 2) * (result.y.size - 2)} 个，"
+        f"积分 {result.n_steps} 步，右端函数调用 {result.nfev} 次，"
+        f"稀疏LU分解 {result.nlu} 次，结果占用 {result.temps.nbytes / 2**20:.1f} MB"
+    )
+
+with col1:
+    cache = billet_cache()
+    n_cached, cached_bytes = cache.disk_usage()
+    st.caption(
+        f"结果缓存：{n_cached} 组，{cached_bytes / 2**20:.1f} / "
+        f"{cache.max_bytes / 2**20:.0f} MB(超出时淘汰最久未使用的结果)"
+    )
+    if st.button("清空结果缓存"):
+        cache.clear()
+        animation_figure.clear()
+        st.rerun()
@@ -0,0 +1,253 @@
+"""
+多层圆筒壁稳态导热计算(钢包、中间包及水口内衬)
+
+与平壁求解器使用相同的层结构和材料表，径向坐标下:
+
+- λ = a + bT 的材料: 单位长度热流 Q' 沿半径不变，由Kirchhoff变换
+  Φ(T2) = Φ(T1) - Q'·ln(r2/r1)/(2π) 逐层解析求出温度，只需对外表面
+  热流密度求根；
+- 非线性材料: 守恒型差分格式，各边热流乘以该处半径与外半径之比，
+  用三对角牛顿迭代求解。
+
+内衬较厚时(厚度与内半径相当)，按平壁计算会明显高估或低估热损失。
+"""
+
+import numpy as np
+from scipy.optimize import brentq
+
+from multilayer_wall import (
+    MATERIALS,
+    _exterior_h,
+    _exterior_h_array,
+    _kirchhoff_temperature,
+    _result_data,
+    bisect_increasing,
+    check_boundary_temperatures,
+    layer_linear_coefficients,
+    newton_banded,
+    node_layer_index,
+    wall_residual,
+)
+
+
+def _layer_radii(r_inner, thickness):
+    """各层内、外半径"""
+    edges = r_inner + np.concatenate(([0.0], np.cumsum(thickness)))
+    return edges[:-1], edges[1:]
+
+
+def _cylinder_result(layers, interface_temps, q_surface, R):
+    """结果数据结构，附加单位长度热流"""
+    result_data = _result_data(layers, interface_temps, q_surface)
+    result_data["线热流密度(W/m)"] = round(float(2 * np.pi * R * q_surface), 1)
+    return result_data
+
+
+def cylinder_analytic_solver(T_in, T_amb, r_inner, layers, dx=0.001, coefs=None):
+    """
+    线性λ多层圆筒壁的解析求解器
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        r_inner (float): 内半径(m)
+        layers (list): 层结构列表(由内向外)，各层材料须满足 λ = a + bT
+        dx (float): 输出温度分布的径向步长(m)
+        coefs (np.ndarray): 可选，各层[a, b]系数，默认由材料表得到
+
+    返回:
+        tuple: (temps, positions, result_data)
+            - temps: 温度分布数组(℃)
+            - positions: 距内壁的距离(m)
+            - result_data: 同平壁结果，热流密度为外表面值，另含线热流密度
+
+    说明:
+        - 对外表面热流密度q求根(brentq)，使外壁对流传热等于q
+    """
+    if coefs is None:
+        coefs = layer_linear_coefficients(layers)
+        if coefs is None:
+            raise ValueError("存在热导率非线性的材料，无法使用解析解")
+    check_boundary_temperatures(T_in, T_amb)
+    thickness = np.array([layer["thickness"] for layer in layers], dtype=float)
+    r_in, r_out = _layer_radii(r_inner, thickness)
+    R = r_out[-1]
+    log_ratio = np.log(r_out / r_in)
+
+    def interface_temps(q):
+        temps = []
+        T = T_in
+        for (a, b), lr in zip(coefs, log_ratio):
+            T = float(_kirchhoff_temperature(T, q * R * lr, a, b))
+            temps.append(T)
+        return temps
+
+    def boundary_residual(q):
+        T_wall = interface_temps(q)[-1]
+        h, _ = _exterior_h(T_wall, T_amb)
+        return q - h * (T_wall - T_amb)
+
+    if T_in == T_amb:
+        q = 0.0
+    else:
+        q_hi = max(T_in - T_amb, 1.0) * 10.0
+        while boundary_residual(q_hi) < 0:
+            q_hi *= 4
+        q = brentq(boundary_residual, 0.0, q_hi, xtol=1e-10, rtol=1e-12)
+    T_interfaces = interface_temps(q)
+
+    n_nodes = len(node_layer_index(layers, dx))
+    positions = np.linspace(0, thickness.sum(), n_nodes)
+    layer_idx = np.minimum(
+        np.searchsorted(np.cumsum(thickness), positions, side="right"), len(layers) - 1
+    )
+    T_hot = np.array([T_in] + T_interfaces[:-1])
+    temps = _kirchhoff_temperature(
+        T_hot[layer_idx],
+        q * R * np.log((r_inner + positions) / r_in[layer_idx]),
+        coefs[layer_idx, 0],
+        coefs[layer_idx, 1],
+    )
+
+    if np.any(temps < T_amb - 5):
+        raise ValueError("温度计算结果出现非物理值，请检查材料参数或边界条件")
+
+    return temps, positions, _cylinder_result(layers, T_interfaces, q, R)
+
+
+def cylinder_numerical_solver(T_in, T_amb, r_inner, layers, dx=0.001, tol=1e-6):
+    """
+    多层圆筒壁的有限差分求解器
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        r_inner (float): 内半径(m)
+        layers (list): 层结构列表(由内向外)
+        dx (float): 径向步长(m)
+        tol (float): 牛顿迭代的相对收敛容差
+
+    返回:
+        tuple: (temps, positions, result_data)，同cylinder_analytic_solver
+    """
+    n_nodes = len(node_layer_index(layers, dx))
+    total = sum(layer["thickness"] for layer in layers)
+    positions = np.linspace(0, total, n_nodes)
+    R = r_inner + total
+    # 各边(节点e与e+1之间)的传热面积与外表面积之比
+    edge_weight = (r_inner + 0.5 * (positions[:-1] + positions[1:])) / R
+
+    T = np.linspace(T_in, max(T_amb + 50, 100), n_nodes)
+    T = np.clip(T, T_amb + 20, None)
+    temps = newton_banded(
+        lambda T: wall_residual(
+            T, T_in, T_amb, layers, dx, jacobian=True, edge_weight=edge_weight
+        ),
+        T,
+        tol,
+    )
+    if np.any(temps < T_amb - 5):
+        raise ValueError("温度计算结果出现非物理值，请检查材料参数或边界条件")
+
+    h, _ = _exterior_h(temps[-1], T_amb)
+    q = h * (temps[-1] - T_amb)
+    boundaries = np.cumsum([layer["thickness"] for layer in layers])
+    indices = np.minimum(np.round(boundaries / dx).astype(int), n_nodes - 1)
+    return temps, positions, _cylinder_result(layers, temps[indices], q, R)
+
+
+def solve_cylinder(T_in, T_amb, r_inner, layers, dx=0.001, mode="auto"):
+    """
+    多层圆筒壁求解入口
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        r_inner (float): 内半径(m)
+        layers (list): 层结构列表(由内向外)
+        dx (float): 径向步长(m)
+        mode (str): "auto" 全部为线性材料时用解析解，否则用数值解；
+            "numerical" 始终用有限差分数值解
+
+    返回:
+        tuple: (temps, positions, result_data, method)
+    """
+    if mode not in ("auto", "numerical"):
+        raise ValueError(f"未知的求解方式: {mode}")
+    if r_inner <= 0:
+        raise ValueError("内半径必须大于0")
+    check_boundary_temperatures(T_in, T_amb)
+    coefs = layer_linear_coefficients(layers) if mode == "auto" else None
+    if coefs is not None:
+        return (
+            *cylinder_analytic_solver(T_in, T_amb, r_inner, layers, dx, coefs),
+            "analytic",
+        )
+    return (*cylinder_numerical_solver(T_in, T_amb, r_inner, layers, dx), "numerical")
+
+
+def solve_cylinder_batch(T_in, T_amb, r_inner, mat_idx, thickness):
+    """
+    批量求解多层圆筒壁(不同内半径、材料和厚度组合)
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        r_inner (np.ndarray): 内半径(m)，形状(N,)
+        mat_idx (np.ndarray): 材料索引，形状(N, n_layers)
+        thickness (np.ndarray): 厚度(m)，形状(N, n_layers)
+
+    返回:
+        tuple: (q_surface, q_line, interface_temps)
+            - q_surface: 外表面热流密度(W/m²)，形状(N,)
+            - q_line: 单位长度热流(W/m)，形状(N,)
+            - interface_temps: 各层外侧温度(℃)，形状(N, n_layers)
+
+    说明:
+        - 线性材料的组合一次性向量化求解，非线性材料的组合逐个调用数值解
+    """
+    r_inner = np.broadcast_to(np.asarray(r_inner, dtype=float), (len(thickness),))
+    edges = r_inner[:, None] + np.concatenate(
+        (np.zeros((len(thickness), 1)), np.cumsum(thickness, axis=1)), axis=1
+    )
+    R = edges[:, -1]
+    log_ratio = np.log(edges[:, 1:] / edges[:, :-1])
+
+    coefs = MATERIALS.coefs[mat_idx]
+    factor = MATERIALS.default_factor[mat_idx]
+    linear = np.all(coefs[..., :-2] == 0, axis=(1, 2))
+
+    q = np.empty(len(thickness))
+    temps = np.empty_like(thickness, dtype=float)
+    if linear.any():
+        a = coefs[linear][..., -1] * factor[linear]
+        b = coefs[linear][..., -2] * factor[linear]
+        scale = R[linear, None] * log_ratio[linear]
+
+        def chain(q_s):
+            out = np.empty_like(scale)
+            T = np.full(len(q_s), float(T_in))
+            for j in range(scale.shape[1]):
+                T = _kirchhoff_temperature(T, q_s * scale[:, j], a[:, j], b[:, j])
+                out[:, j] = T
+            return out
+
+        def residual(q_s):
+            T_wall = chain(q_s)[:, -1]
+            return q_s - _exterior_h_array(T_wall, T_amb) * (T_wall - T_amb)
+
+        q[linear] = bisect_increasing(
+            residual, int(linear.sum()), max(T_in - T_amb, 1.0) * 10.0
+        )
+        temps[linear] = chain(q[linear])
+
+    for i in np.flatnonzero(~linear):
+        layers = [
+            {"thickness": float(t), "material": MATERIALS.names[j]}
+            for j, t in zip(mat_idx[i], thickness[i])
+        ]
+        _, _, result = cylinder_numerical_solver(T_in, T_amb, r_inner[i], layers)
+        q[i] = result["热流密度(W/m²)"]
+        temps[i] = result["界面温度(℃)"]
+
+    return q, 2 * np.pi * R * q, temps
@@ -0,0 +1,274 @@
+"""
+多层平壁内衬厚度优化
+
+给定每层的候选材料和厚度范围，枚举所有组合并批量求解稳态温度场，
+筛选出冷面温度不超过目标值、各层热面温度不超过最高使用温度的方案，
+返回 总厚度(或重量、成本) - 热损失 的Pareto前沿。
+
+所有材料均为 λ = a + bT 时，每个方案的温度场由Kirchhoff变换解析给出，
+只需对热流密度q求根；这里对全部方案同时做向量化二分，上万个方案
+也只需几十次数组运算。存在非线性材料时逐个调用数值解。
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from multilayer_wall import (
+    MATERIALS,
+    _exterior_h_array,
+    _kirchhoff_temperature,
+    bisect_increasing,
+    solve_wall,
+)
+
+# 目标函数: 总厚度(mm)、面密度(kg/m²)、成本(元/m²)
+OBJECTIVES = ("thickness", "weight", "cost")
+MAX_CANDIDATES = 500_000
+
+
+@dataclass
+class OptimizationResult:
+    """
+    优化结果
+
+    属性:
+        materials: 各方案各层的材料名称，形状(N, n_layers)
+        thickness: 各方案各层厚度(m)，形状(N, n_layers)
+        heat_flux: 热流密度(W/m²)，形状(N,)
+        interface_temps: 各层冷端温度(℃)，形状(N, n_layers)，最后一列为冷面温度
+        feasible: 是否满足冷面温度和最高使用温度约束，形状(N,)
+        objective: 目标函数值，形状(N,)，无法计算(如缺少密度)时为NaN
+        pareto: Pareto前沿上的方案索引(按目标函数值升序)，不含目标函数值
+            为NaN的方案
+        missing: 因缺少密度而无法计算目标函数值的材料名称
+    """
+
+    materials: np.ndarray
+    thickness: np.ndarray
+    heat_flux: np.ndarray
+    interface_temps: np.ndarray
+    feasible: np.ndarray
+    objective: np.ndarray
+    pareto: np.ndarray
+    missing: tuple = ()
+
+
+def _thickness_grid(spec):
+    """某层的候选厚度(m)"""
+    t_min, t_max = spec["thickness_range"]
+    step = spec.get("step", 0.01)
+    return np.arange(t_min, t_max + step * 0.5, step)
+
+
+def enumerate_stacks(layer_specs):
+    """
+    枚举全部候选方案
+
+    参数:
+        layer_specs (list): 每层一个字典，包含:
+            - materials: 候选材料名称列表
+            - thickness_range: (最小厚度, 最大厚度)(m)
+            - step: 可选，厚度步长(m)，默认0.01
+
+    返回:
+        tuple: (mat_idx, thickness)，形状均为(N, n_layers)
+    """
+    per_layer = []
+    n_total = 1
+    for spec in layer_specs:
+        mats = MATERIALS.index(spec["materials"])
+        grid = _thickness_grid(spec)
+        per_layer.append((mats, grid))
+        n_total *= len(mats) * len(grid)
+    if n_total > MAX_CANDIDATES:
+        raise ValueError(f"候选方案数 {n_total} 超过上限 {MAX_CANDIDATES}，请缩小范围")
+
+    axes = []
+    for mats, grid in per_layer:
+        axes += [mats, grid]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    mat_idx = np.stack([m.ravel() for m in mesh[0::2]], axis=1).astype(np.intp)
+    thickness = np.stack([t.ravel() for t in mesh[1::2]], axis=1)
+    return mat_idx, thickness
+
+
+def _chain_batch(q, T_in, a, b, thickness):
+    """批量计算各层冷端温度，返回形状(N, n_layers)"""
+    temps = np.empty_like(thickness)
+    T = np.full(len(q), float(T_in))
+    for j in range(thickness.shape[1]):
+        T = _kirchhoff_temperature(T, q * thickness[:, j], a[:, j], b[:, j])
+        temps[:, j] = T
+    return temps
+
+
+def solve_linear_batch(T_in, T_amb, a, b, thickness, rtol=1e-10, max_iter=200):
+    """
+    批量求解线性λ多层平壁
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        a, b (np.ndarray): 各方案各层 λ = a + bT 的系数(已含修正系数)，形状(N, n_layers)
+        thickness (np.ndarray): 各方案各层厚度(m)，形状(N, n_layers)
+        rtol (float): 热流密度的相对容差
+        max_iter (int): 最大二分次数
+
+    返回:
+        tuple: (q, interface_temps)
+
+    说明:
+        - 外边界残差 q - h(Tw)(Tw - T_amb) 随q单调递增，q=0时为负，
+          对所有方案同时二分求根
+    """
+
+    def residual(q):
+        T_wall = _chain_batch(q, T_in, a, b, thickness)[:, -1]
+        return q - _exterior_h_array(T_wall, T_amb) * (T_wall - T_amb)
+
+    q = bisect_increasing(
+        residual, len(thickness), max(T_in - T_amb, 1.0) * 10.0, rtol, max_iter
+    )
+    return q, _chain_batch(q, T_in, a, b, thickness)
+
+
+@lru_cache(maxsize=4096)
+def _solve_stack_numerical(T_in, T_amb, materials, thickness):
+    """非线性材料方案的数值解(结果按方案缓存)"""
+    layers = [{"thickness": t, "material": m} for m, t in zip(materials, thickness)]
+    _, _, result, _ = solve_wall(T_in, T_amb, layers, mode="numerical")
+    return result["热流密度(W/m²)"], tuple(result["界面温度(℃)"])
+
+
+def evaluate_stacks(T_in, T_amb, mat_idx, thickness):
+    """
+    批量计算候选方案的热流密度和界面温度
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        mat_idx (np.ndarray): 材料索引，形状(N, n_layers)
+        thickness (np.ndarray): 厚度(m)，形状(N, n_layers)
+
+    返回:
+        tuple: (q, interface_temps)
+
+    说明:
+        - 相同的方案(材料与厚度均相同)只计算一次
+    """
+    key = np.concatenate((mat_idx.astype(float), np.round(thickness, 9)), axis=1)
+    unique, inverse = np.unique(key, axis=0, return_inverse=True)
+    n_layers = mat_idx.shape[1]
+    u_idx = unique[:, :n_layers].astype(np.intp)
+    u_thk = unique[:, n_layers:]
+
+    coefs = MATERIALS.coefs[u_idx]
+    factor = MATERIALS.default_factor[u_idx]
+    linear = np.all(coefs[..., :-2] == 0, axis=(1, 2))
+
+    q = np.empty(len(unique))
+    temps = np.empty_like(u_thk)
+    if linear.any():
+        b = coefs[linear][..., -2] * factor[linear]
+        a = coefs[linear][..., -1] * factor[linear]
+        q[linear], temps[linear] = solve_linear_batch(T_in, T_amb, a, b, u_thk[linear])
+    for i in np.flatnonzero(~linear):
+        q[i], temps[i] = _solve_stack_numerical(
+            float(T_in),
+            float(T_amb),
+            tuple(MATERIALS.names[j] for j in u_idx[i]),
+            tuple(float(t) for t in u_thk[i]),
+        )
+    inverse = inverse.ravel()
+    return q[inverse], temps[inverse]
+
+
+def pareto_front(objective, heat_flux, mask=None):
+    """
+    两目标(均为越小越好)的Pareto前沿
+
+    参数:
+        objective (np.ndarray): 目标函数值
+        heat_flux (np.ndarray): 热流密度
+        mask (np.ndarray): 可选，参与比较的方案
+
+    返回:
+        np.ndarray: 前沿上的方案索引，按目标函数值升序
+    """
+    candidates = np.arange(len(objective))
+    if mask is not None:
+        candidates = candidates[mask]
+    order = candidates[np.lexsort((heat_flux[candidates], objective[candidates]))]
+    q_sorted = heat_flux[order]
+    running_min = np.minimum.accumulate(q_sorted)
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = q_sorted[1:] < running_min[:-1]
+    return order[keep]
+
+
+def optimize_lining(
+    T_in,
+    T_amb,
+    layer_specs,
+    T_cold_max,
+    objective="thickness",
+    unit_costs=None,
+):
+    """
+    内衬厚度优化
+
+    参数:
+        T_in (float): 内壁温度(℃)
+        T_amb (float): 环境空气温度(℃)
+        layer_specs (list): 每层的候选材料与厚度范围，见enumerate_stacks
+        T_cold_max (float): 冷面(外壁)温度上限(℃)
+        objective (str): "thickness" 总厚度(mm)，"weight" 面密度(kg/m²)，
+            "cost" 成本(元/m²)
+        unit_costs (dict): objective为"cost"时各材料的单价(元/m³)
+
+    返回:
+        OptimizationResult: 全部方案的计算结果及可行方案的Pareto前沿
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"未知的目标函数: {objective}，可选 {OBJECTIVES}")
+
+    mat_idx, thickness = enumerate_stacks(layer_specs)
+    q, temps = evaluate_stacks(T_in, T_amb, mat_idx, thickness)
+
+    # 各层热面温度不超过最高使用温度(未规定时不限制)
+    hot_faces = np.concatenate((np.full((len(q), 1), float(T_in)), temps[:, :-1]), 1)
+    T_max = MATERIALS.T_max[mat_idx]
+    feasible = (temps[:, -1] <= T_cold_max) & np.all(
+        np.isnan(T_max) | (hot_faces <= T_max), axis=1
+    )
+
+    missing = ()
+    if objective == "thickness":
+        value = thickness.sum(axis=1) * 1000
+    elif objective == "weight":
+        # 缺少密度的材料不能按0计入，否则含这类材料的方案会“最轻”；
+        # 这样的方案重量为NaN，不参与Pareto前沿
+        density = MATERIALS.density[mat_idx]
+        value = np.where(thickness > 0, density * thickness, 0.0).sum(axis=1)
+        used = np.unique(mat_idx[thickness > 0])
+        missing = tuple(
+            MATERIALS.names[i] for i in used if np.isnan(MATERIALS.density[i])
+        )
+    else:
+        costs = np.array(
+            [(unit_costs or {}).get(name, 0.0) for name in MATERIALS.names]
+        )
+        value = (costs[mat_idx] * thickness).sum(axis=1)
+
+    return OptimizationResult(
+        materials=np.asarray(MATERIALS.names, dtype=object)[mat_idx],
+        thickness=thickness,
+        heat_flux=q,
+        interface_temps=temps,
+        feasible=feasible,
+        objective=value,
+        pareto=pareto_front(value, q, feasible & ~np.isnan(value)),
+        missing=missing,
+    )
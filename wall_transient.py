@@ -0,0 +1,251 @@
+"""
+多层平壁非稳态导热计算(烘炉升温、停炉降温)
+
+与稳态求解器使用相同的层结构、材料表和离散方式(守恒型差分，层界面处
+热导率取调和平均)，热面温度按给定的升温/降温曲线变化，冷面为对流边界。
+
+时间离散采用全隐式格式，热导率和对流换热系数取上一时间步的值，每步只需
+求解一个三对角方程组。三对角矩阵用LAPACK的dgttrf分解后缓存，物性变化
+不超过给定的相对容差时直接用dgttrs回代，不重新分解。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg.lapack import dgttrf, dgttrs
+
+from multilayer_wall import (
+    MATERIALS,
+    _exterior_h,
+    _layer_factors,
+    corrected_solver,
+    node_layer_index,
+)
+
+
+@dataclass
+class TransientResult:
+    """
+    非稳态计算结果
+
+    属性:
+        times: 输出时刻(s)
+        positions: 节点坐标(m)
+        temps: 各输出时刻的温度分布(℃)，形状(n_out, n_nodes)
+        q_in: 热面热流密度(W/m²)
+        q_out: 冷面散热热流密度(W/m²)
+        n_factorizations: 三对角矩阵分解次数
+        n_steps: 时间步数
+    """
+
+    times: np.ndarray
+    positions: np.ndarray
+    temps: np.ndarray
+    q_in: np.ndarray
+    q_out: np.ndarray
+    n_factorizations: int
+    n_steps: int
+
+
+def hot_face_temperature(schedule, t):
+    """
+    按升温/降温曲线插值得到热面温度
+
+    参数:
+        schedule (list): [(时间(s), 温度(℃)), ...]，时间递增
+        t (float 或 np.ndarray): 时刻(s)
+
+    返回:
+        热面温度(℃)，超出曲线范围时保持端点温度
+    """
+    times, temps = np.asarray(schedule, dtype=float).T
+    return np.interp(t, times, temps)
+
+
+def _node_heat_capacity(layers, layer_idx, dx):
+    """各节点单位面积热容 ρ·c·Δx (J/m²·K)，冷面节点为半个控制体"""
+    density = []
+    heat_capacity = []
+    for layer in layers:
+        i = MATERIALS.index(layer["material"])
+        rho = layer.get("density", MATERIALS.density[i])
+        if rho is None or np.isnan(rho):
+            raise ValueError(f"材料 {layer['material']} 缺少密度数据，请在层参数中指定")
+        density.append(rho)
+        heat_capacity.append(layer.get("heat_capacity", MATERIALS.heat_capacity[i]))
+    capacity = (np.array(density) * np.array(heat_capacity))[layer_idx] * dx
+    capacity[-1] *= 0.5
+    return capacity
+
+
+class _EdgeConductance:
+    """各边的热导 λ/Δx (W/m²·K)，层界面处取调和平均
+
+    各边两侧节点的材料索引和修正系数只计算一次，每个时间步只做
+    两次Horner求值。
+    """
+
+    def __init__(self, layers, layer_idx, dx):
+        mat_idx = MATERIALS.index([layer["material"] for layer in layers])
+        factors = _layer_factors(layers)
+        self.mat_left = mat_idx[layer_idx[:-1]]
+        self.mat_right = mat_idx[layer_idx[1:]]
+        self.factor_left = factors[layer_idx[:-1]] / dx
+        self.factor_right = factors[layer_idx[1:]] / dx
+        self.interface = self.mat_left != self.mat_right
+
+    def __call__(self, T):
+        T_mid = 0.5 * (T[:-1] + T[1:])
+        K = MATERIALS.conductivity(self.mat_left, T_mid) * self.factor_left
+        if self.interface.any():
+            kL = K[self.interface]
+            kR = (
+                MATERIALS.conductivity(
+                    self.mat_right[self.interface], T_mid[self.interface]
+                )
+                * self.factor_right[self.interface]
+            )
+            s = kL + kR
+            K[self.interface] = np.where(
+                s != 0, 2 * kL * kR / np.where(s != 0, s, 1.0), 0.0
+            )
+        return K
+
+
+def _tridiagonal_matvec(capacity, K, h, T):
+    """当前物性下的系数矩阵与温度向量的乘积(热面行为给定温度)"""
+    flux = K * (T[:-1] - T[1:])
+    out = capacity * T
+    out[0] = T[0]
+    out[1:] -= flux
+    out[1:-1] += flux[1:]
+    out[-1] += h * T[-1]
+    return out
+
+
+def transient_solver(
+    layers,
+    schedule,
+    T_amb,
+    dx=0.001,
+    dt=10.0,
+    initial="uniform",
+    output_interval=60.0,
+    refactor_rtol=0.02,
+):
+    """
+    多层平壁非稳态导热求解器
+
+    参数:
+        layers (list): 层结构列表，可在层中指定density(kg/m³)和
+            heat_capacity(J/kg·K)以覆盖材料表中的数据
+        schedule (list): 热面温度曲线 [(时间(s), 温度(℃)), ...]
+        T_amb (float): 环境空气温度(℃)
+        dx (float): 空间步长(m)
+        dt (float): 时间步长(s)
+        initial (str, float 或 np.ndarray): 初始温度分布；
+            "uniform" 为整个炉墙处于环境温度(新砌筑的炉衬)，
+            "steady" 为曲线起点热面温度下的稳态分布(停炉降温)，
+            也可直接给出温度或各节点温度
+        output_interval (float): 输出间隔(s)，曲线终点总会输出
+        refactor_rtol (float): 热导或对流系数相对变化超过该值时重新分解矩阵
+
+    返回:
+        TransientResult: 计算结果
+    """
+    layer_idx = node_layer_index(layers, dx)
+    edge_conductance = _EdgeConductance(layers, layer_idx, dx)
+    n = len(layer_idx)
+    positions = np.arange(n) * dx
+    capacity = _node_heat_capacity(layers, layer_idx, dx) / dt
+
+    t_end = float(np.asarray(schedule, dtype=float)[-1, 0])
+    n_steps = int(np.ceil(t_end / dt))
+    output_every = max(int(round(output_interval / dt)), 1)
+    T_hot = hot_face_temperature(schedule, np.arange(n_steps + 1) * dt)
+
+    if isinstance(initial, str):
+        if initial == "uniform":
+            T = np.full(n, float(T_amb))
+        elif initial == "steady":
+            T, _, _ = corrected_solver(
+                float(hot_face_temperature(schedule, 0.0)), T_amb, layers, dx
+            )
+        else:
+            raise ValueError(f"未知的初始条件: {initial}")
+    else:
+        T = np.broadcast_to(np.asarray(initial, dtype=float), (n,)).copy()
+    T[0] = T_hot[0]
+
+    # 按输出间隔输出，并总是输出最后一步(曲线终点不是间隔的整数倍时另加一个)
+    n_out = n_steps // output_every + 1 + (n_steps % output_every != 0)
+    times = np.empty(n_out)
+    temps = np.empty((n_out, n))
+    q_in = np.empty(n_out)
+    q_out = np.empty(n_out)
+
+    def record(k, t, K, h):
+        times[k] = t
+        temps[k] = T
+        q_in[k] = K[0] * (T[0] - T[1])
+        q_out[k] = h * (T[-1] - T_amb)
+
+    K = edge_conductance(T)
+    h, _ = _exterior_h(T[-1], T_amb)
+    record(0, 0.0, K, h)
+
+    K_ref = h_ref = lu = None
+    n_factorizations = 0
+    k_out = 1
+    for step in range(1, n_steps + 1):
+        if step > 1:
+            K = edge_conductance(T)
+            h, _ = _exterior_h(T[-1], T_amb)
+
+        # 物性变化较大时才重新组装并分解三对角矩阵
+        reuse = not (
+            lu is None
+            or np.max(np.abs(K - K_ref) / K_ref) > refactor_rtol
+            or abs(h - h_ref) / h_ref > refactor_rtol
+        )
+        if not reuse:
+            K_ref, h_ref = K, h
+            diag = capacity.copy()
+            diag[1:] += K_ref
+            diag[1:-1] += K_ref[1:]
+            diag[-1] += h_ref
+            diag[0] = 1.0  # 热面: 给定温度
+            lower = -K_ref.copy()  # A[i+1, i]
+            upper = -K_ref.copy()  # A[i, i+1]
+            upper[0] = 0.0
+            lu = dgttrf(lower, diag, upper)
+            if lu[-1] != 0:
+                raise ValueError("三对角矩阵分解失败，请检查材料参数")
+            n_factorizations += 1
+
+        t = step * dt
+        rhs = capacity * T
+        rhs[0] = T_hot[step]
+        rhs[-1] += h * T_amb
+        T_new, info = dgttrs(*lu[:5], rhs)
+        if info != 0:
+            raise ValueError("三对角方程组求解失败")
+        if reuse:
+            # 用旧的分解做一次亏量校正，使结果接近用当前物性求解的值
+            defect = rhs - _tridiagonal_matvec(capacity, K, h, T_new)
+            T_new += dgttrs(*lu[:5], defect)[0]
+        T = T_new
+
+        if step % output_every == 0 or step == n_steps:
+            record(k_out, t, K, h)
+            k_out += 1
+
+    return TransientResult(
+        times=times[:k_out],
+        positions=positions,
+        temps=temps[:k_out],
+        q_in=q_in[:k_out],
+        q_out=q_out[:k_out],
+        n_factorizations=n_factorizations,
+        n_steps=n_steps,
+    )